@@ -0,0 +1,80 @@
+"""
+CDL Manaus Intelligence Hub - Import Time Benchmark
+Measures cold-start import time of the src modules in fresh interpreters
+and reports which heavy optional dependencies each import pulls in
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    'src.data_processor',
+    'src.forecasting',
+    'src.batch_forecasting',
+    'src.backtesting',
+    'src.bootstrap_intervals',
+    'src.reconciliation',
+    'src.bcg_matrix',
+    'src.bias_detector',
+    'src.kpi_graph',
+    'src.monte_carlo',
+    'src.delinquency_alerts'
+]
+
+# Dependencies that should only load on first use
+HEAVY_MODULES = ['statsmodels', 'scipy', 'matplotlib', 'plotly', 'streamlit']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+
+def measure(module: str, repeats: int) -> dict:
+    """Median import time of a module over fresh interpreters."""
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'module': module,
+        'median_ms': statistics.median(run['seconds'] for run in runs) * 1000,
+        'heavy': runs[-1]['heavy']
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeats', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Fail when any module takes longer than this to import')
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeats) for module in MODULES]
+    print(f"{'module':<28}{'median (ms)':>12}  heavy dependencies loaded")
+    for result in results:
+        heavy = ', '.join(result['heavy']) or '-'
+        print(f"{result['module']:<28}{result['median_ms']:>12.1f}  {heavy}")
+
+    eager = [result['module'] for result in results if 'statsmodels' in result['heavy']]
+    slow = [result['module'] for result in results
+            if args.max_ms is not None and result['median_ms'] > args.max_ms]
+    if eager:
+        print(f"statsmodels imported eagerly by: {', '.join(eager)}")
+    if slow:
+        print(f"Over the {args.max_ms:.0f} ms budget: {', '.join(slow)}")
+    return 1 if eager or slow else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
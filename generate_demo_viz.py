@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
+import logging
 import sys
 sys.path.append('.')
 
@@ -14,6 +15,11 @@ from src.data_processor import DataProcessor
 from src.forecasting import BillingForecaster
 from src.bcg_matrix import BCGMatrixAnalyzer
 
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
 # Initialize processor
 processor = DataProcessor()
 processor.load_sample_data()
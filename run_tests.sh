@@ -113,6 +113,1035 @@ assert scenario_kpis['faturamento_acumulado'] > 0, 'Scenario should have revenue
 print('✓ Scenario Simulation test passed')
 "
 
+# Test 6: Grouped KPIs
+echo ""
+echo "Test 6: Grouped KPIs"
+echo "--------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import pandas as pd
+from src.data_processor import DataProcessor
+
+processor = DataProcessor()
+df = processor.load_sample_data()
+processor.clean_data()
+kpis = processor.calculate_kpis()
+
+long_df = pd.concat([df.assign(Entidade='A'), df.assign(Entidade='B')])
+table = processor.calculate_kpis_grouped(long_df, entity_col='Entidade')
+
+assert list(table.index) == ['A', 'B'], 'Should have one row per entity'
+assert abs(table.loc['A', 'gap_meta_percentual'] - kpis['gap_meta_percentual']) < 1e-9, 'Grouped gap should match single-series gap'
+
+print('✓ Grouped KPIs test passed')
+"
+
+# Test 7: Incremental KPIs
+echo ""
+echo "Test 7: Incremental KPIs"
+echo "------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+
+full = DataProcessor()
+df = full.load_sample_data()
+full.clean_data()
+expected = full.calculate_kpis()
+
+processor = DataProcessor()
+processor.load_data(df.iloc[:8])
+processor.clean_data()
+processor.calculate_kpis()
+for _, row in df.iloc[8:].iterrows():
+    kpis = processor.append_month(row.to_dict())
+
+for key, value in expected.items():
+    assert abs(kpis[key] - value) <= 1e-9 * max(1.0, abs(value)), f'{key} should match full recompute'
+
+print('✓ Incremental KPIs test passed')
+"
+
+# Test 8: Scenario Grid
+echo ""
+echo "Test 8: Scenario Grid"
+echo "---------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+
+processor = DataProcessor()
+processor.load_sample_data()
+processor.clean_data()
+processor.calculate_kpis()
+
+grid = processor.simulate_scenario_grid({'Inadimplencia_Valor': [-0.05, 0.0, 0.05],
+                                         'Faturamento_Real': [-0.1, 0.0]})
+point = processor.simulate_scenario('Test', {'Inadimplencia_Valor': -0.05, 'Faturamento_Real': -0.1})
+
+assert len(grid) == 6, 'Should evaluate every combination'
+assert abs(grid.loc[(-0.05, -0.1), 'taxa_inadimplencia_media'] - point['taxa_inadimplencia_media']) < 1e-9, 'Grid should match point simulation'
+
+print('✓ Scenario Grid test passed')
+"
+
+# Test 9: Side-Effect-Free KPIs
+echo ""
+echo "Test 9: Side-Effect-Free KPIs"
+echo "-----------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+
+processor = DataProcessor()
+processor.load_sample_data()
+processor.clean_data()
+baseline_kpis = processor.calculate_kpis()
+shared_df = processor.cleaned_df
+columns_before = list(shared_df.columns)
+
+scenario_kpis = processor.simulate_scenario('Test', {'Inadimplencia_Valor': -0.05})
+kpis, derived = processor.compute_kpis()
+
+assert processor.kpis is baseline_kpis, 'Scenario should not replace baseline KPIs'
+assert processor.cleaned_df is shared_df, 'Scenario should not swap cleaned_df'
+assert list(shared_df.columns) == columns_before, 'Pure path should not add columns'
+assert scenario_kpis['taxa_inadimplencia_media'] < baseline_kpis['taxa_inadimplencia_media'], 'Scenario should lower delinquency'
+assert list(derived.columns) == ['Variacao_Mensal', 'Taxa_Inadimplencia'], 'Derived columns returned separately'
+
+print('✓ Side-Effect-Free KPIs test passed')
+"
+
+# Test 10: Monte Carlo Scenarios
+echo ""
+echo "Test 10: Monte Carlo Scenarios"
+echo "------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+from src.monte_carlo import MonteCarloSimulator
+
+processor = DataProcessor()
+processor.load_sample_data()
+processor.clean_data()
+
+simulator = MonteCarloSimulator(processor)
+first = simulator.run(n_simulations=5000, seed=7, chunk_size=1000)
+second = simulator.run(n_simulations=5000, seed=7, chunk_size=1000, n_workers=2)
+table = first['percentiles']
+
+assert (table.values == second['percentiles'].values).all(), 'Same seed should give same percentiles for any worker count'
+assert table['gap_meta_percentual'].is_monotonic_increasing, 'Percentiles should be ordered'
+assert 0.0 <= first['prob_below_target'] <= 1.0, 'Probability should be in [0, 1]'
+
+print('✓ Monte Carlo Scenarios test passed')
+"
+
+# Test 11: Chunked Cleaning
+echo ""
+echo "Test 11: Chunked Cleaning"
+echo "-------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import os, tempfile
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor
+
+processor = DataProcessor()
+df = processor.load_sample_data()
+df.loc[[0, 1, 5], 'Faturamento_Real'] = np.nan
+df.loc[3, 'Inadimplencia_Valor'] = -10
+processor.load_data(df)
+expected = processor.clean_data()
+
+path = os.path.join(tempfile.mkdtemp(), 'billing.csv')
+df.to_csv(path, index=False)
+chunked = DataProcessor()
+result = pd.concat(list(chunked.iter_clean_chunks(path, chunksize=2)), ignore_index=True)
+
+assert np.allclose(result['Faturamento_Real'], expected['Faturamento_Real']), 'ffill/bfill should cross chunk boundaries'
+assert (result['Inadimplencia_Valor'] >= 0).all(), 'Negatives should be set to 0'
+assert list(chunked.outlier_summary.index) == ['Faturamento_Real', 'Inadimplencia_Valor'], 'Should build outlier summary'
+
+print('✓ Chunked Cleaning test passed')
+"
+
+# Test 12: Compact Dtypes
+echo ""
+echo "Test 12: Compact Dtypes"
+echo "-----------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+from src.data_processor import DataProcessor
+
+baseline = DataProcessor()
+baseline.load_sample_data()
+baseline.clean_data()
+expected = baseline.calculate_kpis()
+
+processor = DataProcessor(compact=True)
+processor.load_sample_data()
+processor.clean_data()
+kpis = processor.calculate_kpis()
+report = processor.memory_report
+
+assert report['bytes_after'] < report['bytes_before'], 'Compact frame should use less memory'
+assert str(processor.cleaned_df['Mes'].dtype) == 'period[M]', 'Mes should be a monthly Period'
+assert np.isclose(kpis['faturamento_acumulado'], expected['faturamento_acumulado']), 'KPIs should be in R$'
+assert np.isclose(kpis['taxa_inadimplencia_media'], expected['taxa_inadimplencia_media']), 'Rates should match'
+
+print('✓ Compact Dtypes test passed')
+"
+
+# Test 13: Lazy KPI Graph
+echo ""
+echo "Test 13: Lazy KPI Graph"
+echo "-----------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+from src.kpi_graph import KPIGraph
+
+processor = DataProcessor()
+processor.load_sample_data()
+processor.clean_data()
+graph = KPIGraph(processor)
+
+gap = graph.get('gap_meta_percentual')
+assert graph.compute_counts['taxa_inadimplencia_media'] == 0, 'Only gap inputs should be computed'
+
+expected = processor.calculate_kpis()
+assert abs(gap - expected['gap_meta_percentual']) < 1e-9, 'Graph gap should match calculate_kpis'
+graph.kpis()
+assert graph.compute_counts['gap_meta_percentual'] == 1, 'Adding derived columns should not invalidate gap'
+
+updated = processor.cleaned_df.copy()
+updated['Top20_Concentracao'] += 1
+processor.cleaned_df = updated
+graph.kpis()
+assert graph.compute_counts['concentracao_top20_media'] == 2, 'Changed column should invalidate its nodes'
+assert graph.compute_counts['faturamento_acumulado'] == 1, 'Unchanged inputs should stay memoized'
+
+print('✓ Lazy KPI Graph test passed')
+"
+
+# Test 14: Rolling Delinquency Alerts
+echo ""
+echo "Test 14: Rolling Delinquency Alerts"
+echo "-----------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import pandas as pd
+from src.data_processor import DataProcessor
+from src.delinquency_alerts import scan_delinquency_alerts, RollingAlertMonitor
+
+processor = DataProcessor()
+df = processor.load_sample_data()
+stable = df.assign(Entidade='Estavel', Inadimplencia_Valor=df['Faturamento_Real'] * 0.05)
+long_df = pd.concat([df.assign(Entidade='Crescente'), stable], ignore_index=True)
+
+alerts = scan_delinquency_alerts(long_df, window=6, sigma=1.0)
+assert list(alerts.index) == ['Crescente'], 'Only the rising entity should trigger'
+
+last_month = long_df['Mes'].max()
+monitor = RollingAlertMonitor(window=6, sigma=1.0).fit(long_df[long_df['Mes'] < last_month])
+incremental = monitor.update(long_df[long_df['Mes'] == last_month])
+assert list(incremental.index) == list(alerts.index), 'Incremental update should match full scan'
+
+print('✓ Rolling Delinquency Alerts test passed')
+"
+
+# Test 15: Parallel ARIMA Search
+echo ""
+echo "Test 15: Parallel ARIMA Search"
+echo "------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+from src.forecasting import BillingForecaster
+
+processor = DataProcessor()
+processor.load_sample_data()
+df = processor.clean_data()
+
+serial = BillingForecaster(df).forecast_billing(periods=2, method='arima')
+parallel = BillingForecaster(df, n_jobs=2, fit_timeout=60).forecast_billing(periods=2, method='arima')
+assert serial['order'] == parallel['order'], 'Parallel search should pick the same order'
+assert abs(serial['predictions'][0] - parallel['predictions'][0]) < 1e-6 * abs(serial['predictions'][0])
+
+print('✓ Parallel ARIMA Search test passed')
+"
+
+# Test 16: Model Cache
+echo ""
+echo "Test 16: Model Cache"
+echo "--------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import tempfile
+from src.data_processor import DataProcessor
+from src.forecasting import BillingForecaster
+from src.model_cache import ModelCache
+
+processor = DataProcessor()
+processor.load_sample_data()
+df = processor.clean_data()
+
+with tempfile.TemporaryDirectory() as cache_dir:
+    cache = ModelCache(cache_dir=cache_dir)
+    first = BillingForecaster(df, cache=cache).forecast_billing(periods=2, method='arima')
+    second = BillingForecaster(df, cache=cache).forecast_billing(periods=2, method='arima')
+    assert cache.stats['memory_hits'] == 1, 'Unchanged series should hit the memory tier'
+    assert second['predictions'] == first['predictions']
+
+    # A fresh cache over the same directory simulates a restart
+    restarted = ModelCache(cache_dir=cache_dir)
+    third = BillingForecaster(df, cache=restarted).forecast_billing(periods=2, method='arima')
+    assert restarted.stats['disk_hits'] == 1, 'Fit should survive a restart on disk'
+    assert third['predictions'] == first['predictions']
+
+print('✓ Model Cache test passed')
+"
+
+# Test 17: Fit Once, Any Horizon
+echo ""
+echo "Test 17: Fit Once, Any Horizon"
+echo "------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+from src.forecasting import BillingForecaster
+
+processor = DataProcessor()
+processor.load_sample_data()
+df = processor.clean_data()
+
+forecaster = BillingForecaster(df)
+fitted = forecaster.fit('arima')
+short, long = fitted.predict(1), fitted.predict(6)
+assert len(long['predictions']) == 6 and len(long['confidence_interval_upper']) == 6
+assert abs(short['predictions'][0] - long['predictions'][0]) < 1e-6 * abs(long['predictions'][0])
+assert fitted._model_summary is None, 'Summary should only be built on access'
+assert 'SARIMAX Results' in fitted.model_summary
+assert 'SARIMAX Results' in forecaster.forecast_billing(periods=1, method='arima')['model_summary'], 'forecast_billing should keep the model summary'
+
+trend = forecaster.fit('trend').predict(3)
+assert trend == BillingForecaster(df).forecast_billing(periods=3, method='trend')
+
+print('✓ Fit Once, Any Horizon test passed')
+"
+
+# Test 18: Batch Forecasting
+echo ""
+echo "Test 18: Batch Forecasting"
+echo "--------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import pandas as pd
+from src.data_processor import DataProcessor
+from src.batch_forecasting import BatchForecaster
+
+processor = DataProcessor()
+df = processor.load_sample_data()
+parts = [df[['Mes']].assign(Produto=name, Faturamento_Real=df['Faturamento_Real'] * share)
+         for name, share in [('Consultas', 0.4), ('Certificados', 0.3), ('CDL_Saude', 0.2)]]
+parts.append(pd.DataFrame({'Mes': df['Mes'][:2], 'Produto': 'Novo', 'Faturamento_Real': [1.0, 2.0]}))
+long_df = pd.concat(parts, ignore_index=True)
+
+results = BatchForecaster(periods=2, method='trend', chunk_size=2).forecast(long_df)
+assert len(results) == 8 and set(results['step']) == {1, 2}
+assert (results['status'] == 'ok').all()
+
+results = BatchForecaster(periods=1, method='arima').forecast(long_df)
+status = results.set_index('series_id')['status']
+assert status['Novo'] == 'fallback', 'Too-short series should fall back to moving average'
+assert (status.drop('Novo') == 'ok').all()
+
+wide = long_df[long_df['Produto'] != 'Novo'].pivot(index='Mes', columns='Produto',
+                                                    values='Faturamento_Real').reset_index()
+assert sorted(BatchForecaster(method='trend').forecast(wide)['series_id']) == ['CDL_Saude', 'Certificados', 'Consultas']
+
+print('✓ Batch Forecasting test passed')
+"
+
+# Test 19: Vectorized Forecasting
+echo ""
+echo "Test 19: Vectorized Forecasting"
+echo "-------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+from src.data_processor import DataProcessor
+from src.forecasting import BillingForecaster
+from src.vectorized_forecasting import moving_average_matrix, trend_matrix
+
+processor = DataProcessor()
+processor.load_sample_data()
+df = processor.clean_data()
+series = df['Faturamento_Real'].to_numpy(dtype=float)
+
+# Second row is a shorter history, left-padded with NaN
+matrix = np.vstack([series, np.concatenate([[np.nan] * 4, series[4:]])])
+trend = trend_matrix(matrix, periods=3)
+average = moving_average_matrix(matrix, periods=3)
+
+expected = BillingForecaster(df).forecast_billing(periods=3, method='trend')
+assert np.allclose(trend['predictions'][0], expected['predictions'])
+assert np.allclose(trend['confidence_interval_upper'][0], expected['confidence_interval_upper'])
+short_expected = BillingForecaster(df.iloc[4:]).forecast_billing(periods=3, method='trend')
+assert np.allclose(trend['predictions'][1], short_expected['predictions'])
+
+expected = BillingForecaster(df).forecast_billing(periods=3, method='moving_average')
+assert np.allclose(average['predictions'][0], expected['predictions'])
+assert np.allclose(average['confidence_interval_lower'][1], expected['confidence_interval_lower'])
+
+print('✓ Vectorized Forecasting test passed')
+"
+
+# Test 20: Stepwise ARIMA Search
+echo ""
+echo "Test 20: Stepwise ARIMA Search"
+echo "------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+import pandas as pd
+from src.forecasting import BillingForecaster
+
+rng = np.random.default_rng(1)
+months = np.arange(48)
+revenue = 1e6 + 5e3 * months + 8e4 * np.sin(2 * np.pi * months / 12) + rng.normal(0, 2e4, 48)
+df = pd.DataFrame({'Mes': pd.date_range('2021-01-01', periods=48, freq='MS'),
+                   'Faturamento_Real': revenue})
+
+grid = BillingForecaster(df)
+grid_result = grid.forecast_billing(periods=3)
+stepwise = BillingForecaster(df, search='stepwise')
+stepwise_result = stepwise.forecast_billing(periods=3)
+assert stepwise.last_search['n_fits'] < stepwise.last_search['grid_fits']
+assert stepwise_result['aic'] <= grid_result['aic'] + 1e-6, 'Stepwise should match or beat the 3x3 grid'
+
+seasonal = BillingForecaster(df, search='stepwise', seasonal_period=12)
+seasonal.forecast_billing(periods=3)
+assert seasonal.last_search['grid_fits'] == 6 * 6 * 3 * 3
+assert len(seasonal.forecast_result['predictions']) == 3
+
+print('✓ Stepwise ARIMA Search test passed')
+"
+
+# Test 21: Incremental Forecast Update
+echo ""
+echo "Test 21: Incremental Forecast Update"
+echo "------------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+import pandas as pd
+from src.forecasting import BillingForecaster
+
+rng = np.random.default_rng(1)
+months = np.arange(60)
+revenue = 1e6 + 5e3 * months + rng.normal(0, 2e4, 60)
+df = pd.DataFrame({'Mes': pd.date_range('2020-01-01', periods=60, freq='MS'),
+                   'Faturamento_Real': revenue})
+
+forecaster = BillingForecaster(df.iloc[:-1])
+forecaster.fit('arima')
+updated = forecaster.update(df.iloc[-1:])
+assert forecaster.last_update['refit'] == 'warm_start'
+full = BillingForecaster(df).fit('arima')
+assert updated.params['order'] == full.params['order']
+assert updated.params['aic'] <= full.params['aic'] + 1.0, 'Warm start should reach a comparable optimum'
+assert len(updated.predict(2)['predictions']) == 2
+
+shock = pd.DataFrame({'Mes': [pd.Timestamp('2025-01-01')], 'Faturamento_Real': [5e6]})
+forecaster.update(shock)
+assert forecaster.last_update['refit'] == 'full_search', 'Drift should trigger a new search'
+
+try:
+    forecaster.update(df.iloc[-1:])
+    raise AssertionError('Old months must be rejected')
+except ValueError:
+    pass
+
+print('✓ Incremental Forecast Update test passed')
+"
+
+# Test 22: Exponential Smoothing
+echo ""
+echo "Test 22: Exponential Smoothing"
+echo "------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+import pandas as pd
+from src.forecasting import BillingForecaster
+from src.batch_forecasting import BatchForecaster
+from src.vectorized_forecasting import exponential_smoothing_matrix
+
+rng = np.random.default_rng(0)
+months = np.arange(36)
+matrix = np.vstack([1e6 + 4e3 * months + 6e4 * np.sin(2 * np.pi * months / 12) + rng.normal(0, 1e4, 36)
+                    for _ in range(50)])
+
+for kind in ['ses', 'holt', 'holt_winters']:
+    result = exponential_smoothing_matrix(matrix, periods=3, kind=kind)
+    assert result['predictions'].shape == (50, 3)
+    assert (result['confidence_interval_upper'] > result['predictions']).all()
+    widths = result['confidence_interval_upper'] - result['confidence_interval_lower']
+    assert (np.diff(widths, axis=1) >= 0).all(), 'Intervals should widen with the horizon'
+
+df = pd.DataFrame({'Mes': pd.date_range('2022-01-01', periods=36, freq='MS'), 'Faturamento_Real': matrix[0]})
+single = BillingForecaster(df).forecast_billing(periods=3, method='holt_winters')
+assert single['method'] == 'Holt-Winters' and 'smoothing_params' in single
+batch = exponential_smoothing_matrix(matrix, periods=3, kind='holt_winters')
+assert np.allclose(single['predictions'], batch['predictions'][0])
+
+short = BillingForecaster(df.iloc[:10]).forecast_billing(periods=1, method='holt_winters')
+assert short['method'] == 'Moving Average', 'Too-short series should fall back'
+
+long_df = pd.DataFrame({'Produto': np.repeat(np.arange(50), 36),
+                        'Mes': np.tile(df['Mes'].to_numpy(), 50),
+                        'Faturamento_Real': matrix.ravel()})
+results = BatchForecaster(periods=3, method='holt').forecast(long_df)
+assert len(results) == 150 and (results['method'] == 'Holt').all()
+
+print('✓ Exponential Smoothing test passed')
+"
+
+# Test 23: Rolling-Origin Backtesting
+echo ""
+echo "Test 23: Rolling-Origin Backtesting"
+echo "-----------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+from src.backtesting import Backtester
+
+processor = DataProcessor()
+processor.load_sample_data()
+df = processor.clean_data()
+
+result = Backtester(methods=('arima', 'trend', 'moving_average'), horizon=2, min_train=6).run(df)
+summary = result['summary']
+assert set(summary.index.get_level_values('method')) == {'arima', 'trend', 'moving_average'}
+# 11 months, origins 6..10: 5 one-step and 4 two-step forecasts per method
+assert summary.loc[('trend', 1), 'n_forecasts'] == 5 and summary.loc[('trend', 2), 'n_forecasts'] == 4
+assert summary['coverage'].between(0, 1).all() and (summary['mape'] >= 0).all()
+
+errors = result['errors']
+first = errors[(errors['method'] == 'moving_average') & (errors['step'] == 1)].iloc[0]
+expected = df['Faturamento_Real'].iloc[3:6].mean()
+assert abs(first['prediction'] - expected) < 1e-6, 'Origin 6 must only see the first 6 months'
+
+print('✓ Rolling-Origin Backtesting test passed')
+"
+
+# Test 24: Lazy Imports
+echo ""
+echo "Test 24: Lazy Imports"
+echo "---------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import subprocess
+
+probe = '''
+import sys, logging
+import src.forecasting, src.batch_forecasting, src.backtesting
+assert 'statsmodels' not in sys.modules, 'statsmodels must load on first use'
+assert not logging.getLogger().handlers, 'Library import must not configure logging'
+from src.data_processor import DataProcessor
+p = DataProcessor(); p.load_sample_data(); df = p.clean_data()
+result = src.forecasting.BillingForecaster(df).forecast_billing(periods=1, method='arima')
+assert result['method'] == 'ARIMA' and 'statsmodels' in sys.modules
+'''
+subprocess.run([sys.executable, '-c', probe], check=True)
+
+print('✓ Lazy Imports test passed')
+"
+
+# Test 25: Budgeted Forecasting
+echo ""
+echo "Test 25: Budgeted Forecasting"
+echo "-----------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import pandas as pd, numpy as np
+from src.forecasting import BillingForecaster, FALLBACK_CHAIN
+from src.batch_forecasting import BatchForecaster
+rng = np.random.default_rng(7)
+df = pd.DataFrame({'Mes': pd.date_range('2022-01-01', periods=24, freq='MS'),
+                   'Faturamento_Real': 1000 + np.arange(24) * 5 + rng.normal(0, 20, 24)})
+f = BillingForecaster(df, time_budget=0.0)
+r = f.forecast_billing(2, 'arima')
+assert r['tier'] == 'holt' and f.last_budget['tier'] == 'holt', f.last_budget
+f = BillingForecaster(df, time_budget=60, max_iter=50)
+assert f.forecast_billing(2, 'arima')['tier'] == 'arima'
+series = df['Faturamento_Real'].values
+assert f._cache_key(series) != BillingForecaster(df)._cache_key(series), 'max_iter must be part of the cache key'
+assert FALLBACK_CHAIN[-1] == 'moving_average'
+long = pd.concat([df.assign(Produto=p) for p in ('A', 'B')])
+res = BatchForecaster(periods=2, batch_budget=0.0).forecast(long)
+assert set(res['tier']) == {'holt'} and 'tier' in res.columns
+print('✓ Budgeted Forecasting test passed')
+"
+
+# Test 26: Bootstrap Intervals
+echo ""
+echo "Test 26: Bootstrap Intervals"
+echo "----------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import pandas as pd, numpy as np
+from src.bootstrap_intervals import bootstrap_intervals, moving_average_components
+from src.forecasting import BillingForecaster
+from src.batch_forecasting import BatchForecaster
+rng = np.random.default_rng(3)
+df = pd.DataFrame({'Mes': pd.date_range('2022-01-01', periods=24, freq='MS'),
+                   'Faturamento_Real': 1000 + np.cumsum(rng.normal(0, 10, 24))})
+fit = BillingForecaster(df).fit('moving_average')
+r = fit.predict(4, interval_method='bootstrap', seed=1)
+width = np.subtract(r['confidence_interval_upper'], r['confidence_interval_lower'])
+assert (np.diff(width) >= 0).all() and width[-1] > width[0], width
+assert r == fit.predict(4, interval_method='bootstrap', seed=1)
+c = moving_average_components(df['Faturamento_Real'].values, periods=4)
+a = bootstrap_intervals([r['predictions']], c['residuals'], c['psi'], seed=1, max_cells=1000)
+b = bootstrap_intervals([r['predictions']], c['residuals'], c['psi'], seed=1)
+assert np.allclose(a['confidence_interval_lower'], b['confidence_interval_lower'])
+long = pd.concat([df.assign(Produto=p) for p in ('A', 'B')])
+for method in ('trend', 'holt'):
+    res = BatchForecaster(periods=3, method=method).forecast(long)
+    assert (res['ci_lower'] < res['prediction']).all() and (res['prediction'] < res['ci_upper']).all()
+print('✓ Bootstrap Intervals test passed')
+"
+
+# Test 27: Forecast Reconciliation
+echo ""
+echo "Test 27: Forecast Reconciliation"
+echo "--------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+import pandas as pd
+from src.reconciliation import ForecastReconciler
+from src.batch_forecasting import BatchForecaster
+from src.bcg_matrix import BCGMatrixAnalyzer
+
+products = BCGMatrixAnalyzer().create_sample_product_data()
+products['Faturamento_Real'] = products[['Consultas', 'Certificados', 'CDL_Saude']].sum(axis=1) * 1.02
+long_df = products.melt(id_vars='Mes', var_name='Produto', value_name='Valor')
+results = BatchForecaster(periods=2, method='trend').forecast(long_df, value_col='Valor')
+
+for method in ('bottom_up', 'ols', 'wls', 'mint_diag'):
+    reconciled = ForecastReconciler.from_mapping(method=method).reconcile_batch(results)
+    table = reconciled.pivot(index='step', columns='series_id', values='reconciled')
+    assert np.allclose(table['Faturamento_Real'], table[['Consultas', 'Certificados', 'CDL_Saude']].sum(axis=1)), f'{method} forecasts should add up to the total'
+
+bottom = pd.DataFrame({'Segmento': ['S1', 'S1', 'S2'], 'Associado': ['A1', 'A2', 'A3']})
+reconciler = ForecastReconciler.from_levels(bottom, ['Segmento', 'Associado'])
+out = reconciler.reconcile(pd.DataFrame([[10.0, 5.0, 4.0, 2.0, 2.0, 4.0]], columns=reconciler.nodes))
+
+assert reconciler.summing_matrix.shape == (6, 3), 'Summing matrix should be nodes x bottom series'
+assert np.isclose(out['Total'][0], out[['A1', 'A2', 'A3']].sum(axis=1)[0]), 'Total should equal the sum of associates'
+assert np.isclose(out['S1'][0], out['A1'][0] + out['A2'][0]), 'Segment should equal the sum of its associates'
+
+print('✓ Forecast Reconciliation test passed')
+"
+
+# Test 28: Vectorized BCG Portfolio
+echo ""
+echo "Test 28: Vectorized BCG Portfolio"
+echo "---------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+from src.bcg_matrix import BCGMatrixAnalyzer
+
+bcg = BCGMatrixAnalyzer()
+df = bcg.create_sample_product_data()
+results = bcg.analyze_portfolio()
+total = df[['Consultas', 'Certificados', 'CDL_Saude']].sum(axis=1)
+
+for product in ('Consultas', 'Certificados', 'CDL_Saude'):
+    metrics = results[product]
+    assert np.isclose(metrics['growth_rate'], bcg.calculate_growth_rate(df[product])), f'{product} growth should match the scalar method'
+    assert np.isclose(metrics['market_share'], bcg.calculate_market_share(df[product], total)), f'{product} share should match the scalar method'
+    assert metrics['classification'] == bcg.classify_bcg(metrics['market_share'], metrics['growth_rate']), f'{product} quadrant should match the scalar method'
+
+labels = bcg.classify_bcg_masks(np.array([40.0, 40.0, 10.0, 10.0]), np.array([1.0, -1.0, 1.0, -1.0]))
+
+assert bcg.analyze_portfolio() == results, 'Re-running must not double count the total market'
+assert list(bcg.metrics.index) == ['Consultas', 'Certificados', 'CDL_Saude'], 'Metrics should have one row per product'
+assert list(labels) == list(bcg.QUADRANTS), 'Masks should map to the four quadrants in order'
+
+print('✓ Vectorized BCG Portfolio test passed')
+"
+
+# Test 29: BCG Threshold Sweep
+echo ""
+echo "Test 29: BCG Threshold Sweep"
+echo "----------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.bcg_matrix import BCGMatrixAnalyzer
+
+bcg = BCGMatrixAnalyzer()
+bcg.create_sample_product_data()
+metrics = bcg.compute_metrics()
+labels = bcg.classify(30.0, 0.0)
+grid = bcg.classify_grid([20.0, 30.0, 60.0], [-5.0, 0.0], reference=(30.0, 0.0))
+row = grid[(grid['share_threshold'] == 30.0) & (grid['growth_threshold'] == 0.0)].iloc[0]
+changed = int((bcg.classify(30.0, 0.0) != bcg.classify(60.0, 0.0)).sum())
+
+assert labels['Consultas'] == bcg.analyze_portfolio(30.0, 0.0)['Consultas']['classification'], 'classify should match analyze_portfolio'
+assert bcg.compute_metrics() is metrics, 'Metrics must be cached across classifications'
+assert len(grid) == 6, 'Grid should have one row per threshold pair'
+assert (grid[list(bcg.QUADRANTS)].sum(axis=1) == 3).all(), 'Every product should fall in one quadrant'
+assert row['n_changed'] == 0, 'Reference thresholds should change no quadrant'
+assert bcg.count_quadrant_changes((30.0, 0.0), (60.0, 0.0)) == changed, 'Change count should match a direct comparison'
+
+bcg.create_sample_product_data()
+assert bcg.metrics is None, 'Loading data must invalidate the cache'
+
+print('✓ BCG Threshold Sweep test passed')
+"
+
+# Test 30: Rolling BCG Evolution
+echo ""
+echo "Test 30: Rolling BCG Evolution"
+echo "------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+from src.bcg_matrix import BCGMatrixAnalyzer
+
+bcg = BCGMatrixAnalyzer()
+df = bcg.create_sample_product_data()
+rolling = bcg.analyze_rolling(window=4)
+
+last = BCGMatrixAnalyzer()
+last.load_product_data(df.iloc[-4:])
+snapshot = last.analyze_portfolio()
+
+assert rolling['trajectories'].shape == (len(df) - 3, 3), 'Should have one row per full window'
+assert rolling['transitions'].to_numpy().sum() == (len(df) - 4) * 3, 'Should count one transition per product and step'
+for product, metrics in snapshot.items():
+    row = rolling['metrics'].loc[(df['Mes'].iloc[-1], product)]
+    assert np.isclose(row['growth_rate'], metrics['growth_rate']), f'{product} growth should match the last-window snapshot'
+    assert np.isclose(row['market_share'], metrics['market_share']), f'{product} share should match the last-window snapshot'
+    assert row['classification'] == metrics['classification'], f'{product} quadrant should match the last-window snapshot'
+
+changes = (rolling['trajectories'].iloc[1:].to_numpy() != rolling['trajectories'].iloc[:-1].to_numpy()).sum(axis=0)
+assert list(rolling['n_changes']) == list(changes), 'Change counts should match the trajectories'
+
+print('✓ Rolling BCG Evolution test passed')
+"
+
+# Test 31: KPI Reload
+echo ""
+echo "Test 31: KPI Reload"
+echo "-------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+
+processor = DataProcessor()
+df = processor.load_sample_data().copy()
+processor.clean_data()
+processor.calculate_kpis()
+
+doubled = df.assign(Faturamento_Real=df['Faturamento_Real'] * 2)
+processor.load_data(doubled)
+processor.clean_data()
+row = {'Mes': '2025-12', 'Faturamento_Real': 1200000, 'Faturamento_Meta': 1600000,
+       'Top20_Concentracao': 35.0, 'Inadimplencia_Valor': 150000}
+kpis = processor.append_month(row)
+
+expected = DataProcessor()
+expected.load_data(processor.df)
+expected.clean_data()
+reference = expected.calculate_kpis()
+
+assert kpis['meses_analisados'] == 12, 'Should count the reloaded months plus the new one'
+assert abs(kpis['faturamento_acumulado'] - (doubled['Faturamento_Real'].sum() + 1200000)) < 1e-6, 'Accumulator should be rebuilt from the reloaded data'
+for key, value in reference.items():
+    assert abs(kpis[key] - value) <= 1e-9 * max(1.0, abs(value)), f'{key} should match full recompute after reload'
+
+print('✓ KPI Reload test passed')
+"
+
+# Test 32: Stable Data Version
+echo ""
+echo "Test 32: Stable Data Version"
+echo "----------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.data_processor import DataProcessor
+from src.kpi_graph import KPIGraph
+
+processor = DataProcessor()
+processor.load_sample_data()
+processor.clean_data()
+version = processor.data_version
+
+graph = KPIGraph(processor)
+graph.kpis()
+processor.calculate_kpis()
+processor.calculate_kpis()
+graph.kpis()
+
+assert processor.data_version == version, 'calculate_kpis should not advance data_version'
+assert 'Taxa_Inadimplencia' in processor.cleaned_df.columns, 'Derived columns should still be added'
+assert graph.compute_counts['faturamento_acumulado'] == 1, 'KPI graph should reuse its memo after calculate_kpis'
+
+processor.append_month({'Mes': '2025-12', 'Faturamento_Real': 1200000, 'Faturamento_Meta': 1600000,
+                        'Top20_Concentracao': 35.0, 'Inadimplencia_Valor': 150000})
+assert processor.data_version == version + 1, 'Appending a month should advance data_version'
+
+print('✓ Stable Data Version test passed')
+"
+
+# Test 33: Calendar-Month Alert Window
+echo ""
+echo "Test 33: Calendar-Month Alert Window"
+echo "------------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+import pandas as pd
+from src.delinquency_alerts import scan_delinquency_alerts, RollingAlertMonitor
+
+months = pd.date_range('2024-01-01', periods=14, freq='MS')
+rates = np.array([9.0, 9.0, 9.0, 9.0, 9.0, 9.0, 9.0, 9.0, 5.0, 5.1, 4.9, 5.0, 5.2, 5.6])
+frame = pd.DataFrame({'Mes': months, 'Faturamento_Real': 1000.0, 'Inadimplencia_Valor': rates * 10})
+gappy = frame.drop(index=[5, 6, 7]).assign(Entidade='Lacuna')
+full = frame.assign(Entidade='Completa', Inadimplencia_Valor=50.0)
+long_df = pd.concat([gappy, full], ignore_index=True)
+
+alerts = scan_delinquency_alerts(long_df, window=6, sigma=1.0)
+window = rates[8:13]
+expected = window.mean() + window.std(ddof=1)
+assert list(alerts.index) == ['Lacuna'], 'Calendar window should drop the months before the gap'
+assert np.isclose(alerts.loc['Lacuna', 'limite'], expected), 'Limit should use the 6 calendar months only'
+
+last = long_df['Mes'].max()
+monitor = RollingAlertMonitor(window=6, sigma=1.0).fit(long_df[long_df['Mes'] < last])
+incremental = monitor.update(long_df[long_df['Mes'] == last])
+assert list(incremental.index) == list(alerts.index), 'Monitor should use the same calendar window'
+assert np.isclose(incremental.loc['Lacuna', 'limite'], expected), 'Monitor limit should match the scan'
+
+skipped = RollingAlertMonitor(window=6, sigma=1.0).fit(long_df[long_df['Mes'] < months[12]])
+late = skipped.update(long_df[long_df['Mes'] == last])
+assert np.isnan(skipped.history[0, -2]), 'A skipped month should be a gap in the window'
+assert np.isclose(late.loc['Lacuna', 'media_janela'], rates[8:12].mean()), 'Skipped month should not shift extra history in'
+
+print('✓ Calendar-Month Alert Window test passed')
+"
+
+# Test 34: Terminated Fit Workers
+echo ""
+echo "Test 34: Terminated Fit Workers"
+echo "-------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import multiprocessing
+import time
+from src.data_processor import DataProcessor
+from src.forecasting import BillingForecaster
+
+processor = DataProcessor()
+processor.load_sample_data()
+df = processor.clean_data()
+
+forecaster = BillingForecaster(df, n_jobs=2, fit_timeout=0.001)
+result = forecaster.forecast_billing(periods=1, method='arima')
+
+assert forecaster.last_search['timed_out'] == 9, 'Every overrunning fit should be terminated'
+assert result['method'] == 'Moving Average', 'No finished fit should fall back to moving average'
+assert not multiprocessing.active_children(), 'No worker process should survive the search'
+
+budgeted = BillingForecaster(df, n_jobs=2, time_budget=0.05)
+start = time.perf_counter()
+result = budgeted.forecast_billing(periods=1, method='arima')
+elapsed = time.perf_counter() - start
+
+assert budgeted.last_search['budget_exhausted'], 'Pool search should stop at the time budget'
+assert result['tier'] == 'holt', 'Exhausted search should degrade to the next tier'
+assert elapsed < 2.0, 'Running fits should be terminated at the budget deadline'
+assert not multiprocessing.active_children(), 'No worker process should survive the budget'
+
+print('✓ Terminated Fit Workers test passed')
+"
+
+# Test 35: Batch Interval Fallback
+echo ""
+echo "Test 35: Batch Interval Fallback"
+echo "--------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+import pandas as pd
+from src.batch_forecasting import BatchForecaster
+from src.forecasting import FittedForecast
+
+rng = np.random.default_rng(11)
+df = pd.DataFrame({'Mes': pd.date_range('2023-01-01', periods=18, freq='MS'),
+                   'Faturamento_Real': 1000 + np.cumsum(rng.normal(0, 10, 18))})
+long_df = pd.concat([df.assign(Produto=p) for p in ('A', 'B')])
+
+FittedForecast._extract_confidence_intervals = lambda self, conf_int: ([0.0], [0.0])
+results = BatchForecaster(periods=3, method='arima', interval_method='analytic').forecast(long_df)
+
+assert len(results) == 6, 'Should have one row per series and step'
+assert results['prediction'].notna().all(), 'Predictions should cover every step'
+assert results.loc[results['step'] == 1, 'ci_lower'].eq(0.0).all(), 'Fallback bound should stay on step 1'
+assert results.loc[results['step'] > 1, ['ci_lower', 'ci_upper']].isna().all().all(), 'Missing bounds should be NaN'
+
+print('✓ Batch Interval Fallback test passed')
+"
+
+# Test 36: BCG Metrics Invalidation
+echo ""
+echo "Test 36: BCG Metrics Invalidation"
+echo "---------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+from src.bcg_matrix import BCGMatrixAnalyzer
+
+bcg = BCGMatrixAnalyzer()
+df = bcg.create_sample_product_data()
+first = bcg.compute_metrics()
+
+assert bcg.compute_metrics() is first, 'Unchanged data should reuse the cached metrics'
+
+bcg.products_df.loc[bcg.products_df.index[-1], 'CDL_Saude'] *= 3
+assert bcg.compute_metrics() is first, 'In-place edits are only seen after invalidate()'
+bcg.invalidate()
+mutated = bcg.compute_metrics()
+assert mutated is not first, 'invalidate() should drop the cached metrics'
+assert mutated.loc['CDL_Saude', 'growth_rate'] > first.loc['CDL_Saude', 'growth_rate'], 'Growth should reflect the edit'
+
+bcg.products_df = df.assign(Consultas=df['Consultas'] * 2)
+reassigned = bcg.compute_metrics()
+assert reassigned.loc['Consultas', 'market_share'] > mutated.loc['Consultas', 'market_share'], 'Reassigned data should be recomputed'
+assert bcg.analyze_portfolio()['Consultas']['market_share'] == reassigned.loc['Consultas', 'market_share'], 'Classification should use the fresh metrics'
+
+print('✓ BCG Metrics Invalidation test passed')
+"
+
+# Test 37: Zero-Billing Append
+echo ""
+echo "Test 37: Zero-Billing Append"
+echo "----------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import numpy as np
+from src.data_processor import DataProcessor
+
+processor = DataProcessor()
+processor.load_sample_data()
+processor.clean_data()
+processor.calculate_kpis()
+history = processor.cleaned_df
+
+base = {'Faturamento_Meta': 1600000, 'Top20_Concentracao': 35.0, 'Inadimplencia_Valor': 150000}
+processor.append_month({'Mes': '2025-12', 'Faturamento_Real': 0, **base})
+processor.append_month({'Mes': '2026-01', 'Faturamento_Real': -5, **base})
+kpis = processor.append_month({'Mes': '2026-02', 'Faturamento_Real': 1200000, **base})
+try:
+    processor.append_month({'Mes': '2026-03', 'Faturamento_Real': 'n/a', **base})
+except TypeError:
+    pass
+
+assert processor.cleaned_df is not history, 'Appended months should reach cleaned_df on read'
+assert len(history) == 11, 'Appending should not rewrite the earlier frame'
+assert len(processor.cleaned_df) == len(processor.df) == processor.kpi_state.n == kpis['meses_analisados'] == 14, 'Frames and KPIs should stay in sync'
+
+expected = DataProcessor()
+expected.load_data(processor.df)
+expected.clean_data()
+reference = expected.calculate_kpis()
+
+for key, value in reference.items():
+    assert np.isclose(kpis[key], value, rtol=1e-9, equal_nan=True), f'{key} should match full recompute with zero billing'
+
+print('✓ Zero-Billing Append test passed')
+"
+
+# Test 38: Serial Budget Enforcement
+echo ""
+echo "Test 38: Serial Budget Enforcement"
+echo "----------------------------------"
+python3 -c "
+import sys
+sys.path.append('.')
+import multiprocessing
+import time
+import numpy as np
+import pandas as pd
+from src.forecasting import BillingForecaster
+from src.batch_forecasting import BatchForecaster
+
+rng = np.random.default_rng(0)
+n = 400
+values = 1000 + np.cumsum(rng.normal(0, 10, n)) + 50 * np.sin(np.arange(n) * 2 * np.pi / 12)
+df = pd.DataFrame({'Mes': pd.date_range('1990-01-01', periods=n, freq='MS'), 'Faturamento_Real': values})
+BillingForecaster(df).check_stationarity()
+
+forecaster = BillingForecaster(df, time_budget=0.05, search='stepwise', seasonal_period=12)
+start = time.perf_counter()
+fitted = forecaster.fit('arima')
+elapsed = time.perf_counter() - start
+
+long_df = pd.concat([df.assign(Produto=p) for p in ('A', 'B')])
+start = time.perf_counter()
+results = BatchForecaster(periods=2, time_budget=0.05, seasonal_period=12, n_jobs=2).forecast(long_df)
+batch_elapsed = time.perf_counter() - start
+
+assert elapsed < 0.5, 'A serial budgeted search should stop near its deadline'
+assert forecaster.last_search['budget_exhausted'], 'The search should be flagged as cut short'
+assert fitted.tier == 'holt', 'An exhausted search should degrade to the next tier'
+assert set(results['tier']) == {'holt'}, 'Batch series should degrade within their budget'
+assert batch_elapsed < 5.0, 'Batch workers should terminate fits at the series budget'
+assert not multiprocessing.active_children(), 'No fit worker should survive the search'
+
+print('✓ Serial Budget Enforcement test passed')
+"
+
 echo ""
 echo "============================================================"
 echo "ALL TESTS PASSED ✓"
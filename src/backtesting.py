@@ -0,0 +1,187 @@
+"""
+Backtesting Module - CDL Manaus Intelligence Hub
+Rolling-origin evaluation of BillingForecaster methods
+Replays expanding training windows and scores MAPE, MAE and interval coverage
+"""
+
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import os
+
+from .data_processor import money_values, month_ordinal
+from .forecasting import BillingForecaster
+from .model_cache import ModelCache
+
+logger = logging.getLogger(__name__)
+
+# Columns of the per-forecast error table
+ERROR_COLUMNS = ['series_id', 'method', 'fitted_method', 'origin', 'step', 'Mes', 'actual',
+                 'prediction', 'ci_lower', 'ci_upper']
+
+
+def _backtest_job(series_id, months: np.ndarray, values: np.ndarray, method: str,
+                  config: Dict, cache: Optional[ModelCache] = None) -> List[Tuple]:
+    """
+    Replay every forecast origin of one (series, method) pair.
+    
+    Origins are walked in order so expanding windows can reuse earlier work:
+    each origin is fitted once and predicted for the full horizon, and with
+    warm_start an ARIMA fit is updated from the previous origin instead of
+    re-running the order search.
+    
+    Returns:
+        List[Tuple]: ERROR_COLUMNS rows
+    """
+    if cache is None and config['cache_dir'] is not None:
+        cache = ModelCache(cache_dir=config['cache_dir'])
+    data = pd.DataFrame({'Mes': months, 'Faturamento_Real': values})
+    n = len(values)
+    horizon = config['horizon']
+    
+    rows = []
+    forecaster, fitted, previous_origin = None, None, None
+    for origin in range(config['min_train'], n, config['step']):
+        try:
+            if config['warm_start'] and fitted is not None and fitted.method == 'ARIMA':
+                fitted = forecaster.update(data.iloc[previous_origin:origin])
+            else:
+                forecaster = BillingForecaster(data.iloc[:origin], cache=cache,
+                                               seasonal_period=config['seasonal_period'])
+                fitted = forecaster.fit(method)
+            result = fitted.predict(horizon)
+        except Exception as e:
+            logger.warning(f"Backtest of {method} for {series_id} at origin {origin} failed: {e}")
+            forecaster, fitted = None, None
+            continue
+        previous_origin = origin
+        
+        for step in range(1, min(horizon, n - origin) + 1):
+            target = origin + step - 1
+            rows.append((series_id, method, result['method'], months[origin - 1], step, months[target],
+                         values[target], result['predictions'][step - 1],
+                         result['confidence_interval_lower'][step - 1],
+                         result['confidence_interval_upper'][step - 1]))
+    return rows
+
+
+def _backtest_chunk(jobs: List[Tuple], config: Dict) -> List[Tuple]:
+    """Run a chunk of (series, method) jobs in a worker process."""
+    return [row for job in jobs for row in _backtest_job(*job, config)]
+
+
+class Backtester:
+    """
+    Rolling-origin backtesting harness for forecasting methods.
+    Scores every method on the same origins so their accuracy can be compared
+    per forecast horizon.
+    """
+    
+    def __init__(self, methods: Sequence[str] = ('arima', 'trend', 'moving_average'),
+                 horizon: int = 3, min_train: int = 6, step: int = 1,
+                 n_jobs: int = 1, chunk_size: int = 10, warm_start: bool = True,
+                 cache: Optional[ModelCache] = None, seasonal_period: Optional[int] = None):
+        """
+        Initialize the backtester.
+        
+        Args:
+            methods: Forecasting methods to compare
+            horizon: Maximum forecast horizon scored at each origin
+            min_train: Months in the first training window
+            step: Months between consecutive origins
+            n_jobs: Worker processes over (series, method) jobs (-1 uses all cores)
+            chunk_size: Jobs per task sent to a worker
+            warm_start: Update ARIMA fits from the previous origin instead of
+                re-running the order search
+            cache: Fitted-model cache; workers share only its on-disk tier
+            seasonal_period: Season length passed to the forecasters
+        """
+        if horizon < 1 or step < 1 or chunk_size < 1:
+            raise ValueError("horizon, step and chunk_size must be positive")
+        if min_train < 2:
+            raise ValueError("min_train must be at least 2 months")
+        self.methods = list(methods)
+        self.horizon = horizon
+        self.min_train = min_train
+        self.step = step
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+        self.chunk_size = chunk_size
+        self.warm_start = warm_start
+        self.cache = cache
+        self.seasonal_period = seasonal_period
+        logger.info(f"Backtester initialized: methods={self.methods}, horizon={horizon}")
+    
+    def run(self, df: pd.DataFrame, id_col: Optional[str] = None,
+            value_col: str = 'Faturamento_Real') -> Dict:
+        """
+        Backtest every method on every series.
+        
+        Args:
+            df: Single series with 'Mes' and value_col, or long frame with id_col
+            id_col: Series identifier column (None for a single series)
+            value_col: Value column to forecast
+        
+        Returns:
+            Dict: 'errors' (one row per origin, method, series and step) and
+                'summary' (MAPE, MAE and coverage per method and step)
+        """
+        missing_cols = [col for col in ['Mes', value_col] + ([id_col] if id_col else [])
+                        if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+        
+        series = self._split(df, id_col, value_col)
+        jobs = [(series_id, months, values, method)
+                for series_id, months, values in series for method in self.methods]
+        config = {
+            'horizon': self.horizon, 'min_train': self.min_train, 'step': self.step,
+            'warm_start': self.warm_start, 'seasonal_period': self.seasonal_period,
+            'cache_dir': self.cache.cache_dir if self.cache is not None else None
+        }
+        logger.info(f"Backtesting {len(series)} series x {len(self.methods)} methods "
+                    f"with {self.n_jobs} worker(s)")
+        
+        if self.n_jobs > 1 and len(jobs) > 1:
+            chunks = [jobs[i:i + self.chunk_size] for i in range(0, len(jobs), self.chunk_size)]
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(chunks))) as executor:
+                rows = [row for part in executor.map(_backtest_chunk, chunks, [config] * len(chunks))
+                        for row in part]
+        else:
+            rows = [row for job in jobs for row in _backtest_job(*job, config, cache=self.cache)]
+        
+        errors = pd.DataFrame(rows, columns=ERROR_COLUMNS)
+        errors['abs_error'] = (errors['prediction'] - errors['actual']).abs()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            errors['ape'] = errors['abs_error'] / errors['actual'].abs().replace(0, np.nan)
+        errors['covered'] = (errors['actual'] >= errors['ci_lower']) & \
+            (errors['actual'] <= errors['ci_upper'])
+        
+        summary = errors.groupby(['method', 'step']).agg(
+            mape=('ape', 'mean'),
+            mae=('abs_error', 'mean'),
+            coverage=('covered', 'mean'),
+            n_forecasts=('abs_error', 'size')
+        )
+        summary['mape'] *= 100
+        
+        logger.info(f"Backtest complete: {len(errors)} scored forecasts")
+        return {'errors': errors, 'summary': summary}
+    
+    def _split(self, df: pd.DataFrame, id_col: Optional[str], value_col: str) -> List[Tuple]:
+        """Split into (series_id, months, values) sorted by month."""
+        if id_col is None:
+            order = np.argsort(month_ordinal(df['Mes']), kind='stable')
+            return [(value_col, df['Mes'].to_numpy()[order], money_values(df, value_col)[order])]
+        
+        codes, ids = pd.factorize(df[id_col], sort=True)
+        order = np.lexsort((month_ordinal(df['Mes']), codes))
+        codes = codes[order]
+        months = df['Mes'].to_numpy()[order]
+        values = money_values(df, value_col)[order]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(codes)]))
+        return [(ids[codes[start]], months[start:end], values[start:end])
+                for start, end in zip(starts, ends) if codes[start] >= 0]
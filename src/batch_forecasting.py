@@ -0,0 +1,309 @@
+"""
+Batch Forecasting Module - CDL Manaus Intelligence Hub
+Forecasts many billing series (per product or associate) in one call
+Per-series fits are scheduled in chunks over a process pool with failure isolation
+"""
+
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import time
+
+from .bootstrap_intervals import (N_PATHS, bootstrap_intervals, moving_average_components,
+                                  trend_components)
+from .data_processor import money_values, month_ordinal
+from .forecasting import INTERVAL_METHODS, METHOD_LABELS, BillingForecaster, FittedForecast
+from .vectorized_forecasting import (SMOOTHING_KINDS, exponential_smoothing_matrix,
+                                     moving_average_matrix, trend_matrix)
+
+logger = logging.getLogger(__name__)
+
+# Columns of the batch result table, one row per series and forecast step
+RESULT_COLUMNS = ['series_id', 'step', 'prediction', 'ci_lower', 'ci_upper',
+                  'method', 'tier', 'status', 'error']
+
+# Closed-form methods forecast all series at once in the current process
+VECTORIZED_METHODS = ('moving_average', 'trend') + SMOOTHING_KINDS
+
+
+def _forecast_chunk(chunk: List[Tuple], method: str, periods: int,
+                    seasonal_period: Optional[int] = None, time_budget: Optional[float] = None,
+                    deadline: Optional[float] = None, max_iter: Optional[int] = None,
+                    interval_options: Optional[Dict] = None) -> List[Tuple]:
+    """
+    Forecast one chunk of series (module level so it can run in a worker).
+    
+    A failing series falls back to a moving average instead of failing the
+    chunk; its status is 'fallback' and the error message is kept.
+    
+    Args:
+        time_budget: Seconds per series before degrading along FALLBACK_CHAIN
+        deadline: Epoch time the whole batch must finish by; each series gets
+            at most the time left, so late series start at the cheaper tiers
+        max_iter: Optimizer iteration limit per ARIMA candidate fit
+        interval_options: interval_method, n_paths and seed for predict()
+    
+    Returns:
+        List[Tuple]: (series_id, result dict, status, error) per series
+    """
+    interval_options = interval_options or {}
+    rows = []
+    for series_id, months, values in chunk:
+        budget = time_budget
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.time())
+            budget = remaining if budget is None else min(budget, remaining)
+        try:
+            data = pd.DataFrame({'Mes': months, 'Faturamento_Real': values})
+            forecaster = BillingForecaster(data, seasonal_period=seasonal_period,
+                                           time_budget=budget, max_iter=max_iter)
+            result = forecaster.fit(method).predict(periods, **interval_options)
+            rows.append((series_id, result, 'ok', None))
+        except Exception as e:
+            result = FittedForecast.moving_average(values).predict(periods, **interval_options)
+            rows.append((series_id, result, 'fallback', str(e)))
+    return rows
+
+
+class BatchForecaster:
+    """
+    Batch December projections for many series.
+    Accepts long-format (one row per series and month) or wide (one column
+    per series) frames and returns one columnar result table.
+    """
+    
+    def __init__(self, periods: int = 1, method: str = 'arima',
+                 n_jobs: int = 1, chunk_size: int = 50,
+                 seasonal_period: int = 12, time_budget: Optional[float] = None,
+                 batch_budget: Optional[float] = None, max_iter: Optional[int] = None,
+                 interval_method: str = 'bootstrap', n_paths: int = N_PATHS,
+                 seed: Optional[int] = 0):
+        """
+        Initialize the batch forecaster.
+        
+        Args:
+            periods: Number of periods to forecast per series
+            method: Forecasting method - 'arima', 'moving_average', 'trend',
+                'ses', 'holt' or 'holt_winters'
+            n_jobs: Worker processes (1 runs in the current process, -1 uses all cores)
+            chunk_size: Series per task sent to a worker
+            seasonal_period: Season length for 'holt_winters'
+            time_budget: Seconds per series; a fit that runs out degrades along
+                FALLBACK_CHAIN (ARIMA -> Holt -> trend -> moving average)
+            batch_budget: Seconds for the whole batch; once spent, the remaining
+                series are forecast with the cheaper tiers only
+            max_iter: Optimizer iteration limit per ARIMA candidate fit
+            interval_method: 'bootstrap' (simulated residual paths, widening
+                with the horizon) or 'analytic' (closed-form bands)
+            n_paths: Simulated paths per series for 'bootstrap'
+            seed: Random seed for 'bootstrap'
+        """
+        if periods < 1 or chunk_size < 1:
+            raise ValueError("periods and chunk_size must be positive")
+        if interval_method not in INTERVAL_METHODS:
+            raise ValueError(f"Unknown interval method '{interval_method}'. Use one of {INTERVAL_METHODS}")
+        self.periods = periods
+        self.method = method
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+        self.chunk_size = chunk_size
+        self.seasonal_period = seasonal_period
+        self.time_budget = time_budget
+        self.batch_budget = batch_budget
+        self.max_iter = max_iter
+        self.interval_options = {'interval_method': interval_method, 'n_paths': n_paths, 'seed': seed}
+        logger.info(f"BatchForecaster initialized: method={method}, n_jobs={self.n_jobs}")
+    
+    def forecast(self, df: pd.DataFrame, id_col: Optional[str] = 'Produto',
+                 value_col: str = 'Faturamento_Real', layout: str = 'auto') -> pd.DataFrame:
+        """
+        Forecast every series of a long or wide frame.
+        
+        Args:
+            df: Long frame with id_col, 'Mes' and value_col, or wide frame with
+                'Mes' and one numeric column per series
+            id_col: Series identifier column of the long layout
+            value_col: Value column of the long layout
+            layout: 'long', 'wide' or 'auto' (long when id_col is a column)
+        
+        Returns:
+            pd.DataFrame: RESULT_COLUMNS, one row per series and step
+        """
+        if layout == 'auto':
+            layout = 'long' if id_col in df.columns else 'wide'
+        series = self._split_long(df, id_col, value_col) if layout == 'long' \
+            else self._split_wide(df)
+        
+        if self.method in VECTORIZED_METHODS:
+            return self._forecast_vectorized(series)
+        
+        chunks = [series[i:i + self.chunk_size] for i in range(0, len(series), self.chunk_size)]
+        logger.info(f"Forecasting {len(series)} series in {len(chunks)} chunk(s) "
+                    f"with {self.n_jobs} worker(s)")
+        # Epoch deadline so that worker processes share the batch budget
+        deadline = None if self.batch_budget is None else time.time() + self.batch_budget
+        budget = (self.time_budget, deadline, self.max_iter, self.interval_options)
+        
+        if self.n_jobs > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(chunks))) as executor:
+                futures = [executor.submit(_forecast_chunk, chunk, self.method, self.periods,
+                                           self.seasonal_period, *budget)
+                           for chunk in chunks]
+                rows = []
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        rows.extend(future.result())
+                    except Exception as e:
+                        # A crashed worker only costs its own chunk
+                        logger.error(f"Forecast chunk failed: {e}")
+                        rows.extend(_forecast_chunk(chunk, 'moving_average', self.periods,
+                                                    interval_options=self.interval_options))
+        else:
+            rows = [row for chunk in chunks
+                    for row in _forecast_chunk(chunk, self.method, self.periods, self.seasonal_period,
+                                               *budget)]
+        
+        results = self._to_table(rows)
+        n_fallback = int((results['status'] == 'fallback').sum() // self.periods)
+        n_degraded = int((results['tier'] != self.method).sum() // self.periods)
+        logger.info(f"Batch forecast complete: {len(rows)} series, {n_fallback} fallback(s), "
+                    f"{n_degraded} forecast(s) from a cheaper tier")
+        return results
+    
+    def _forecast_vectorized(self, series: List[Tuple]) -> pd.DataFrame:
+        """
+        Forecast closed-form and smoothing methods with matrix operations.
+        
+        Series are stacked into one matrix per history length; a group the
+        method cannot handle (e.g. too short for Holt-Winters) falls back to
+        the moving average.
+        """
+        lengths = np.array([len(values) for _, _, values in series], dtype=int)
+        periods = self.periods
+        columns = {col: [] for col in RESULT_COLUMNS}
+        positions = []
+        
+        for length in np.unique(lengths):
+            group = np.flatnonzero(lengths == length)
+            matrix = np.vstack([series[i][2] for i in group])
+            tier, status, error = self.method, 'ok', None
+            try:
+                forecast = self._forecast_matrix(matrix)
+            except ValueError as e:
+                forecast = moving_average_matrix(matrix, periods=periods)
+                tier, status, error = 'moving_average', 'fallback', str(e)
+            if self.interval_options['interval_method'] == 'bootstrap':
+                forecast = self._bootstrap_matrix(matrix, forecast, tier)
+            
+            n_rows = len(group) * periods
+            columns['series_id'].append(np.repeat(np.array([series[i][0] for i in group], dtype=object),
+                                                  periods))
+            columns['step'].append(np.tile(np.arange(1, periods + 1), len(group)))
+            columns['prediction'].append(forecast['predictions'].ravel())
+            columns['ci_lower'].append(forecast['confidence_interval_lower'].ravel())
+            columns['ci_upper'].append(forecast['confidence_interval_upper'].ravel())
+            columns['method'].append(np.full(n_rows, METHOD_LABELS[tier], dtype=object))
+            columns['tier'].append(np.full(n_rows, tier, dtype=object))
+            columns['status'].append(np.full(n_rows, status, dtype=object))
+            columns['error'].append(np.full(n_rows, error, dtype=object))
+            positions.append(np.repeat(group, periods))
+        
+        if not positions:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        
+        # Restore the input series order
+        order = np.argsort(np.concatenate(positions), kind='stable')
+        results = pd.DataFrame({col: np.concatenate(parts)[order] for col, parts in columns.items()},
+                               columns=RESULT_COLUMNS)
+        logger.info(f"Vectorized {METHOD_LABELS[self.method].lower()} forecast complete: "
+                    f"{len(series)} series")
+        return results
+    
+    def _forecast_matrix(self, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """Forecast every row of an equal-length series matrix."""
+        if self.method == 'moving_average':
+            return moving_average_matrix(matrix, periods=self.periods)
+        if self.method == 'trend':
+            return trend_matrix(matrix, periods=self.periods)
+        return exponential_smoothing_matrix(matrix, periods=self.periods, kind=self.method,
+                                            seasonal_period=self.seasonal_period)
+    
+    def _bootstrap_matrix(self, matrix: np.ndarray, forecast: Dict[str, np.ndarray],
+                          tier: str) -> Dict[str, np.ndarray]:
+        """Replace analytic bands with residual-bootstrap bands where residuals exist."""
+        factors = None
+        if tier == 'moving_average':
+            components = moving_average_components(matrix, periods=self.periods)
+        elif tier == 'trend':
+            components = trend_components(matrix, periods=self.periods)
+            factors = components['parameter_factors']
+        else:
+            components = forecast
+        bounds = bootstrap_intervals(forecast['predictions'], components['residuals'], components['psi'],
+                                     n_paths=self.interval_options['n_paths'],
+                                     seed=self.interval_options['seed'], parameter_factors=factors)
+        
+        forecast = dict(forecast)
+        for key, values in bounds.items():
+            forecast[key] = np.where(np.isnan(values), forecast[key], values)
+        return forecast
+    
+    def _split_long(self, df: pd.DataFrame, id_col: str, value_col: str) -> List[Tuple]:
+        """Split a long frame into (series_id, months, values) sorted by month."""
+        missing_cols = [col for col in [id_col, 'Mes', value_col] if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+        
+        codes, ids = pd.factorize(df[id_col], sort=True)
+        order = np.lexsort((month_ordinal(df['Mes']), codes))
+        codes = codes[order]
+        months = df['Mes'].to_numpy()[order]
+        values = money_values(df, value_col)[order]
+        
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [len(codes)]))
+        return [(ids[codes[start]], months[start:end], values[start:end])
+                for start, end in zip(starts, ends) if codes[start] >= 0]
+    
+    def _split_wide(self, df: pd.DataFrame) -> List[Tuple]:
+        """Split a wide frame into (series_id, months, values) sorted by month."""
+        if 'Mes' not in df.columns:
+            raise ValueError("Wide data must contain a 'Mes' column")
+        
+        order = np.argsort(month_ordinal(df['Mes']), kind='stable')
+        months = df['Mes'].to_numpy()[order]
+        value_cols = [col for col in df.columns
+                      if col != 'Mes' and pd.api.types.is_numeric_dtype(df[col])]
+        return [(col, months, money_values(df, col)[order]) for col in value_cols]
+    
+    def _to_table(self, rows: List[Tuple]) -> pd.DataFrame:
+        """Assemble per-series results into one columnar table."""
+        periods = self.periods
+        results: Dict[str, np.ndarray] = {
+            'series_id': np.repeat(np.array([row[0] for row in rows], dtype=object), periods),
+            'step': np.tile(np.arange(1, periods + 1), len(rows)),
+            'prediction': self._steps(rows, 'predictions'),
+            'ci_lower': self._steps(rows, 'confidence_interval_lower'),
+            'ci_upper': self._steps(rows, 'confidence_interval_upper'),
+            'method': np.repeat(np.array([row[1]['method'] for row in rows], dtype=object), periods),
+            'tier': np.repeat(np.array([row[1]['tier'] for row in rows], dtype=object), periods),
+            'status': np.repeat(np.array([row[2] for row in rows], dtype=object), periods),
+            'error': np.repeat(np.array([row[3] for row in rows], dtype=object), periods)
+        }
+        return pd.DataFrame(results, columns=RESULT_COLUMNS)
+    
+    def _steps(self, rows: List[Tuple], key: str) -> np.ndarray:
+        """
+        Flatten one per-step result list of every series into a column.
+        
+        Lists shorter than the horizon (e.g. the single-value interval fallback
+        of _extract_confidence_intervals) are padded with NaN.
+        """
+        values = np.full((len(rows), self.periods), np.nan)
+        for i, row in enumerate(rows):
+            steps = np.asarray(row[1][key], dtype=float)[:self.periods]
+            values[i, :len(steps)] = steps
+        return values.ravel()
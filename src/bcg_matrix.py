@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 import logging
+import warnings
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +22,30 @@ class BCGMatrixAnalyzer:
     # Product categories for CDL Manaus
     PRODUCT_CATEGORIES = ['Consultas', 'Certificados', 'CDL Saúde']
     
+    # BCG quadrants, indexed by 2 * (low share) + (low growth)
+    QUADRANTS = ("⭐ Star", "💰 Cash Cow", "❓ Question Mark", "🐕 Dog")
+    
     def __init__(self):
         """Initialize BCG Matrix analyzer."""
         self.products_df: Optional[pd.DataFrame] = None
         self.classifications: Dict = {}
+        self.metrics: Optional[pd.DataFrame] = None
         logger.info("BCG Matrix Analyzer initialized")
     
+    @property
+    def products_df(self) -> Optional[pd.DataFrame]:
+        """Product dataframe; rebinding it drops the cached metrics."""
+        return self._products_df
+    
+    @products_df.setter
+    def products_df(self, df: Optional[pd.DataFrame]) -> None:
+        self._products_df = df
+        self.metrics = None
+    
+    def invalidate(self) -> None:
+        """Drop the cached metrics after in-place edits of products_df."""
+        self.metrics = None
+    
     def create_sample_product_data(self) -> pd.DataFrame:
         """
         Create sample product data for CDL Manaus (Jan-Nov 2025).
@@ -96,6 +115,33 @@ class BCGMatrixAnalyzer:
         growth_rate = ((end_value / start_value) ** (1 / n_periods) - 1) * 100
         return growth_rate
     
+    def calculate_growth_rates(self, values: np.ndarray) -> np.ndarray:
+        """
+        CAGR of every column of a (months x products) matrix at once.
+        
+        Same rule as calculate_growth_rate(): only positive months count, from
+        the first to the last positive month of each product.
+        
+        Args:
+            values: Monthly revenues, one column per product
+        
+        Returns:
+            np.ndarray: Growth rate per product as percentage
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return np.zeros(values.shape[1])
+        
+        positive = values > 0
+        count = positive.sum(axis=0)
+        first = positive.argmax(axis=0)
+        last = len(values) - 1 - positive[::-1].argmax(axis=0)
+        cols = np.arange(values.shape[1])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = ((values[last, cols] / values[first, cols]) ** (1 / (count - 1)) - 1) * 100
+        return np.where(count >= 2, growth, 0.0)
+    
     def calculate_market_share(self, series: pd.Series, total_market: pd.Series) -> float:
         """
         Calculate relative market share for a product.
@@ -142,11 +188,160 @@ class BCGMatrixAnalyzer:
         else:
             return "🐕 Dog"
     
+    def classify_bcg_masks(self, market_share: np.ndarray, growth_rate: np.ndarray,
+                           share_threshold: float = 30.0, growth_threshold: float = 0.0) -> np.ndarray:
+        """
+        Classify many products at once with boolean masks (see classify_bcg()).
+        
+        Args:
+            market_share: Relative market share (%) per product
+            growth_rate: Growth rate (%) per product
+            share_threshold: Threshold for high/low market share
+            growth_threshold: Threshold for high/low growth
+        
+        Returns:
+            np.ndarray: BCG classification per product
+        """
+        codes = self._quadrant_codes(market_share, growth_rate, share_threshold, growth_threshold)
+        return np.array(self.QUADRANTS, dtype=object)[codes]
+    
+    @staticmethod
+    def _quadrant_codes(market_share, growth_rate, share_threshold, growth_threshold) -> np.ndarray:
+        """QUADRANTS index per product; thresholds may be arrays that broadcast."""
+        low_share = ~(np.asarray(market_share) >= share_threshold)
+        low_growth = ~(np.asarray(growth_rate) >= growth_threshold)
+        return 2 * low_share + low_growth
+    
+    def compute_metrics(self) -> pd.DataFrame:
+        """
+        Per-product BCG metrics, computed once per loaded dataset.
+        
+        Growth, share, totals and averages only depend on the data, so the
+        table is cached in self.metrics until products_df is rebound (or
+        invalidate() is called after editing it in place); classifying under
+        other thresholds reuses it.
+            
+        Returns:
+            pd.DataFrame: growth_rate, market_share, total_revenue,
+                avg_monthly_revenue, first_month and last_month per product
+        """
+        if self.metrics is not None:
+            return self.metrics
+        if self.products_df is None:
+            raise ValueError("No product data loaded. Call load_product_data() or create_sample_product_data() first.")
+        
+        product_cols, values = self._product_values()
+        
+        # Total market is the sum of all products over all months
+        totals = np.nansum(values, axis=0)
+        total_market = totals.sum()
+        market_share = totals / total_market * 100 if total_market != 0 else np.zeros(len(totals))
+        
+        with warnings.catch_warnings():
+            # Products without any month average to NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            avg_revenue = np.nanmean(values, axis=0)
+        
+        self.metrics = pd.DataFrame({
+            'growth_rate': self.calculate_growth_rates(values),
+            'market_share': market_share,
+            'total_revenue': totals,
+            'avg_monthly_revenue': avg_revenue,
+            'first_month': values[0] if len(values) else np.nan,
+            'last_month': values[-1] if len(values) else np.nan
+        }, index=pd.Index(product_cols, name='Produto'))
+        logger.info(f"BCG metrics computed for {len(product_cols)} products")
+        return self.metrics
+    
+    def _product_values(self) -> Tuple[List[str], np.ndarray]:
+        """Product columns and their (months x products) revenue matrix."""
+        df = self.products_df
+        # A Total_Market column left by older versions is not a product
+        product_cols = [col for col in df.columns if col not in ('Mes', 'Total_Market')]
+        return product_cols, df[product_cols].to_numpy(dtype=np.float64)
+    
+    def classify(self, share_threshold: float = 30.0, growth_threshold: float = 0.0) -> pd.Series:
+        """
+        Classify every product from the cached metrics.
+        
+        Args:
+            share_threshold: Market share threshold for classification
+            growth_threshold: Growth rate threshold for classification
+        
+        Returns:
+            pd.Series: BCG classification per product
+        """
+        return self._classify(self.compute_metrics(), share_threshold, growth_threshold)
+    
+    def _classify(self, metrics: pd.DataFrame, share_threshold: float,
+                  growth_threshold: float) -> pd.Series:
+        """Classification Series of an already computed metrics table."""
+        return pd.Series(self.classify_bcg_masks(metrics['market_share'], metrics['growth_rate'],
+                                                 share_threshold, growth_threshold),
+                         index=metrics.index, name='classification')
+    
+    def classify_grid(self, share_thresholds, growth_thresholds,
+                      reference: Tuple[float, float] = (30.0, 0.0)) -> pd.DataFrame:
+        """
+        Quadrant counts for every (share, growth) threshold pair at once.
+        
+        All pairs are classified in one broadcast comparison against the
+        cached metrics, so sweeping a slider range costs no metric recomputation.
+        
+        Args:
+            share_thresholds: Market share thresholds to sweep
+            growth_thresholds: Growth rate thresholds to sweep
+            reference: (share, growth) pair that quadrant changes are counted against
+        
+        Returns:
+            pd.DataFrame: One row per (share_threshold, growth_threshold) with
+                the number of products per quadrant and 'n_changed', the
+                products whose quadrant differs from the reference pair
+        """
+        metrics = self.compute_metrics()
+        share_grid, growth_grid = np.meshgrid(np.asarray(share_thresholds, dtype=np.float64),
+                                              np.asarray(growth_thresholds, dtype=np.float64),
+                                              indexing='ij')
+        share_grid, growth_grid = share_grid.ravel(), growth_grid.ravel()
+        
+        shares = metrics['market_share'].to_numpy()
+        growth = metrics['growth_rate'].to_numpy()
+        codes = self._quadrant_codes(shares[None, :], growth[None, :],
+                                     share_grid[:, None], growth_grid[:, None])
+        baseline = self._quadrant_codes(shares, growth, *reference)
+        
+        counts = np.stack([(codes == code).sum(axis=1) for code in range(len(self.QUADRANTS))], axis=1)
+        grid = pd.DataFrame(counts, columns=list(self.QUADRANTS))
+        grid.insert(0, 'share_threshold', share_grid)
+        grid.insert(1, 'growth_threshold', growth_grid)
+        grid['n_changed'] = (codes != baseline).sum(axis=1)
+        return grid
+    
+    def count_quadrant_changes(self, from_thresholds: Tuple[float, float],
+                               to_thresholds: Tuple[float, float]) -> int:
+        """
+        Number of products that change quadrant between two threshold pairs.
+        
+        Args:
+            from_thresholds: (share, growth) thresholds before
+            to_thresholds: (share, growth) thresholds after
+        
+        Returns:
+            int: Products classified differently
+        """
+        metrics = self.compute_metrics()
+        shares, growth = metrics['market_share'].to_numpy(), metrics['growth_rate'].to_numpy()
+        return int((self._quadrant_codes(shares, growth, *from_thresholds) !=
+                    self._quadrant_codes(shares, growth, *to_thresholds)).sum())
+    
     def analyze_portfolio(self, share_threshold: float = 30.0, 
                          growth_threshold: float = 0.0) -> Dict:
         """
         Perform complete BCG Matrix analysis on product portfolio.
         
+        Metrics come from the cached compute_metrics() table, so re-running
+        with other thresholds only re-classifies.
+        
         Args:
             share_threshold: Market share threshold for classification
             growth_threshold: Growth rate threshold for classification
@@ -157,43 +352,91 @@ class BCGMatrixAnalyzer:
         if self.products_df is None:
             raise ValueError("No product data loaded. Call load_product_data() or create_sample_product_data() first.")
         
-        df = self.products_df
-        results = {}
-        
-        # Calculate total market (sum of all products)
-        product_cols = [col for col in df.columns if col != 'Mes']
-        df['Total_Market'] = df[product_cols].sum(axis=1)
-        
         logger.info("Starting BCG Matrix analysis")
+        metrics = self.compute_metrics()
+        classification = self._classify(metrics, share_threshold, growth_threshold)
+        table = metrics.assign(classification=classification)[
+            ['growth_rate', 'market_share', 'classification', 'total_revenue',
+             'avg_monthly_revenue', 'first_month', 'last_month']]
+        
+        counts = classification.value_counts()
+        logger.info("BCG Matrix analysis complete: " +
+                    ", ".join(f"{quadrant}: {counts.get(quadrant, 0)}" for quadrant in self.QUADRANTS))
+        
+        self.classifications = table.to_dict('index')
+        return self.classifications
+    
+    def analyze_rolling(self, window: int = 6, share_threshold: float = 30.0,
+                        growth_threshold: float = 0.0) -> Dict:
+        """
+        BCG quadrant of every product at every month over a trailing window.
         
-        for product in product_cols:
-            if product == 'Total_Market':
-                continue
-            
-            # Calculate metrics
-            growth_rate = self.calculate_growth_rate(df[product])
-            market_share = self.calculate_market_share(df[product], df['Total_Market'])
-            classification = self.classify_bcg(market_share, growth_rate, 
-                                              share_threshold, growth_threshold)
-            
-            # Total revenue
-            total_revenue = df[product].sum()
-            avg_revenue = df[product].mean()
-            
-            results[product] = {
-                'growth_rate': growth_rate,
-                'market_share': market_share,
-                'classification': classification,
-                'total_revenue': total_revenue,
-                'avg_monthly_revenue': avg_revenue,
-                'first_month': df[product].iloc[0],
-                'last_month': df[product].iloc[-1]
-            }
-            
-            logger.info(f"{product}: {classification} (Share: {market_share:.1f}%, Growth: {growth_rate:+.2f}%)")
+        Windowed shares come from cumulative sums and windowed CAGR from one
+        calculate_growth_rates() call over all (window, product) pairs, so no
+        window re-runs analyze_portfolio(). Rows of products_df must be in
+        chronological order.
         
-        self.classifications = results
-        return results
+        Args:
+            window: Trailing window length in months
+            share_threshold: Market share threshold for classification
+            growth_threshold: Growth rate threshold for classification
+        
+        Returns:
+            Dict: 'metrics' (growth_rate, market_share and classification per
+                window end month and product), 'trajectories' (classification,
+                one column per product), 'transitions' (month-to-month quadrant
+                transition counts, from rows to columns), 'transition_rates'
+                (row-normalized transitions) and 'n_changes' (quadrant changes
+                per product)
+        """
+        if self.products_df is None:
+            raise ValueError("No product data loaded. Call load_product_data() or create_sample_product_data() first.")
+        product_cols, values = self._product_values()
+        n_months, n_products = values.shape
+        if not 2 <= window <= n_months:
+            raise ValueError(f"window must be between 2 and the {n_months} months of data")
+        
+        # Window sums as differences of cumulative sums (missing months count as 0)
+        cumulative = np.vstack([np.zeros(n_products), np.nancumsum(values, axis=0)])
+        window_totals = cumulative[window:] - cumulative[:-window]
+        market_totals = window_totals.sum(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            market_share = np.where(market_totals != 0, window_totals / market_totals * 100, 0.0)
+        
+        # (window months x window ends * products) so each column is one windowed series
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+        growth_rate = self.calculate_growth_rates(
+            windows.transpose(2, 0, 1).reshape(window, -1)).reshape(market_share.shape)
+        codes = self._quadrant_codes(market_share, growth_rate, share_threshold, growth_threshold)
+        
+        months = self.products_df['Mes'].to_numpy()[window - 1:] if 'Mes' in self.products_df.columns \
+            else np.arange(window - 1, n_months)
+        labels = np.array(self.QUADRANTS, dtype=object)
+        trajectories = pd.DataFrame(labels[codes], index=pd.Index(months, name='Mes'),
+                                    columns=pd.Index(product_cols, name='Produto'))
+        metrics = pd.DataFrame({
+            'growth_rate': growth_rate.ravel(),
+            'market_share': market_share.ravel(),
+            'classification': labels[codes].ravel()
+        }, index=pd.MultiIndex.from_product([trajectories.index, trajectories.columns]))
+        
+        n_quadrants = len(self.QUADRANTS)
+        transitions = np.bincount((codes[:-1] * n_quadrants + codes[1:]).ravel(),
+                                  minlength=n_quadrants ** 2).reshape(n_quadrants, n_quadrants)
+        transitions = pd.DataFrame(transitions, index=pd.Index(self.QUADRANTS, name='from'),
+                                   columns=pd.Index(self.QUADRANTS, name='to'))
+        n_changes = pd.Series((codes[1:] != codes[:-1]).sum(axis=0), index=trajectories.columns,
+                              name='n_changes')
+        
+        logger.info(f"Rolling BCG analysis: {len(months)} windows of {window} months, "
+                    f"{int(n_changes.sum())} quadrant changes across {n_products} products")
+        return {
+            'metrics': metrics,
+            'trajectories': trajectories,
+            'transitions': transitions,
+            'transition_rates': transitions.div(transitions.sum(axis=1).replace(0, np.nan), axis=0),
+            'n_changes': n_changes
+        }
     
     def get_recommendations(self) -> Dict[str, List[str]]:
         """
@@ -266,6 +509,7 @@ class BCGMatrixAnalyzer:
                                key=lambda x: x[1]['market_share'], 
                                reverse=True)
         
+        recommendations = self.get_recommendations()
         for product, metrics in sorted_products:
             report += f"\n{'='*60}\n"
             report += f"PRODUTO: {product.replace('_', ' ').upper()}\n"
@@ -277,7 +521,7 @@ class BCGMatrixAnalyzer:
             report += f"Receita Média Mensal: R$ {metrics['avg_monthly_revenue']:,.2f}\n"
             
             # Get recommendations
-            recs = self.get_recommendations()[product]
+            recs = recommendations[product]
             report += f"\n📋 RECOMENDAÇÕES ESTRATÉGICAS:\n"
             for i, rec in enumerate(recs, 1):
                 report += f"   {i}. {rec}\n"
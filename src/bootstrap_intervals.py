@@ -0,0 +1,170 @@
+"""
+Bootstrap Intervals Module - CDL Manaus Intelligence Hub
+Residual-bootstrap prediction intervals for any forecast method
+Future error paths are simulated for many series at once from psi (MA-infinity) weights
+"""
+
+import numpy as np
+from typing import Dict, Optional
+import logging
+
+from .vectorized_forecasting import _as_matrix
+
+logger = logging.getLogger(__name__)
+
+# Default number of simulated future paths per series
+N_PATHS = 1000
+
+
+def bootstrap_intervals(predictions, residuals, psi, n_paths: int = N_PATHS,
+                        level: float = 0.95, seed: Optional[int] = 0,
+                        parameter_factors: Optional[np.ndarray] = None,
+                        max_cells: int = 4_000_000) -> Dict[str, np.ndarray]:
+    """
+    Prediction intervals from simulated future error paths.
+    
+    Each path draws future shocks from the series' centered one-step
+    residuals and accumulates them through the psi weights,
+    e_h = sum_j psi_j * eps_(h-j), so the band widens with the horizon as the
+    method's own error propagation implies. Optional parameter_factors add
+    estimation uncertainty as sum_k factor_hk * z_k with standard normal z:
+    the refit of a linear estimator on resampled residuals is a sum of many
+    resampled terms, so its bootstrap distribution is drawn through its
+    covariance factors instead of resampling whole histories per path. All
+    series and paths of a chunk are simulated as one array operation; chunks
+    keep the simulated array under max_cells.
+    
+    Args:
+        predictions: (n_series x periods) point forecasts
+        residuals: (n_series x n_residuals) one-step residuals, NaN-padded
+        psi: (n_series x periods) or (periods,) psi weights, psi[0] = 1
+        n_paths: Simulated paths per series
+        level: Interval coverage
+        seed: Random seed (None for a fresh generator)
+        parameter_factors: (n_series x periods x k) covariance factors of the
+            forecast's parameter error
+        max_cells: Upper bound on simulated values held per chunk
+    
+    Returns:
+        Dict: 'confidence_interval_lower' and 'confidence_interval_upper' as
+            (n_series x periods) matrices; NaN for series without residuals
+    """
+    predictions = _as_matrix(predictions)
+    residuals = _as_matrix(residuals)
+    n_series, periods = predictions.shape
+    psi = np.broadcast_to(np.asarray(psi, dtype=np.float64), (n_series, periods))
+    if not 0 < level < 1:
+        raise ValueError("level must be between 0 and 1")
+    
+    # Pack each series' valid residuals to the left and center them
+    valid = np.isfinite(residuals)
+    counts = valid.sum(axis=1)
+    order = np.argsort(~valid, axis=1, kind='stable')
+    packed = np.take_along_axis(np.where(valid, residuals, 0.0), order, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = packed.sum(axis=1) / counts
+    packed = np.where(np.arange(packed.shape[1]) < counts[:, None], packed - means[:, None], 0.0)
+    
+    # Lower-triangular Toeplitz matrices: toeplitz[s, h, k] = psi[s, h - k]
+    lag = np.arange(periods)[:, None] - np.arange(periods)[None, :]
+    toeplitz = np.where(lag >= 0, psi[:, np.clip(lag, 0, None)], 0.0)
+    
+    n_factors = 0 if parameter_factors is None else parameter_factors.shape[2]
+    chunk = max(1, max_cells // (n_paths * (periods + n_factors)))
+    lo = int(np.floor((1 - level) / 2 * (n_paths - 1)))
+    hi = int(np.ceil((1 + level) / 2 * (n_paths - 1)))
+    rng = np.random.default_rng(seed)
+    
+    lower = np.full((n_series, periods), np.nan)
+    upper = np.full((n_series, periods), np.nan)
+    for start in range(0, n_series, chunk):
+        rows = np.arange(start, min(start + chunk, n_series))
+        rows = rows[counts[rows] > 0]
+        if not len(rows):
+            continue
+        # Equal-length histories share a scalar bound, which draws much faster
+        high = counts[rows]
+        high = high[0] if (high == high[0]).all() else high[:, None, None]
+        
+        # (series x horizon x path) keeps every path sort contiguous
+        draws = rng.integers(0, high, size=(len(rows), periods, n_paths))
+        errors = toeplitz[rows] @ np.take_along_axis(packed[rows][:, None, :], draws, axis=2)
+        if parameter_factors is not None:
+            errors += parameter_factors[rows] @ rng.standard_normal((len(rows), n_factors, n_paths))
+        
+        errors.sort(axis=2)
+        lower[rows] = predictions[rows] + errors[:, :, lo]
+        upper[rows] = predictions[rows] + errors[:, :, hi]
+    
+    return {'confidence_interval_lower': lower, 'confidence_interval_upper': upper}
+
+
+def moving_average_components(values, periods: int = 1, window: int = 3) -> Dict[str, np.ndarray]:
+    """
+    Residuals and psi weights of the moving average forecast.
+    
+    The moving average is treated as the AR(window) recursion it implies,
+    y_t = mean(y_(t-window), ..., y_(t-1)) + e_t, whose psi weights follow
+    psi_j = sum_i psi_(j-i) / window.
+    
+    Args:
+        values: (n_series x n_periods) matrix, right-aligned
+        periods: Number of periods to forecast
+        window: Moving average window size
+    
+    Returns:
+        Dict: 'residuals' (n_series x n_periods - window) and 'psi' (periods,)
+    """
+    matrix = _as_matrix(values)
+    if matrix.shape[1] > window:
+        lagged = np.lib.stride_tricks.sliding_window_view(matrix[:, :-1], window, axis=1).mean(axis=2)
+        residuals = matrix[:, window:] - lagged
+    else:
+        residuals = np.full((len(matrix), 1), np.nan)
+    
+    psi = np.ones(periods)
+    for j in range(1, periods):
+        psi[j] = psi[max(0, j - window):j].sum() / window
+    return {'residuals': residuals, 'psi': psi}
+
+
+def trend_components(values, periods: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Residuals, psi weights and parameter factors of the linear trend forecast.
+    
+    Future shocks do not propagate through a deterministic trend (psi is 1
+    then 0), so the widening comes from the refit: resampled residuals shift
+    the least-squares line by intercept and slope errors with standard
+    deviations sigma / sqrt(n) and sigma / sqrt(Sxx), uncorrelated around x_mean.
+    
+    Args:
+        values: (n_series x n_periods) matrix, right-aligned
+        periods: Number of periods to forecast
+    
+    Returns:
+        Dict: 'residuals', 'psi' (periods,) and 'parameter_factors'
+            (n_series x periods x 2)
+    """
+    matrix = _as_matrix(values)
+    n_periods = matrix.shape[1]
+    valid = np.isfinite(matrix)
+    x = np.arange(n_periods, dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        count = valid.sum(axis=1)
+        x_mean = (valid * x).sum(axis=1) / count
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        sxx = (dx ** 2).sum(axis=1)
+        y_mean = np.where(valid, matrix, 0.0).sum(axis=1) / count
+        slope = (dx * np.where(valid, matrix - y_mean[:, None], 0.0)).sum(axis=1) / sxx
+        residuals = matrix - (y_mean[:, None] + slope[:, None] * (x - x_mean[:, None]))
+        sigma = np.sqrt(np.where(valid, residuals ** 2, 0.0).sum(axis=1) / count)
+        
+        future_dx = np.arange(n_periods, n_periods + periods) - x_mean[:, None]
+        factors = np.stack([np.broadcast_to((sigma / np.sqrt(count))[:, None], future_dx.shape),
+                            future_dx * (sigma / np.sqrt(sxx))[:, None]], axis=2)
+    
+    psi = np.zeros(periods)
+    psi[0] = 1.0
+    return {'residuals': residuals, 'psi': psi,
+            'parameter_factors': np.nan_to_num(factors, nan=0.0, posinf=0.0, neginf=0.0)}
@@ -7,16 +7,469 @@ Implements Strategic Consultant workflow with rigorous analytics
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Sequence, Union
 import logging
+import re
+import sqlite3
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Columns every billing frame must provide
+REQUIRED_COLUMNS = ['Mes', 'Faturamento_Real', 'Faturamento_Meta',
+                    'Top20_Concentracao', 'Inadimplencia_Valor']
+NUMERIC_COLUMNS = ['Faturamento_Real', 'Faturamento_Meta',
+                   'Top20_Concentracao', 'Inadimplencia_Valor']
+# Columns screened for outliers (values > 3 std deviations from mean)
+OUTLIER_COLUMNS = ['Faturamento_Real', 'Inadimplencia_Valor']
+# Monetary columns (R$), eligible for integer centavos / float32 storage
+MONEY_COLUMNS = ['Faturamento_Real', 'Faturamento_Meta', 'Inadimplencia_Valor']
+
+
+def _copy_on_write_enabled() -> bool:
+    """Whether pandas copy-on-write mode is active (shallow copies are safe)."""
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except KeyError:
+        return False
+
+
+def memory_usage_bytes(df: pd.DataFrame) -> int:
+    """Total memory held by a dataframe, including object/category payloads."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def money_values(df: pd.DataFrame, col: str) -> np.ndarray:
+    """
+    Read a monetary column as float64 reais, whatever its storage dtype.
+    
+    Args:
+        df: Frame, possibly compacted by compact_frame()
+        col: Monetary column name
+        
+    Returns:
+        np.ndarray: Values in R$
+    """
+    values = df[col].to_numpy(dtype=np.float64)
+    scale = df.attrs.get('money_scale', {}).get(col, 1)
+    return values / scale if scale != 1 else values
+
+
+def is_month_key(mes: pd.Series) -> bool:
+    """Whether 'Mes' already holds datetimes, monthly periods or int month keys."""
+    return (pd.api.types.is_datetime64_any_dtype(mes)
+            or isinstance(mes.dtype, pd.PeriodDtype)
+            or pd.api.types.is_integer_dtype(mes))
+
+
+def month_ordinal(mes: pd.Series) -> np.ndarray:
+    """Sortable int64 representation of any supported 'Mes' dtype."""
+    if isinstance(mes.dtype, pd.PeriodDtype):
+        return mes.array.asi8
+    if pd.api.types.is_integer_dtype(mes):
+        return mes.to_numpy(dtype=np.int64)
+    return pd.to_datetime(mes).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+
+def to_month_key(value, mes: pd.Series):
+    """Convert a month value to the representation used by the 'Mes' column."""
+    month = pd.Timestamp(str(value)) if isinstance(value, pd.Period) else pd.Timestamp(value)
+    if isinstance(mes.dtype, pd.PeriodDtype):
+        return month.to_period('M')
+    if pd.api.types.is_integer_dtype(mes):
+        return month.year * 12 + month.month - 1
+    return month
+
+
+def format_month(value) -> str:
+    """Format a month value of any supported representation as YYYY-MM."""
+    if isinstance(value, (int, np.integer)):
+        return f"{value // 12:04d}-{value % 12 + 1:02d}"
+    return pd.Period(value, freq='M').strftime('%Y-%m')
+
+
+def compact_frame(df: pd.DataFrame, month_keys: str = 'period', money: str = 'auto',
+                  entity_cols: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Build a memory-compact copy of a billing frame.
+    
+    - 'Mes' becomes monthly Period ('period') or int32 months since year 0
+      ('int32'); 'datetime' keeps datetime64.
+    - Monetary columns become int32 centavos when every value is a whole
+      centavo that fits, otherwise float32 when the round trip stays within
+      half a centavo; 'centavos'/'float32' restrict to one option, 'float64'
+      keeps them as is. Centavo scales are recorded in attrs['money_scale']
+      and honoured by money_values().
+    - Entity columns become categoricals; Top20_Concentracao becomes float32.
+    
+    Args:
+        df: Billing frame
+        month_keys: 'period', 'int32' or 'datetime'
+        money: 'auto', 'centavos', 'float32' or 'float64'
+        entity_cols: Columns to store as categoricals
+        
+    Returns:
+        pd.DataFrame: New compact frame (the input is not modified)
+    """
+    entity_cols = entity_cols or []
+    scales = dict(df.attrs.get('money_scale', {}))
+    columns = {}
+    
+    for col in df.columns:
+        series = df[col]
+        if col == 'Mes' and month_keys != 'datetime' and not pd.api.types.is_integer_dtype(series):
+            months = series if isinstance(series.dtype, pd.PeriodDtype) else \
+                pd.to_datetime(series).dt.to_period('M')
+            if month_keys == 'int32':
+                if months.isna().any():
+                    raise ValueError("Cannot build int32 month keys with missing months")
+                months = (months.dt.year * 12 + months.dt.month - 1).astype(np.int32)
+            columns[col] = months
+        elif col in MONEY_COLUMNS and money != 'float64' and col not in scales:
+            values = series.to_numpy(dtype=np.float64)
+            cents = np.round(values * 100)
+            if (money in ('auto', 'centavos') and not np.isnan(values).any()
+                    and np.abs(cents).max(initial=0) < 2 ** 31
+                    and np.abs(cents - values * 100).max(initial=0) < 1e-6):
+                columns[col] = pd.Series(cents.astype(np.int32), index=df.index)
+                scales[col] = 100
+            elif money in ('auto', 'float32') and \
+                    np.nanmax(np.abs(values.astype(np.float32) - values), initial=0) < 0.005:
+                columns[col] = series.astype(np.float32)
+            else:
+                columns[col] = series
+        elif col == 'Top20_Concentracao' and series.dtype == np.float64:
+            columns[col] = series.astype(np.float32)
+        elif col in entity_cols:
+            columns[col] = series.astype('category')
+        else:
+            columns[col] = series
+    
+    compact = pd.DataFrame(columns, index=df.index)
+    compact.attrs = dict(df.attrs)
+    if scales:
+        compact.attrs['money_scale'] = scales
+    return compact
+
+
+def clean_frame(df: pd.DataFrame,
+                carry: Optional[pd.Series] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Vectorized cleaning stage: month parsing, gap filling and negative clipping.
+    
+    Missing values are forward filled (continuing from `carry`, the last valid
+    values of a previous chunk) and remaining leading gaps are backward filled.
+    Negative values are set to 0. The frame is modified in place and must be
+    month-sorted already.
+    
+    Args:
+        df: Frame with the required billing columns (owned by the caller)
+        carry: Last valid value per numeric column from preceding rows
+        
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: (cleaned frame, per-column counts of
+        'missing' and 'negative' values)
+    """
+    if not is_month_key(df['Mes']):
+        df['Mes'] = pd.to_datetime(df['Mes'])
+    
+    numeric = df[NUMERIC_COLUMNS]
+    missing = numeric.isna().sum()
+    if missing.any():
+        numeric = numeric.ffill()
+        if carry is not None:
+            numeric = numeric.fillna(carry)
+        numeric = numeric.bfill()
+    
+    negative = (numeric < 0).sum()
+    if negative.any():
+        numeric = numeric.clip(lower=0)
+    
+    if missing.any() or negative.any():
+        df[NUMERIC_COLUMNS] = numeric
+    
+    return df, pd.DataFrame({'missing': missing, 'negative': negative})
+
+
+def summarize_outliers(df: pd.DataFrame, mean: Optional[pd.Series] = None,
+                       std: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Build the outlier summary table (values > 3 std deviations from mean).
+    
+    Args:
+        df: Cleaned frame
+        mean: Column means to use instead of the frame's own (chunked mode)
+        std: Column standard deviations to use instead of the frame's own
+        
+    Returns:
+        pd.DataFrame: One row per screened column with bounds and outlier count
+    """
+    values = pd.DataFrame({col: money_values(df, col) for col in OUTLIER_COLUMNS},
+                          index=df.index)
+    mean = values.mean() if mean is None else mean
+    std = values.std() if std is None else std
+    lower = mean - 3 * std
+    upper = mean + 3 * std
+    is_outlier = values.gt(upper) | values.lt(lower)
+    
+    return pd.DataFrame({
+        'outliers': is_outlier.sum(),
+        'mean': mean,
+        'std': std,
+        'lower_bound': lower,
+        'upper_bound': upper,
+        'min_outlier': values.where(is_outlier).min(),
+        'max_outlier': values.where(is_outlier).max()
+    })
+
+
+def compute_kpis(df: pd.DataFrame) -> Tuple[Dict, pd.DataFrame]:
+    """
+    Calculate key performance indicators without touching any shared state.
+    
+    The input frame is only read; the derived per-month columns are returned
+    separately so one cleaned dataframe can serve many concurrent callers.
+    
+    Args:
+        df: Cleaned, month-sorted dataframe with the required billing columns
+        
+    Returns:
+        Tuple[Dict, pd.DataFrame]: (KPIs, derived columns 'Variacao_Mensal'
+        and 'Taxa_Inadimplencia' aligned to df's index)
+    """
+    real = pd.Series(money_values(df, 'Faturamento_Real'), index=df.index)
+    
+    # 1. Gap de Meta Acumulado
+    total_real = real.sum()
+    total_meta = money_values(df, 'Faturamento_Meta').sum()
+    gap_acumulado = ((total_real - total_meta) / total_meta) * 100
+    
+    # 2. Variação Percentual Mensal
+    variacao_mensal = real.pct_change() * 100
+    
+    # 3. Taxa Média de Inadimplência
+    taxa_inadimplencia = (money_values(df, 'Inadimplencia_Valor') / real) * 100
+    
+    # 4. Concentração Top 20 (média e tendência)
+    concentracao = df['Top20_Concentracao'].astype(np.float64)
+    
+    kpis = {
+        'faturamento_acumulado': total_real,
+        'meta_acumulada': total_meta,
+        'gap_meta_percentual': gap_acumulado,
+        'taxa_inadimplencia_media': taxa_inadimplencia.mean(),
+        'taxa_inadimplencia_std': taxa_inadimplencia.std(),
+        'concentracao_top20_media': concentracao.mean(),
+        'concentracao_top20_tendencia': concentracao.iloc[-1] - concentracao.iloc[0],
+        'meses_analisados': len(df)
+    }
+    derived = pd.DataFrame({
+        'Variacao_Mensal': variacao_mensal,
+        'Taxa_Inadimplencia': taxa_inadimplencia
+    })
+    return kpis, derived
+
+
+def evaluate_delinquency_alert(taxa_inadimplencia: pd.Series) -> Tuple[bool, str]:
+    """
+    Check if the last delinquency rate exceeds mean + 1 standard deviation.
+    
+    Args:
+        taxa_inadimplencia: Monthly delinquency rate series (%)
+        
+    Returns:
+        Tuple[bool, str]: (alert_triggered, message)
+    """
+    mean_rate = taxa_inadimplencia.mean()
+    std_rate = taxa_inadimplencia.std()
+    current_rate = taxa_inadimplencia.iloc[-1]
+    threshold = mean_rate + std_rate
+    
+    if current_rate > threshold:
+        message = f"⚠️ ALERTA: Inadimplência atual ({current_rate:.2f}%) excede o limite ({threshold:.2f}%)"
+        logger.warning(message)
+        return True, message
+    else:
+        message = f"✓ Inadimplência sob controle: {current_rate:.2f}% (limite: {threshold:.2f}%)"
+        return False, message
+
+
+def _row_frame(df: pd.DataFrame, row: Dict) -> pd.DataFrame:
+    """
+    Convert one row (money in R$) to a one-row frame in df's storage dtypes.
+    
+    Args:
+        df: Frame the row will be appended to, possibly compacted by compact_frame()
+        row: Column -> value mapping
+        
+    Returns:
+        pd.DataFrame: One-row frame ready for _append_rows()
+    """
+    scales = df.attrs.get('money_scale', {})
+    values = {col: (round(value * scales[col]) if col in scales else value)
+              for col, value in row.items()}
+    row_df = pd.DataFrame([values])
+    dtypes = {col: dtype for col, dtype in df.dtypes.items()
+              if col in row_df.columns and not isinstance(dtype, pd.CategoricalDtype)}
+    return row_df.astype(dtypes)
+
+
+def _append_rows(df: pd.DataFrame, rows: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Append buffered one-row frames to a frame with a single concat.
+    
+    Args:
+        df: Frame, possibly compacted by compact_frame()
+        rows: Frames built by _row_frame()
+        
+    Returns:
+        pd.DataFrame: New frame with the rows appended
+    """
+    appended = pd.concat([df, *rows], ignore_index=True)
+    appended.attrs = dict(df.attrs)
+    return appended
+
+
+def _merge_moments(left: Optional[Tuple], right: Tuple) -> Tuple:
+    """
+    Combine (count, mean, M2) moments of two batches (Chan et al. update).
+    
+    Args:
+        left: Accumulated moments or None
+        right: Moments of the new batch
+        
+    Returns:
+        Tuple: Combined (count, mean, M2)
+    """
+    if left is None:
+        return right
+    n_a, mean_a, m2_a = left
+    n_b, mean_b, m2_b = right
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    m2 = m2_a + m2_b + delta ** 2 * (n_a * n_b / n)
+    return n, mean, m2
+
+
+class KPIAccumulator:
+    """
+    Running state behind calculate_kpis() for append-only monthly data.
+    Holds running sums, Welford mean/variance of Taxa_Inadimplencia and the
+    first/last Top20 values, so a new month updates every KPI in O(1).
+    """
+    
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self.n = 0
+        self.total_real = np.float64(0.0)
+        self.total_meta = np.float64(0.0)
+        self.taxa_n = 0
+        self.taxa_mean = np.float64(0.0)
+        self.taxa_m2 = np.float64(0.0)
+        self.top20_sum = np.float64(0.0)
+        self.top20_first: Optional[float] = None
+        self.top20_last: Optional[float] = None
+        self.last_row: Dict = {}  # last month, money in R$
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'KPIAccumulator':
+        """
+        Build the accumulator state from a cleaned, month-sorted dataframe.
+        
+        Args:
+            df: Cleaned dataframe (as produced by clean_data())
+            
+        Returns:
+            KPIAccumulator: State equivalent to having appended every row
+        """
+        acc = cls()
+        if len(df) == 0:
+            return acc
+        
+        real = money_values(df, 'Faturamento_Real')
+        meta = money_values(df, 'Faturamento_Meta')
+        inad = money_values(df, 'Inadimplencia_Valor')
+        top20 = df['Top20_Concentracao'].to_numpy(dtype=np.float64)
+        
+        acc.n = len(df)
+        acc.total_real = real.sum()
+        acc.total_meta = meta.sum()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # NaN rates (0 / 0) are skipped, as the pandas mean of compute_kpis() does
+            taxa = (inad / real) * 100
+            taxa = taxa[~np.isnan(taxa)]
+            acc.taxa_n = len(taxa)
+            if len(taxa):
+                acc.taxa_mean = taxa.mean()
+                acc.taxa_m2 = ((taxa - acc.taxa_mean) ** 2).sum()
+        acc.top20_sum = top20.sum()
+        acc.top20_first = top20[0]
+        acc.top20_last = top20[-1]
+        acc.last_row = {
+            'Mes': df['Mes'].iloc[-1],
+            'Faturamento_Real': real[-1],
+            'Faturamento_Meta': meta[-1],
+            'Top20_Concentracao': top20[-1],
+            'Inadimplencia_Valor': inad[-1]
+        }
+        return acc
+    
+    def update(self, row: Dict) -> None:
+        """
+        Add one cleaned month to the running state.
+        
+        Args:
+            row: Mapping with the required billing columns
+        """
+        real = np.float64(row['Faturamento_Real'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            taxa = (np.float64(row['Inadimplencia_Valor']) / real) * 100
+        top20 = np.float64(row['Top20_Concentracao'])
+        
+        self.n += 1
+        self.total_real += real
+        self.total_meta += np.float64(row['Faturamento_Meta'])
+        
+        if not np.isnan(taxa):
+            self.taxa_n += 1
+            if np.isfinite(taxa) and np.isfinite(self.taxa_mean):
+                # Welford update for mean/variance of the delinquency rate
+                delta = taxa - self.taxa_mean
+                self.taxa_mean += delta / self.taxa_n
+                self.taxa_m2 += delta * (taxa - self.taxa_mean)
+            else:
+                # Infinite rates (zero billing) propagate as in a full recompute
+                self.taxa_mean = (self.taxa_mean * (self.taxa_n - 1) + taxa) / self.taxa_n
+                self.taxa_m2 = np.float64(np.nan)
+        
+        self.top20_sum += top20
+        if self.top20_first is None:
+            self.top20_first = top20
+        self.top20_last = top20
+        self.last_row = dict(row)
+    
+    def to_kpis(self) -> Dict:
+        """
+        Materialize the KPI dictionary in the calculate_kpis() format.
+        
+        Returns:
+            Dict: Dictionary containing calculated KPIs
+        """
+        if self.n == 0:
+            return {}
+        
+        taxa_std = np.sqrt(self.taxa_m2 / (self.taxa_n - 1)) if self.taxa_n > 1 else np.nan
+        return {
+            'faturamento_acumulado': self.total_real,
+            'meta_acumulada': self.total_meta,
+            'gap_meta_percentual': ((self.total_real - self.total_meta) / self.total_meta) * 100,
+            'taxa_inadimplencia_media': self.taxa_mean if self.taxa_n else np.nan,
+            'taxa_inadimplencia_std': taxa_std,
+            'concentracao_top20_media': self.top20_sum / self.n,
+            'concentracao_top20_tendencia': self.top20_last - self.top20_first,
+            'meses_analisados': self.n
+        }
+
 
 class DataProcessor:
     """
@@ -24,13 +477,64 @@ class DataProcessor:
     Handles data cleaning, validation, and KPI calculations.
     """
     
-    def __init__(self):
-        """Initialize the DataProcessor with default configurations."""
+    REQUIRED_COLUMNS = REQUIRED_COLUMNS
+    NUMERIC_COLUMNS = NUMERIC_COLUMNS
+    
+    def __init__(self, compact: bool = False, month_keys: str = 'period',
+                 money: str = 'auto', entity_cols: Optional[List[str]] = None):
+        """
+        Initialize the DataProcessor with default configurations.
+        
+        Args:
+            compact: Store loaded frames in the compact representation of
+                compact_frame() (Period/int32 months, centavos/float32 money,
+                categorical entities)
+            month_keys: 'Mes' representation used when compact
+            money: Monetary storage used when compact
+            entity_cols: Entity columns stored as categoricals when compact
+        """
+        self.compact = compact
+        self.compact_options = {'month_keys': month_keys, 'money': money,
+                                'entity_cols': entity_cols}
+        self.memory_report: Dict = {}
+        self.data_version = 0
+        self._pending_rows: List[pd.DataFrame] = []
+        self._pending_clean_rows: List[pd.DataFrame] = []
         self.df: Optional[pd.DataFrame] = None
         self.cleaned_df: Optional[pd.DataFrame] = None
         self.kpis: Dict = {}
+        self.kpi_state: Optional[KPIAccumulator] = None
+        self.outlier_summary: Optional[pd.DataFrame] = None
         logger.info("DataProcessor initialized")
     
+    @property
+    def df(self) -> Optional[pd.DataFrame]:
+        """Loaded dataframe, including months buffered by append_month()."""
+        if self._pending_rows:
+            self._df = _append_rows(self._df, self._pending_rows)
+            self._pending_rows = []
+        return self._df
+    
+    @df.setter
+    def df(self, df: Optional[pd.DataFrame]) -> None:
+        self._df = df
+        self._pending_rows = []
+    
+    @property
+    def cleaned_df(self) -> Optional[pd.DataFrame]:
+        """Cleaned dataframe; rebinding it advances data_version and drops kpi_state."""
+        if self._pending_clean_rows:
+            self._cleaned_df = _append_rows(self._cleaned_df, self._pending_clean_rows)
+            self._pending_clean_rows = []
+        return self._cleaned_df
+    
+    @cleaned_df.setter
+    def cleaned_df(self, df: Optional[pd.DataFrame]) -> None:
+        self._cleaned_df = df
+        self._pending_clean_rows = []
+        self.data_version += 1
+        self.kpi_state = None
+    
     def load_sample_data(self) -> pd.DataFrame:
         """
         Create sample data simulating CDL Manaus Jan-Nov 2025 billing data.
@@ -53,9 +557,10 @@ class DataProcessor:
         
         df = pd.DataFrame(data)
         df['Mes'] = pd.to_datetime(df['Mes'])
-        self.df = df
+        self.df = self._compact(df) if self.compact else df
+        self.kpi_state = None
         logger.info(f"Sample data loaded: {len(df)} months of data")
-        return df
+        return self.df
     
     def load_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -67,17 +572,41 @@ class DataProcessor:
         Returns:
             pd.DataFrame: Loaded dataframe
         """
-        required_cols = ['Mes', 'Faturamento_Real', 'Faturamento_Meta', 
-                        'Top20_Concentracao', 'Inadimplencia_Valor']
-        
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
         
-        self.df = df.copy()
+        # Compacting already builds new arrays; otherwise own a copy unless
+        # pandas copy-on-write makes a shallow one safe
+        self.df = self._compact(df) if self.compact else df.copy(deep=not _copy_on_write_enabled())
+        self.kpi_state = None
         logger.info(f"External data loaded: {len(df)} records")
         return self.df
     
+    def _compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert a loaded frame to the compact representation and record the
+        memory saved in self.memory_report.
+        
+        Args:
+            df: Frame to compact
+            
+        Returns:
+            pd.DataFrame: Compact frame
+        """
+        before = memory_usage_bytes(df)
+        compact = compact_frame(df, **self.compact_options)
+        after = memory_usage_bytes(compact)
+        self.memory_report = {
+            'bytes_before': before,
+            'bytes_after': after,
+            'reduction_percentual': (1 - after / before) * 100 if before else 0.0,
+            'dtypes': compact.dtypes.astype(str).to_dict()
+        }
+        logger.info(f"Compact representation: {before / 1024:,.1f} KiB -> {after / 1024:,.1f} KiB "
+                    f"({self.memory_report['reduction_percentual']:.1f}% smaller)")
+        return compact
+    
     def clean_data(self) -> pd.DataFrame:
         """
         Stage 1: Data Cleaning - Handle missing values, outliers, and data quality.
@@ -89,54 +618,166 @@ class DataProcessor:
         if self.df is None:
             raise ValueError("No data loaded. Call load_data() or load_sample_data() first.")
         
-        df_clean = self.df.copy()
+        # Shallow view: column assignment never writes into self.df's arrays
+        df_clean = self.df.copy(deep=False)
         logger.info("Starting data cleaning process")
         
         # Convert date column to datetime if not already
-        if not pd.api.types.is_datetime64_any_dtype(df_clean['Mes']):
+        if not is_month_key(df_clean['Mes']):
             df_clean['Mes'] = pd.to_datetime(df_clean['Mes'])
             logger.info("Converted 'Mes' column to datetime")
         
-        # Sort by month
-        df_clean = df_clean.sort_values('Mes').reset_index(drop=True)
-        
-        # Handle missing values in numeric columns
-        numeric_cols = ['Faturamento_Real', 'Faturamento_Meta', 
-                       'Top20_Concentracao', 'Inadimplencia_Valor']
-        
-        for col in numeric_cols:
-            missing_count = df_clean[col].isna().sum()
-            if missing_count > 0:
-                logger.warning(f"Found {missing_count} missing values in {col}")
-                # Forward fill for time series data
-                df_clean[col] = df_clean[col].fillna(method='ffill')
-                # If still NaN (first rows), use backward fill
-                df_clean[col] = df_clean[col].fillna(method='bfill')
-        
-        # Validate non-negative values
-        for col in numeric_cols:
-            negative_count = (df_clean[col] < 0).sum()
-            if negative_count > 0:
-                logger.warning(f"Found {negative_count} negative values in {col}, setting to 0")
-                df_clean.loc[df_clean[col] < 0, col] = 0
-        
-        # Detect and log outliers (values > 3 std deviations from mean)
-        for col in ['Faturamento_Real', 'Inadimplencia_Valor']:
-            mean_val = df_clean[col].mean()
-            std_val = df_clean[col].std()
-            outliers = df_clean[
-                (df_clean[col] > mean_val + 3 * std_val) | 
-                (df_clean[col] < mean_val - 3 * std_val)
-            ]
-            if len(outliers) > 0:
-                logger.warning(f"Outliers detected in {col}: {len(outliers)} records")
-                for idx, row in outliers.iterrows():
-                    logger.info(f"  - {row['Mes'].strftime('%Y-%m')}: {row[col]:,.2f}")
+        # Sort by month (the single copy of the cleaning stage)
+        df_clean = df_clean.sort_values('Mes', kind='stable', ignore_index=True)
+        
+        # Handle missing values (ffill, then bfill for first rows) and negatives
+        df_clean, quality = clean_frame(df_clean)
+        self._log_quality(quality)
+        
+        # Detect outliers (values > 3 std deviations from mean)
+        self.outlier_summary = summarize_outliers(df_clean)
+        self._log_outliers(self.outlier_summary)
         
         self.cleaned_df = df_clean
         logger.info("Data cleaning completed successfully")
         return df_clean
     
+    def iter_clean_chunks(self, source: Union[str, sqlite3.Connection],
+                          chunksize: int = 100_000, table: Optional[str] = None,
+                          detect_outliers: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        Clean a CSV file or SQLite table in bounded-memory batches.
+        
+        Applies the clean_data() rules chunk by chunk. The last valid values of
+        each chunk are carried into the next one, so forward fill is continuous
+        across chunk boundaries; leading rows without any prior value are held
+        back until the first valid value arrives and then backward filled.
+        Rows must be ordered by 'Mes' (SQLite tables are read ordered).
+        
+        When detect_outliers is True, a second streaming pass computes
+        self.outlier_summary against the global mean/std once all chunks are read.
+        
+        Args:
+            source: CSV path, SQLite database path or sqlite3 connection
+            chunksize: Rows per chunk
+            table: Table name (required for SQLite sources)
+            detect_outliers: Build the outlier summary after the last chunk
+            
+        Yields:
+            pd.DataFrame: Cleaned chunks, in month order
+        """
+        stats = None
+        for chunk in self._stream_clean(source, chunksize, table):
+            if chunk.empty:
+                continue
+            values = chunk[OUTLIER_COLUMNS].astype(np.float64)
+            stats = _merge_moments(stats, (values.count(), values.mean(),
+                                           values.var(ddof=0) * values.count()))
+            yield chunk
+        
+        if not detect_outliers or stats is None:
+            return
+        
+        count, mean, m2 = stats
+        std = np.sqrt(m2 / (count - 1))
+        summaries = [summarize_outliers(chunk, mean, std)
+                     for chunk in self._stream_clean(source, chunksize, table, log=False)]
+        summary = summaries[0]
+        summary['outliers'] = sum(part['outliers'] for part in summaries)
+        summary['min_outlier'] = pd.concat([part['min_outlier'] for part in summaries], axis=1).min(axis=1)
+        summary['max_outlier'] = pd.concat([part['max_outlier'] for part in summaries], axis=1).max(axis=1)
+        self.outlier_summary = summary
+        self._log_outliers(summary)
+    
+    def _stream_clean(self, source: Union[str, sqlite3.Connection], chunksize: int,
+                      table: Optional[str], log: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        Read the source in chunks and apply clean_frame() with carried state.
+        
+        Yields:
+            pd.DataFrame: Cleaned chunks
+        """
+        carry = pd.Series(np.nan, index=NUMERIC_COLUMNS)
+        pending: List[pd.DataFrame] = []
+        last_month = None
+        quality = None
+        
+        for chunk in self._read_chunks(source, chunksize, table):
+            missing_cols = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing_cols:
+                raise ValueError(f"Missing required columns: {missing_cols}")
+            
+            chunk['Mes'] = pd.to_datetime(chunk['Mes'])
+            # All-NULL SQL columns arrive as object dtype
+            for col in NUMERIC_COLUMNS:
+                if chunk[col].dtype == object:
+                    chunk[col] = pd.to_numeric(chunk[col])
+            if len(chunk) and ((last_month is not None and chunk['Mes'].iloc[0] < last_month)
+                               or not chunk['Mes'].is_monotonic_increasing):
+                raise ValueError("Chunked cleaning requires rows ordered by 'Mes'")
+            if len(chunk):
+                last_month = chunk['Mes'].iloc[-1]
+            
+            # Rows without any earlier value wait for the first valid value (bfill)
+            unresolved = carry.isna() & chunk[NUMERIC_COLUMNS].isna().all()
+            if unresolved.any():
+                pending.append(chunk)
+                continue
+            if pending:
+                pending.append(chunk)
+                chunk = pd.concat(pending, ignore_index=True)
+                pending = []
+            
+            chunk, chunk_quality = clean_frame(chunk, carry)
+            quality = chunk_quality if quality is None else quality + chunk_quality
+            
+            carry = chunk[NUMERIC_COLUMNS].iloc[-1]
+            yield chunk
+        
+        if pending:
+            chunk, chunk_quality = clean_frame(pd.concat(pending, ignore_index=True), carry)
+            quality = chunk_quality if quality is None else quality + chunk_quality
+            yield chunk
+        
+        if log and quality is not None:
+            self._log_quality(quality)
+    
+    @staticmethod
+    def _read_chunks(source: Union[str, sqlite3.Connection], chunksize: int,
+                     table: Optional[str]) -> Iterator[pd.DataFrame]:
+        """Open a CSV or SQLite source as an iterator of raw chunks."""
+        is_sqlite = isinstance(source, sqlite3.Connection) or \
+            str(source).lower().endswith(('.db', '.sqlite', '.sqlite3'))
+        if not is_sqlite:
+            yield from pd.read_csv(source, chunksize=chunksize)
+            return
+        
+        if table is None or not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', table):
+            raise ValueError("A valid table name is required for SQLite sources")
+        
+        conn = source if isinstance(source, sqlite3.Connection) else sqlite3.connect(source)
+        try:
+            yield from pd.read_sql_query(f'SELECT * FROM "{table}" ORDER BY Mes',
+                                         conn, chunksize=chunksize)
+        finally:
+            if conn is not source:
+                conn.close()
+    
+    @staticmethod
+    def _log_quality(quality: pd.DataFrame) -> None:
+        """Log missing/negative value counts once per affected column."""
+        for col, count in quality['missing'][quality['missing'] > 0].items():
+            logger.warning(f"Found {count} missing values in {col}")
+        for col, count in quality['negative'][quality['negative'] > 0].items():
+            logger.warning(f"Found {count} negative values in {col}, setting to 0")
+    
+    @staticmethod
+    def _log_outliers(summary: pd.DataFrame) -> None:
+        """Log the outlier summary as one line per screened column."""
+        for col, row in summary[summary['outliers'] > 0].iterrows():
+            logger.warning(f"Outliers detected in {col}: {int(row['outliers'])} records "
+                           f"(range R$ {row['min_outlier']:,.2f} - R$ {row['max_outlier']:,.2f})")
+    
     def calculate_kpis(self) -> Dict:
         """
         Calculate key performance indicators for CDL Manaus.
@@ -147,65 +788,218 @@ class DataProcessor:
         if self.cleaned_df is None:
             raise ValueError("Data not cleaned. Call clean_data() first.")
         
-        df = self.cleaned_df
+        self.kpis, derived = compute_kpis(self.cleaned_df)
+        
+        # Rebind instead of writing into the frame other readers may hold;
+        # the shallow copy shares the existing column arrays. Derived columns
+        # are not a data change, so data_version stays put
+        cleaned_df = self.cleaned_df.copy(deep=False)
+        cleaned_df[list(derived.columns)] = derived
+        self._cleaned_df = cleaned_df
+        self.kpi_state = KPIAccumulator.from_frame(self.cleaned_df)
         
-        # 1. Gap de Meta Acumulado
-        total_real = df['Faturamento_Real'].sum()
-        total_meta = df['Faturamento_Meta'].sum()
-        gap_acumulado = ((total_real - total_meta) / total_meta) * 100
+        logger.info(f"KPIs calculated: Accumulated Revenue = R$ {self.kpis['faturamento_acumulado']:,.2f}")
+        logger.info(f"  Gap vs Target: {self.kpis['gap_meta_percentual']:.2f}%")
+        logger.info(f"  Average Delinquency Rate: {self.kpis['taxa_inadimplencia_media']:.2f}%")
         
-        # 2. Variação Percentual Mensal
-        df['Variacao_Mensal'] = df['Faturamento_Real'].pct_change() * 100
+        return self.kpis
+    
+    def append_month(self, row: Dict) -> Dict:
+        """
+        Append one new month and update the KPIs incrementally.
+        Applies the clean_data() rules to the new row (forward fill of missing
+        values, negatives set to 0) and updates self.kpis from the running
+        state instead of re-sorting and re-aggregating the whole history.
+        The cleaned row is buffered for both self.df and self.cleaned_df;
+        buffered months are concatenated once, on the next read of either
+        frame, so appending never copies the history.
         
-        # 3. Taxa Média de Inadimplência
-        df['Taxa_Inadimplencia'] = (df['Inadimplencia_Valor'] / df['Faturamento_Real']) * 100
-        taxa_media_inadimplencia = df['Taxa_Inadimplencia'].mean()
-        taxa_std_inadimplencia = df['Taxa_Inadimplencia'].std()
+        Args:
+            row: Mapping with the required columns for the new month
+            
+        Returns:
+            Dict: Updated KPIs
+        """
+        if self._cleaned_df is None:
+            raise ValueError("Data not cleaned. Call clean_data() first.")
         
-        # 4. Concentração Top 20 (média e tendência)
-        concentracao_media = df['Top20_Concentracao'].mean()
-        concentracao_tendencia = df['Top20_Concentracao'].iloc[-1] - df['Top20_Concentracao'].iloc[0]
+        missing_cols = [col for col in self.REQUIRED_COLUMNS if col not in row]
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
         
-        self.kpis = {
+        if self.kpi_state is None:
+            self.calculate_kpis()
+        state = self.kpi_state
+        
+        new_row = dict(row)
+        new_row['Mes'] = to_month_key(new_row['Mes'], self._cleaned_df['Mes'])
+        if state.last_row and new_row['Mes'] <= state.last_row['Mes']:
+            raise ValueError(
+                f"Month {format_month(new_row['Mes'])} is not after the last loaded month "
+                f"{format_month(state.last_row['Mes'])}"
+            )
+        
+        for col in self.NUMERIC_COLUMNS:
+            value = new_row[col]
+            if pd.isna(value):
+                logger.warning(f"Missing value in {col}, carrying last month forward")
+                value = state.last_row.get(col, np.nan)
+            elif value < 0:
+                logger.warning(f"Negative value in {col}, setting to 0")
+                value = 0
+            new_row[col] = value
+        
+        # Derive and convert everything before touching any state, so a row
+        # that cannot be stored leaves the accumulator and frames unchanged.
+        # Zero billing gives inf/NaN rates, as in compute_kpis()
+        prev_real = np.float64(state.last_row.get('Faturamento_Real', np.nan))
+        real = np.float64(new_row['Faturamento_Real'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            derived = {
+                'Variacao_Mensal': (real / prev_real - 1) * 100,
+                'Taxa_Inadimplencia': (np.float64(new_row['Inadimplencia_Valor']) / real) * 100
+            }
+        clean_row = _row_frame(self._cleaned_df, {**new_row, **derived})
+        raw_row = _row_frame(self._df, new_row) if self._df is not None else None
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            state.update(new_row)
+        
+        # Keep the frames in sync (cleaned row, in each frame's storage units);
+        # no re-sort or re-aggregation is needed
+        self._pending_clean_rows.append(clean_row)
+        self.data_version += 1
+        if raw_row is not None:
+            self._pending_rows.append(raw_row)
+        
+        self.kpis = state.to_kpis()
+        logger.info(f"Month {format_month(new_row['Mes'])} appended: "
+                    f"Gap vs Target = {self.kpis['gap_meta_percentual']:.2f}%")
+        return self.kpis
+    
+    def calculate_kpis_grouped(self, df: Optional[pd.DataFrame] = None,
+                               entity_col: str = 'Entidade') -> pd.DataFrame:
+        """
+        Calculate the same KPIs as calculate_kpis() for many entities at once.
+        
+        Works on a long-format frame (one row per entity and month) and
+        computes every KPI with vectorized NumPy passes instead of one
+        calculate_kpis() call per associate or branch.
+        
+        Args:
+            df: Long-format DataFrame with the entity column plus the required
+                billing columns. Defaults to the cleaned dataframe.
+            entity_col: Column identifying the associate/branch
+            
+        Returns:
+            pd.DataFrame: One row per entity, one column per KPI
+        """
+        if df is None:
+            df = self.cleaned_df
+        if df is None:
+            raise ValueError("Data not cleaned. Call clean_data() first.")
+        
+        missing_cols = [col for col in [entity_col] + self.REQUIRED_COLUMNS
+                        if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+        
+        codes, entities = pd.factorize(df[entity_col], sort=True)
+        valid = codes >= 0
+        codes = codes[valid]
+        mes = month_ordinal(df['Mes'])[valid]
+        
+        # Stable sort by entity, then month, so first/last follow time order
+        order = np.lexsort((mes, codes))
+        codes = codes[order]
+        real = money_values(df, 'Faturamento_Real')[valid][order]
+        meta = money_values(df, 'Faturamento_Meta')[valid][order]
+        top20 = df['Top20_Concentracao'].to_numpy(dtype=np.float64)[valid][order]
+        inad = money_values(df, 'Inadimplencia_Valor')[valid][order]
+        
+        n_entities = len(entities)
+        counts = np.bincount(codes, minlength=n_entities)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        ends = starts + counts - 1
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 1. Gap de Meta Acumulado
+            total_real = np.bincount(codes, weights=real, minlength=n_entities)
+            total_meta = np.bincount(codes, weights=meta, minlength=n_entities)
+            gap_acumulado = ((total_real - total_meta) / total_meta) * 100
+            
+            # 2. Variação Percentual Mensal (último mês de cada entidade)
+            has_prev = counts >= 2
+            prev_idx = np.where(has_prev, ends - 1, ends)
+            variacao_ultima = np.where(
+                has_prev, (real[ends] / real[prev_idx] - 1) * 100, np.nan
+            )
+            
+            # 3. Taxa Média de Inadimplência (média e desvio amostral)
+            taxa = (inad / real) * 100
+            taxa_media = np.bincount(codes, weights=taxa, minlength=n_entities) / counts
+            sq_dev = (taxa - taxa_media[codes]) ** 2
+            taxa_std = np.sqrt(
+                np.bincount(codes, weights=sq_dev, minlength=n_entities) / (counts - 1)
+            )
+            taxa_std[counts < 2] = np.nan
+            
+            # 4. Concentração Top 20 (média e tendência)
+            concentracao_media = np.bincount(codes, weights=top20, minlength=n_entities) / counts
+            concentracao_tendencia = top20[ends] - top20[starts]
+        
+        kpi_table = pd.DataFrame({
             'faturamento_acumulado': total_real,
             'meta_acumulada': total_meta,
             'gap_meta_percentual': gap_acumulado,
-            'taxa_inadimplencia_media': taxa_media_inadimplencia,
-            'taxa_inadimplencia_std': taxa_std_inadimplencia,
+            'variacao_mensal_ultima': variacao_ultima,
+            'taxa_inadimplencia_media': taxa_media,
+            'taxa_inadimplencia_std': taxa_std,
             'concentracao_top20_media': concentracao_media,
             'concentracao_top20_tendencia': concentracao_tendencia,
-            'meses_analisados': len(df)
-        }
+            'meses_analisados': counts
+        }, index=pd.Index(entities, name=entity_col))
         
-        logger.info(f"KPIs calculated: Accumulated Revenue = R$ {total_real:,.2f}")
-        logger.info(f"  Gap vs Target: {gap_acumulado:.2f}%")
-        logger.info(f"  Average Delinquency Rate: {taxa_media_inadimplencia:.2f}%")
+        logger.info(f"Grouped KPIs calculated for {n_entities} entities "
+                    f"({int(counts.sum())} records)")
+        return kpi_table
+    
+    def compute_kpis(self, df: Optional[pd.DataFrame] = None) -> Tuple[Dict, pd.DataFrame]:
+        """
+        Side-effect-free variant of calculate_kpis().
+        Neither self.cleaned_df nor self.kpis is modified, so a single
+        processor can be shared between sessions and threads.
         
-        return self.kpis
+        Args:
+            df: Cleaned dataframe to evaluate. Defaults to the cleaned dataframe.
+            
+        Returns:
+            Tuple[Dict, pd.DataFrame]: (KPIs, derived monthly columns)
+        """
+        if df is None:
+            df = self.cleaned_df
+        if df is None:
+            raise ValueError("Data not cleaned. Call clean_data() first.")
+        return compute_kpis(df)
     
-    def get_delinquency_alert(self) -> Tuple[bool, str]:
+    def get_delinquency_alert(self, taxa_inadimplencia: Optional[pd.Series] = None) -> Tuple[bool, str]:
         """
         Check if current month's delinquency exceeds standard deviation threshold.
         
+        Args:
+            taxa_inadimplencia: Optional delinquency rate series, e.g. the
+                derived columns returned by compute_kpis(). Defaults to the
+                'Taxa_Inadimplencia' column of the cleaned dataframe.
+        
         Returns:
             Tuple[bool, str]: (alert_triggered, message)
         """
-        if self.cleaned_df is None or 'Taxa_Inadimplencia' not in self.cleaned_df.columns:
-            return False, "Data not processed"
+        if taxa_inadimplencia is None:
+            if self.cleaned_df is None or 'Taxa_Inadimplencia' not in self.cleaned_df.columns:
+                return False, "Data not processed"
+            taxa_inadimplencia = self.cleaned_df['Taxa_Inadimplencia']
         
-        df = self.cleaned_df
-        mean_rate = df['Taxa_Inadimplencia'].mean()
-        std_rate = df['Taxa_Inadimplencia'].std()
-        current_rate = df['Taxa_Inadimplencia'].iloc[-1]
-        threshold = mean_rate + std_rate
-        
-        if current_rate > threshold:
-            message = f"⚠️ ALERTA: Inadimplência atual ({current_rate:.2f}%) excede o limite ({threshold:.2f}%)"
-            logger.warning(message)
-            return True, message
-        else:
-            message = f"✓ Inadimplência sob controle: {current_rate:.2f}% (limite: {threshold:.2f}%)"
-            return False, message
+        return evaluate_delinquency_alert(taxa_inadimplencia)
     
     def simulate_scenario(self, scenario_name: str, changes: Dict) -> Dict:
         """
@@ -222,24 +1016,93 @@ class DataProcessor:
             raise ValueError("Data not cleaned. Call clean_data() first.")
         
         logger.info(f"Simulating scenario: {scenario_name}")
-        df_scenario = self.cleaned_df.copy()
+        # Only the KPI inputs are needed; the shared cleaned_df is never modified
+        scenario_cols = {col: self.cleaned_df[col] for col in self.NUMERIC_COLUMNS}
+        scales = self.cleaned_df.attrs.get('money_scale', {})
         
         # Apply changes
         for col, change in changes.items():
-            if col in df_scenario.columns:
+            if col in self.cleaned_df.columns:
                 if isinstance(change, float) and -1 <= change <= 1:
                     # Treat as percentage change
-                    df_scenario[col] = df_scenario[col] * (1 + change)
+                    scenario_cols[col] = self.cleaned_df[col] * (1 + change)
                     logger.info(f"  Applied {change*100:+.1f}% change to {col}")
                 else:
-                    # Treat as absolute value
-                    df_scenario[col] = change
+                    # Treat as absolute value (R$ for monetary columns)
+                    scenario_cols[col] = pd.Series(change * scales.get(col, 1),
+                                                   index=self.cleaned_df.index)
         
         # Recalculate KPIs with scenario data
-        original_df = self.cleaned_df
-        self.cleaned_df = df_scenario
-        scenario_kpis = self.calculate_kpis()
-        self.cleaned_df = original_df  # Restore original
+        df_scenario = pd.DataFrame(scenario_cols)
+        df_scenario.attrs = dict(self.cleaned_df.attrs)
+        scenario_kpis, _ = compute_kpis(df_scenario)
         
         logger.info(f"Scenario '{scenario_name}' completed")
         return scenario_kpis
+    
+    def simulate_scenario_grid(self, changes_grid: Dict[str, Sequence[float]]) -> pd.DataFrame:
+        """
+        Simulate a whole grid of percentage-change scenarios at once.
+        
+        Every combination of the given changes is evaluated. A percentage
+        change only rescales its column, so each KPI is the baseline statistic
+        times a per-scenario factor; all scenarios are computed in one
+        broadcasted NumPy pass without copying the dataframe.
+        
+        Args:
+            changes_grid: Column -> sequence of fractional changes, e.g.
+                {'Inadimplencia_Valor': np.linspace(-0.5, 0.5, 101),
+                 'Faturamento_Real': [-0.1, 0.0, 0.1]}
+            
+        Returns:
+            pd.DataFrame: Scenario x KPI matrix, indexed by the applied changes
+        """
+        if self.cleaned_df is None:
+            raise ValueError("Data not cleaned. Call clean_data() first.")
+        if not changes_grid:
+            raise ValueError("changes_grid must contain at least one column")
+        
+        invalid_cols = [col for col in changes_grid if col not in self.NUMERIC_COLUMNS]
+        if invalid_cols:
+            raise ValueError(f"Cannot simulate changes on columns: {invalid_cols}")
+        
+        df = self.cleaned_df
+        real = money_values(df, 'Faturamento_Real')
+        taxa = (money_values(df, 'Inadimplencia_Valor') / real) * 100
+        top20 = df['Top20_Concentracao'].to_numpy(dtype=np.float64)
+        
+        # Baseline statistics, computed once
+        base_real = real.sum()
+        base_meta = money_values(df, 'Faturamento_Meta').sum()
+        base_taxa_mean = taxa.mean()
+        base_taxa_std = taxa.std(ddof=1)
+        base_top20_mean = top20.mean()
+        base_top20_trend = top20[-1] - top20[0]
+        
+        # One factor vector per column over the cartesian product of changes
+        grid_cols = list(changes_grid)
+        mesh = np.meshgrid(*[np.asarray(changes_grid[col], dtype=np.float64)
+                             for col in grid_cols], indexing='ij')
+        changes = {col: axis.ravel() for col, axis in zip(grid_cols, mesh)}
+        n_scenarios = mesh[0].size
+        factor = {col: 1 + changes.get(col, np.zeros(n_scenarios))
+                  for col in self.NUMERIC_COLUMNS}
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_real = base_real * factor['Faturamento_Real']
+            total_meta = base_meta * factor['Faturamento_Meta']
+            taxa_scale = factor['Inadimplencia_Valor'] / factor['Faturamento_Real']
+            scenario_kpis = pd.DataFrame({
+                'faturamento_acumulado': total_real,
+                'meta_acumulada': total_meta,
+                'gap_meta_percentual': ((total_real - total_meta) / total_meta) * 100,
+                'taxa_inadimplencia_media': base_taxa_mean * taxa_scale,
+                'taxa_inadimplencia_std': base_taxa_std * np.abs(taxa_scale),
+                'concentracao_top20_media': base_top20_mean * factor['Top20_Concentracao'],
+                'concentracao_top20_tendencia': base_top20_trend * factor['Top20_Concentracao'],
+                'meses_analisados': np.full(n_scenarios, len(df))
+            }, index=pd.MultiIndex.from_arrays([changes[col] for col in grid_cols],
+                                               names=grid_cols))
+        
+        logger.info(f"Scenario grid simulated: {n_scenarios} scenarios over {grid_cols}")
+        return scenario_kpis
@@ -0,0 +1,275 @@
+"""
+Delinquency Alerts Module - CDL Manaus Intelligence Hub
+Rolling-window delinquency alerting across all clients or branches
+Vectorized scans plus an incremental monitor for hourly/monthly checks
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Tuple
+import logging
+
+from .data_processor import format_month, money_values, month_ordinal
+
+logger = logging.getLogger(__name__)
+
+
+def _month_numbers(mes: pd.Series) -> np.ndarray:
+    """Calendar month count (year * 12 + month - 1) of any supported 'Mes' dtype."""
+    if isinstance(mes.dtype, pd.PeriodDtype):
+        mes = mes.dt.to_timestamp()
+    elif pd.api.types.is_integer_dtype(mes):
+        return mes.to_numpy(dtype=np.int64)
+    mes = pd.to_datetime(mes)
+    return (mes.dt.year * 12 + mes.dt.month - 1).to_numpy(dtype=np.int64)
+
+
+def _sorted_rates(df: pd.DataFrame, entity_col: str) -> Tuple[np.ndarray, pd.Index, np.ndarray, np.ndarray]:
+    """
+    Sort a long-format frame by entity and month and compute delinquency rates.
+    
+    Returns:
+        Tuple: (entity codes, entities, rates (%), original row positions), sorted
+    """
+    missing_cols = [col for col in [entity_col, 'Mes', 'Faturamento_Real', 'Inadimplencia_Valor']
+                    if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {missing_cols}")
+    
+    codes, entities = pd.factorize(df[entity_col], sort=True)
+    rows = np.flatnonzero(codes >= 0)
+    order = rows[np.lexsort((month_ordinal(df['Mes'])[rows], codes[rows]))]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = (money_values(df, 'Inadimplencia_Valor')[order]
+                 / money_values(df, 'Faturamento_Real')[order]) * 100
+    return codes[order], pd.Index(entities, name=entity_col), rates, order
+
+
+def _window_stats(values: np.ndarray, min_periods: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-wise mean and sample std of a (n_entities x window) NaN-padded matrix."""
+    counts = np.isfinite(values).sum(axis=1)
+    filled = np.where(np.isfinite(values), values, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = filled.sum(axis=1) / counts
+        sq_dev = np.where(np.isfinite(values), (values - mean[:, None]) ** 2, 0.0)
+        std = np.sqrt(sq_dev.sum(axis=1) / (counts - 1))
+    valid = counts >= max(min_periods, 2)
+    return np.where(valid, mean, np.nan), np.where(valid, std, np.nan)
+
+
+def scan_delinquency_alerts(df: pd.DataFrame, entity_col: str = 'Entidade',
+                            window: int = 12, sigma: float = 1.0,
+                            min_periods: int = 3) -> pd.DataFrame:
+    """
+    Check every entity's latest month against its trailing window.
+    
+    An entity triggers when its latest delinquency rate exceeds the mean plus
+    `sigma` standard deviations of the previous `window` calendar months (the
+    current month is excluded, as in the alert spec); months an entity did
+    not report are gaps, not extra history. All entities are evaluated in
+    one cumulative-sum pass.
+    
+    Args:
+        df: Long-format frame with entity column, 'Mes', 'Faturamento_Real'
+            and 'Inadimplencia_Valor'
+        entity_col: Column identifying the client/branch
+        window: Number of previous calendar months in the baseline
+        sigma: Standard deviation multiplier for the threshold
+        min_periods: Minimum valid months in the window to evaluate
+    
+    Returns:
+        pd.DataFrame: Triggered entities only, indexed by entity
+    """
+    if window < 2:
+        raise ValueError("window must be at least 2 months")
+    
+    codes, entities, rates, order = _sorted_rates(df, entity_col)
+    counts = np.bincount(codes, minlength=len(entities))
+    ends = np.cumsum(counts) - 1
+    starts = ends - counts + 1
+    
+    # (entity, month) keys in sorted order locate each window by calendar month
+    months = _month_numbers(df['Mes'])[order]
+    first = months.min() if len(months) else 0
+    span = (months.max() - first if len(months) else 0) + window + 1
+    keys = codes.astype(np.int64) * span + (months - first)
+    
+    # Prefix sums over finite rates, centered for numerical stability
+    finite = np.isfinite(rates)
+    center = rates[finite].mean() if finite.any() else 0.0
+    centered = np.where(finite, rates - center, 0.0)
+    csum = np.concatenate(([0.0], np.cumsum(centered)))
+    csq = np.concatenate(([0.0], np.cumsum(centered ** 2)))
+    cnt = np.concatenate(([0], np.cumsum(finite)))
+    
+    lo = np.maximum(starts, np.searchsorted(keys, keys[ends] - window, side='left'))
+    hi = np.searchsorted(keys, keys[ends], side='left')
+    n = cnt[hi] - cnt[lo]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = csum[hi] - csum[lo]
+        mean = total / n
+        var = (csq[hi] - csq[lo] - n * mean ** 2) / (n - 1)
+        std = np.sqrt(np.maximum(var, 0.0))
+    mean = mean + center
+    
+    current = rates[ends]
+    limit = mean + sigma * std
+    valid = (n >= max(min_periods, 2)) & np.isfinite(current)
+    triggered = valid & (current > limit)
+    
+    alerts = pd.DataFrame({
+        'Mes': df['Mes'].to_numpy()[order[ends]],
+        'Taxa_Inadimplencia': current,
+        'media_janela': mean,
+        'desvio_janela': std,
+        'limite': limit
+    }, index=entities)[triggered]
+    
+    logger.info(f"Delinquency scan: {len(alerts)} of {len(entities)} entities above "
+                f"mean + {sigma:g} std over {window} months")
+    return alerts
+
+
+class RollingAlertMonitor:
+    """
+    Incremental rolling-window delinquency monitor for many entities.
+    Keeps the rates of the last `window` calendar months of every entity in
+    a matrix (NaN for months an entity did not report), so a new month is
+    evaluated and absorbed in O(entities x window) with no re-scan of history.
+    """
+    
+    def __init__(self, entity_col: str = 'Entidade', window: int = 12,
+                 sigma: float = 1.0, min_periods: int = 3):
+        """
+        Initialize the monitor.
+        
+        Args:
+            entity_col: Column identifying the client/branch
+            window: Number of previous calendar months in the baseline
+            sigma: Standard deviation multiplier for the threshold
+            min_periods: Minimum valid months in the window to evaluate
+        """
+        if window < 2:
+            raise ValueError("window must be at least 2 months")
+        self.entity_col = entity_col
+        self.window = window
+        self.sigma = sigma
+        self.min_periods = min_periods
+        self.entities = pd.Index([], name=entity_col)
+        self.history = np.full((0, window), np.nan)
+        self.last_month = None
+        logger.info(f"RollingAlertMonitor initialized: window={window}, sigma={sigma}")
+    
+    def fit(self, df: pd.DataFrame) -> 'RollingAlertMonitor':
+        """
+        Seed the window with the `window` calendar months up to the latest
+        month in the history.
+        
+        Args:
+            df: Long-format history
+        
+        Returns:
+            RollingAlertMonitor: self
+        """
+        codes, entities, rates, order = _sorted_rates(df, self.entity_col)
+        months = _month_numbers(df['Mes'])[order]
+        self.last_month = months.max() if len(months) else None
+        
+        # Calendar months back from the latest month (0 = latest)
+        back = self.last_month - months if len(months) else months
+        keep = back < self.window
+        
+        self.entities = entities
+        self.history = np.full((len(entities), self.window), np.nan)
+        self.history[codes[keep], self.window - 1 - back[keep]] = rates[keep]
+        
+        logger.info(f"RollingAlertMonitor fitted on {len(entities)} entities")
+        return self
+    
+    def evaluate(self, month_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evaluate a (possibly partial) new month without absorbing it.
+        Useful for hourly checks while the month is still open.
+        
+        Args:
+            month_df: One row per entity for the month being checked
+        
+        Returns:
+            pd.DataFrame: Triggered entities only, indexed by entity
+        """
+        entity_codes, rates = self._align(month_df)
+        known = entity_codes >= 0
+        # Skipped months since the last absorbed one fall out of the window
+        gap = min(self._gap(month_df), self.window + 1)
+        mean, std = _window_stats(self.history[:, gap - 1:], self.min_periods)
+        
+        row_mean = np.full(len(rates), np.nan)
+        row_std = np.full(len(rates), np.nan)
+        row_mean[known] = mean[entity_codes[known]]
+        row_std[known] = std[entity_codes[known]]
+        limit = row_mean + self.sigma * row_std
+        with np.errstate(invalid='ignore'):
+            triggered = np.isfinite(limit) & np.isfinite(rates) & (rates > limit)
+        
+        alerts = pd.DataFrame({
+            'Mes': month_df['Mes'].to_numpy(),
+            'Taxa_Inadimplencia': rates,
+            'media_janela': row_mean,
+            'desvio_janela': row_std,
+            'limite': limit
+        }, index=pd.Index(month_df[self.entity_col].to_numpy(), name=self.entity_col))
+        return alerts[triggered]
+    
+    def update(self, month_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Evaluate a closed month, then shift it into every entity's window.
+        Entities missing from the month, and skipped months, become gaps;
+        new entities are added.
+        
+        Args:
+            month_df: One row per entity for the new month
+        
+        Returns:
+            pd.DataFrame: Triggered entities only, indexed by entity
+        """
+        months = _month_numbers(month_df['Mes'])
+        if len(months) and self.last_month is not None and months.min() <= self.last_month:
+            raise ValueError(f"Month {format_month(month_df['Mes'].iloc[0])} is not after the "
+                             f"last absorbed month")
+        
+        alerts = self.evaluate(month_df)
+        
+        new_entities = pd.Index(month_df[self.entity_col].unique()).difference(self.entities)
+        if len(new_entities):
+            self.entities = self.entities.append(new_entities).rename(self.entity_col)
+            self.history = np.vstack([self.history,
+                                      np.full((len(new_entities), self.window), np.nan)])
+        
+        entity_codes, rates = self._align(month_df)
+        shift = min(self._gap(month_df), self.window)
+        self.history[:, :-shift] = self.history[:, shift:]
+        self.history[:, -shift:] = np.nan
+        self.history[entity_codes, -1] = rates
+        if len(months):
+            self.last_month = months.max()
+        
+        logger.info(f"Month absorbed for {len(month_df)} entities: {len(alerts)} alert(s)")
+        return alerts
+    
+    def _gap(self, month_df: pd.DataFrame) -> int:
+        """Calendar months between the last absorbed month and month_df's month."""
+        months = _month_numbers(month_df['Mes'])
+        if not len(months) or self.last_month is None:
+            return 1
+        return max(int(months.max() - self.last_month), 1)
+    
+    def _align(self, month_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Map month rows to monitor rows (-1 when unknown) and compute their rates."""
+        if month_df[self.entity_col].duplicated().any():
+            raise ValueError("A month frame must contain one row per entity")
+        entity_codes = self.entities.get_indexer(month_df[self.entity_col])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = (money_values(month_df, 'Inadimplencia_Valor')
+                     / money_values(month_df, 'Faturamento_Real')) * 100
+        return entity_codes, rates
@@ -5,22 +5,292 @@ Implements time series forecasting using ARIMA for revenue projection
 
 import pandas as pd
 import numpy as np
+from multiprocessing.connection import wait
 from typing import Dict, List, Tuple, Optional
+import importlib.util
 import logging
+import multiprocessing
+import os
+import time
 import warnings
 
-# Suppress ARIMA convergence warnings for cleaner output
-warnings.filterwarnings('ignore')
+from .bootstrap_intervals import (N_PATHS, bootstrap_intervals, moving_average_components,
+                                  trend_components)
+from .data_processor import money_values, month_ordinal
+from .model_cache import ModelCache
+from .vectorized_forecasting import (SMOOTHING_KINDS, fit_exponential_smoothing,
+                                     forecast_exponential_smoothing, smoothing_psi)
 
-try:
+logger = logging.getLogger(__name__)
+
+# statsmodels is only located here; it is imported on the first ARIMA fit
+STATSMODELS_AVAILABLE = importlib.util.find_spec('statsmodels') is not None
+if not STATSMODELS_AVAILABLE:
+    logger.warning("statsmodels not installed. Forecasting will use simple methods.")
+
+# Candidate AR/MA orders of the ARIMA grid search; d comes from the ADF test
+ARIMA_GRID = {'p': (0, 1, 2), 'q': (0, 1, 2)}
+
+# Upper bounds of the stepwise search (seasonal P/Q only with a seasonal period)
+STEPWISE_LIMITS = {'p': 5, 'q': 5, 'P': 2, 'Q': 2}
+
+# Stepwise starting models as (p, q, P, Q), as in Hyndman & Khandakar (2008)
+STEPWISE_START = [(2, 2, 1, 1), (0, 0, 0, 0), (1, 0, 1, 0), (0, 1, 0, 1)]
+
+NO_SEASON = (0, 0, 0, 0)
+
+# Budgeted fits degrade along this chain, from most to least expensive
+FALLBACK_CHAIN = ['arima', 'holt', 'trend', 'moving_average']
+
+# Prediction interval methods: closed-form bands or residual bootstrap paths
+INTERVAL_METHODS = ('analytic', 'bootstrap')
+
+# Display names of the forecast methods (the 'method' of result dicts)
+METHOD_LABELS = {
+    'arima': 'ARIMA',
+    'moving_average': 'Moving Average',
+    'trend': 'Linear Trend',
+    'ses': 'Simple Exponential Smoothing',
+    'holt': 'Holt',
+    'holt_winters': 'Holt-Winters'
+}
+
+
+def _statsmodels():
+    """Import the statsmodels ARIMA model and ADF test on first use."""
     from statsmodels.tsa.arima.model import ARIMA
     from statsmodels.tsa.stattools import adfuller
-    STATSMODELS_AVAILABLE = True
-except ImportError:
-    STATSMODELS_AVAILABLE = False
-    logging.warning("statsmodels not installed. Forecasting will use simple methods.")
+    return ARIMA, adfuller
 
-logger = logging.getLogger(__name__)
+
+def _fit_arima_candidate(series: np.ndarray, candidate: Tuple[Tuple, Tuple],
+                         max_iter: Optional[int] = None):
+    """
+    Fit one ARIMA candidate (module level so it can run in a worker).
+    
+    Args:
+        series: Billing series
+        candidate: ((p,d,q), (P,D,Q,m)) orders
+        max_iter: Optimizer iteration limit (None uses the statsmodels default)
+    
+    Returns:
+        Tuple: (candidate, fitted results or None, AIC)
+    """
+    ARIMA, _ = _statsmodels()
+    order, seasonal_order = candidate
+    try:
+        # Convergence warnings are expected while searching orders
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            fitted_model = ARIMA(series, order=order, seasonal_order=seasonal_order).fit(
+                method_kwargs={'maxiter': max_iter} if max_iter else None)
+        return candidate, fitted_model, fitted_model.aic
+    except Exception:
+        return candidate, None, np.inf
+
+
+def _fit_candidate_worker(conn, series: np.ndarray, candidate: Tuple[Tuple, Tuple],
+                          max_iter: Optional[int] = None) -> None:
+    """Worker process entry point: fit one candidate and send the result back."""
+    try:
+        conn.send(_fit_arima_candidate(series, candidate, max_iter))
+    finally:
+        conn.close()
+
+
+class FittedForecast:
+    """
+    Fitted forecasting model returned by BillingForecaster.fit().
+    Serves predictions and confidence intervals for any horizon without refitting.
+    """
+    
+    def __init__(self, method: str, series: np.ndarray, params: Dict, model=None):
+        """
+        Initialize the handle.
+        
+        Args:
+            method: Display name of the method (a METHOD_LABELS value)
+            series: Billing series the model was fitted on
+            params: Fitted parameters of the method
+            model: statsmodels results object (ARIMA only)
+        """
+        self.method = method
+        self.tier = {label: name for name, label in METHOD_LABELS.items()}[method]
+        self.series = series
+        self.params = params
+        self.model = model
+        self._model_summary = None
+    
+    @classmethod
+    def moving_average(cls, series: np.ndarray, window: int = 3) -> 'FittedForecast':
+        """
+        Fit a moving average of the last `window` periods.
+        
+        Args:
+            series: Billing series
+            window: Moving average window size
+            
+        Returns:
+            FittedForecast: Moving average handle
+        """
+        return cls('Moving Average', series, {
+            'window': window,
+            'level': float(np.mean(series[-window:])),
+            'std': float(np.std(series[-window:]))
+        })
+    
+    @property
+    def model_summary(self) -> Optional[str]:
+        """statsmodels summary text, built on first access (ARIMA only)."""
+        if self.model is not None and self._model_summary is None:
+            self._model_summary = str(self.model.summary())
+        return self._model_summary
+    
+    def predict(self, periods: int = 1, interval_method: str = 'analytic',
+                n_paths: int = N_PATHS, seed: Optional[int] = 0) -> Dict:
+        """
+        Forecast future periods from the fitted parameters.
+        
+        Args:
+            periods: Number of periods to forecast
+            interval_method: 'analytic' (closed-form 95% bands) or 'bootstrap'
+                (simulated residual paths that widen with the horizon)
+            n_paths: Simulated paths per series for 'bootstrap'
+            seed: Random seed for 'bootstrap'
+            
+        Returns:
+            Dict: Forecast results with predictions and confidence intervals
+        """
+        if interval_method not in INTERVAL_METHODS:
+            raise ValueError(f"Unknown interval method '{interval_method}'. Use one of {INTERVAL_METHODS}")
+        
+        if self.method == 'ARIMA':
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    forecast_conf = self.model.get_forecast(steps=periods)
+                predictions = np.asarray(forecast_conf.predicted_mean).tolist()
+                ci_lower, ci_upper = self._extract_confidence_intervals(forecast_conf.conf_int())
+                extra = {'order': self.params['order'], 'aic': self.params['aic']}
+                if self.params.get('seasonal_order', NO_SEASON) != NO_SEASON:
+                    extra['seasonal_order'] = self.params['seasonal_order']
+            except Exception as e:
+                logger.error(f"ARIMA modeling failed: {str(e)}")
+                logger.warning("Falling back to moving average method")
+                return FittedForecast.moving_average(self.series).predict(
+                    periods, interval_method=interval_method, n_paths=n_paths, seed=seed)
+        elif self.method == 'Moving Average':
+            # For multiple periods, use the same MA value (naive forecast)
+            ma = self.params['level']
+            predictions = [ma] * periods
+            
+            # Estimate confidence interval based on historical standard deviation
+            ci_lower = [ma - 1.96 * self.params['std']] * periods
+            ci_upper = [ma + 1.96 * self.params['std']] * periods
+            extra = {'window': self.params['window']}
+        elif self.method == 'Linear Trend':
+            # Predict future periods along the fitted trend
+            n = len(self.series)
+            trend = np.poly1d(self.params['trend_coefficients'])
+            predictions = trend(np.arange(n, n + periods)).tolist()
+            
+            std_residual = self.params['std_residual']
+            ci_lower = [p - 1.96 * std_residual for p in predictions]
+            ci_upper = [p + 1.96 * std_residual for p in predictions]
+            extra = {'trend_coefficients': self.params['trend_coefficients']}
+        else:
+            # Exponential smoothing from the final level, trend and season states
+            state = self.params['state']
+            forecast = forecast_exponential_smoothing(state, periods=periods)
+            predictions = forecast['predictions'][0].tolist()
+            ci_lower = forecast['confidence_interval_lower'][0].tolist()
+            ci_upper = forecast['confidence_interval_upper'][0].tolist()
+            extra = {'smoothing_params': dict(zip(('alpha', 'beta', 'gamma'),
+                                                  state['params'][0].tolist()))}
+        
+        if interval_method == 'bootstrap':
+            ci_lower, ci_upper = self._bootstrap_intervals(predictions, ci_lower, ci_upper,
+                                                           n_paths, seed)
+        
+        result = {
+            'method': self.method,
+            'tier': self.tier,
+            **extra,
+            'forecast_periods': periods,
+            'interval_method': interval_method,
+            'predictions': predictions,
+            'prediction_dezembro': float(predictions[0]) if periods >= 1 else None,
+            'confidence_interval_lower': ci_lower,
+            'confidence_interval_upper': ci_upper,
+            'historical_mean': float(np.mean(self.series))
+        }
+        
+        if result['prediction_dezembro'] is not None:
+            logger.info(f"{self.method} forecast: December 2025 = R$ {result['prediction_dezembro']:,.2f}")
+        return result
+    
+    def _bootstrap_intervals(self, predictions: List[float], ci_lower: List[float],
+                             ci_upper: List[float], n_paths: int,
+                             seed: Optional[int]) -> Tuple[List[float], List[float]]:
+        """
+        Residual-bootstrap bounds from the method's residuals and psi weights.
+        
+        Falls back to the analytic bounds when the fit left no residuals
+        (e.g. a series no longer than the moving average window).
+        """
+        periods = len(predictions)
+        factors = None
+        if self.method == 'ARIMA':
+            residuals = np.asarray(self.model.resid)[self.model.loglikelihood_burn:]
+            psi = np.asarray(self.model.impulse_responses(periods - 1)).ravel()[:periods]
+        elif self.method == 'Moving Average':
+            components = moving_average_components(self.series, periods, self.params['window'])
+            residuals, psi = components['residuals'], components['psi']
+        elif self.method == 'Linear Trend':
+            components = trend_components(self.series, periods)
+            residuals, psi = components['residuals'], components['psi']
+            factors = components['parameter_factors']
+        else:
+            state = self.params['state']
+            residuals = state['residuals']
+            psi = smoothing_psi(state['params'], state['season'].shape[1], periods)
+        
+        bounds = bootstrap_intervals([predictions], residuals, psi, n_paths=n_paths, seed=seed,
+                                     parameter_factors=factors)
+        lower = bounds['confidence_interval_lower'][0]
+        upper = bounds['confidence_interval_upper'][0]
+        if np.isnan(lower).any():
+            return ci_lower, ci_upper
+        return lower.tolist(), upper.tolist()
+    
+    def _extract_confidence_intervals(self, conf_int) -> Tuple[List[float], List[float]]:
+        """
+        Safely extract confidence interval bounds from various formats.
+        
+        Args:
+            conf_int: Confidence interval object (DataFrame, ndarray, etc.)
+            
+        Returns:
+            Tuple of (lower_bounds, upper_bounds) as lists
+        """
+        try:
+            if hasattr(conf_int, 'iloc'):
+                # DataFrame format
+                ci_lower = conf_int.iloc[:, 0].tolist()
+                ci_upper = conf_int.iloc[:, 1].tolist()
+            elif hasattr(conf_int, 'shape') and len(conf_int.shape) == 2:
+                # NumPy array format
+                ci_lower = conf_int[:, 0].tolist()
+                ci_upper = conf_int[:, 1].tolist()
+            else:
+                # Fallback for unexpected formats
+                ci_lower = [float(conf_int[0, 0])]
+                ci_upper = [float(conf_int[0, 1])]
+            return ci_lower, ci_upper
+        except Exception as e:
+            logger.warning(f"Error extracting confidence intervals: {e}. Using default values.")
+            # Return empty confidence intervals as fallback
+            return [0.0], [0.0]
 
 
 class BillingForecaster:
@@ -29,22 +299,62 @@ class BillingForecaster:
     Implements strategic forecasting for December 2025 revenue projection.
     """
     
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, n_jobs: int = 1,
+                 fit_timeout: Optional[float] = None,
+                 cache: Optional[ModelCache] = None,
+                 search: str = 'grid', seasonal_period: Optional[int] = None,
+                 time_budget: Optional[float] = None, max_iter: Optional[int] = None):
         """
         Initialize forecaster with historical billing data.
         
         Args:
             data: DataFrame with 'Mes' and 'Faturamento_Real' columns
+            n_jobs: Worker processes for the ARIMA order search
+                (1 fits in the current process, -1 uses all cores)
+            fit_timeout: Seconds allowed per candidate fit in a worker process;
+                candidates still running past it are terminated
+            cache: Fitted-model cache shared across forecaster instances
+            search: ARIMA order search - 'grid' (fixed 3x3 grid) or 'stepwise'
+                (Hyndman-Khandakar neighbourhood search)
+            seasonal_period: Season length for seasonal (P,0,Q,m) terms in the
+                stepwise search, e.g. 12 for monthly data (None disables them)
+            time_budget: Seconds for the ARIMA search of fit(); when exhausted
+                the fit degrades along FALLBACK_CHAIN (None disables budgets)
+            max_iter: Optimizer iteration limit per ARIMA candidate fit
         """
+        if search not in ('grid', 'stepwise'):
+            raise ValueError(f"Unknown search '{search}'. Use 'grid' or 'stepwise'")
         if 'Mes' not in data.columns or 'Faturamento_Real' not in data.columns:
             raise ValueError("Data must contain 'Mes' and 'Faturamento_Real' columns")
         
-        self.data = data.copy()
-        self.data = self.data.sort_values('Mes')
+        self.data = self._prepare(data)
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+        self.fit_timeout = fit_timeout
+        self.cache = cache
+        self.search = search
+        self.seasonal_period = seasonal_period if seasonal_period and seasonal_period > 1 else None
+        self.time_budget = time_budget
+        self.max_iter = max_iter
+        self._deadline = None
+        self.last_search = None
+        self.last_budget = None
+        self.last_update = None
         self.model = None
+        self.fitted = None
         self.forecast_result = None
         logger.info(f"BillingForecaster initialized with {len(data)} data points")
     
+    @staticmethod
+    def _prepare(data: pd.DataFrame) -> pd.DataFrame:
+        """Sort by month, converting compact centavos revenue to R$."""
+        data = data.sort_values('Mes')
+        scales = dict(data.attrs.get('money_scale', {}))
+        if scales.pop('Faturamento_Real', None):
+            # Compact frames may store centavos; forecast in R$
+            data['Faturamento_Real'] = money_values(data, 'Faturamento_Real')
+            data.attrs['money_scale'] = scales
+        return data
+    
     def check_stationarity(self) -> Tuple[bool, float]:
         """
         Check if the time series is stationary using Augmented Dickey-Fuller test.
@@ -55,223 +365,486 @@ class BillingForecaster:
         if not STATSMODELS_AVAILABLE:
             return False, 1.0
         
+        _, adfuller = _statsmodels()
         series = self.data['Faturamento_Real'].values
-        result = adfuller(series)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            result = adfuller(series)
         p_value = result[1]
         is_stationary = p_value < 0.05
         
         logger.info(f"Stationarity test: p-value = {p_value:.4f}, stationary = {is_stationary}")
         return is_stationary, p_value
     
-    def forecast_billing(self, periods: int = 1, method: str = 'arima') -> Dict:
+    def fit(self, method: str = 'arima') -> 'FittedForecast':
         """
-        Forecast billing for future periods using specified method.
+        Fit a forecasting model once; the handle serves any horizon.
         
         Args:
-            periods: Number of periods to forecast (default: 1 for December)
-            method: Forecasting method - 'arima', 'moving_average', or 'trend'
+            method: Forecasting method - 'arima', 'moving_average', 'trend',
+                'ses', 'holt' or 'holt_winters'
             
         Returns:
-            Dict: Forecast results with predictions and confidence intervals
+            FittedForecast: Fitted model handle
         """
-        logger.info(f"Starting forecast for {periods} period(s) using {method} method")
+        logger.info(f"Fitting {method} model")
         
-        if method == 'arima' and STATSMODELS_AVAILABLE:
-            return self._forecast_arima(periods)
-        elif method == 'moving_average':
-            return self._forecast_moving_average(periods)
-        elif method == 'trend':
-            return self._forecast_trend(periods)
+        if self.time_budget is not None:
+            self.fitted = self._fit_budgeted(method)
         else:
-            logger.warning(f"Method '{method}' not available, falling back to moving average")
-            return self._forecast_moving_average(periods)
+            self.fitted = self._fit_method(method)
+        return self.fitted
+    
+    def _fit_method(self, method: str) -> 'FittedForecast':
+        """Dispatch a fit to the method's implementation."""
+        if method == 'arima' and STATSMODELS_AVAILABLE:
+            return self._fit_arima()
+        if method == 'moving_average':
+            return self._fit_moving_average()
+        if method == 'trend':
+            return self._fit_trend()
+        if method in SMOOTHING_KINDS:
+            return self._fit_smoothing(method)
+        logger.warning(f"Method '{method}' not available, falling back to moving average")
+        return self._fit_moving_average()
     
-    def _forecast_arima(self, periods: int) -> Dict:
+    def _fit_budgeted(self, method: str) -> 'FittedForecast':
         """
-        Forecast using ARIMA model.
-        Auto-determines best (p,d,q) parameters.
+        Fit within time_budget, degrading along FALLBACK_CHAIN.
+        
+        Under a budget the ARIMA search always runs its candidates in worker
+        processes, so none starts once the budget is spent and running ones
+        are terminated at the deadline; a search cut short, a failed fit or a
+        fit that itself fell back moves on to the next, cheaper tier. The closed-form tiers are cheap enough to always run.
+        The producing tier is recorded in last_budget and the result's 'tier'.
+        """
+        chain = FALLBACK_CHAIN[FALLBACK_CHAIN.index(method):] if method in FALLBACK_CHAIN \
+            else [method] + FALLBACK_CHAIN[1:]
+        if self.time_budget <= 0 and chain[0] == 'arima':
+            chain = chain[1:]
+        
+        # Loading statsmodels is a one-off per process, not search time
+        if 'arima' in chain and STATSMODELS_AVAILABLE:
+            _statsmodels()
+        
+        start = time.perf_counter()
+        self._deadline = start + self.time_budget
+        tried, fitted = [], None
+        try:
+            for tier in chain:
+                tried.append(tier)
+                if tier == 'arima':
+                    self.last_search = None
+                try:
+                    candidate = self._fit_method(tier)
+                except Exception as e:
+                    logger.warning(f"Tier '{tier}' failed: {e}")
+                    continue
+                exhausted = tier == 'arima' and self.last_search is not None and \
+                    self.last_search['budget_exhausted']
+                if candidate.tier == tier and not exhausted:
+                    fitted = candidate
+                    break
+                logger.warning(f"Tier '{tier}' gave no complete fit within the budget; degrading")
+        finally:
+            self._deadline = None
+        
+        if fitted is None:
+            fitted = self._fit_moving_average()
+        self.last_budget = {
+            'requested': method,
+            'tier': fitted.tier,
+            'tiers_tried': tried,
+            'elapsed': time.perf_counter() - start,
+            'time_budget': self.time_budget
+        }
+        logger.info(f"Budgeted fit: requested '{method}', produced by '{fitted.tier}' "
+                    f"in {self.last_budget['elapsed']:.2f}s")
+        return fitted
+    
+    def update(self, new_data: pd.DataFrame, drift_threshold: float = 3.0) -> 'FittedForecast':
+        """
+        Append new months and update the fitted model without a full search.
+        
+        The previous ARIMA order is kept and refitted from the previous
+        parameters as a warm start. The full order search only runs again when
+        the drift check fails: a new month whose one-step-ahead standardized
+        forecast error under the previous model exceeds drift_threshold.
+        Other methods are simply refitted, which is already cheap.
         
         Args:
-            periods: Number of periods to forecast
+            new_data: New rows with 'Mes' and 'Faturamento_Real', all after the
+                last month already in the forecaster
+            drift_threshold: Maximum absolute standardized forecast error
+                before the order search is re-run
             
         Returns:
-            Dict: Forecast results
+            FittedForecast: Updated model handle
         """
-        series = self.data['Faturamento_Real'].values
-        
-        # Auto-determine parameters based on data characteristics
-        # For monthly billing data, common patterns:
-        # p (AR terms): 1-2, d (differencing): 0-1, q (MA terms): 1-2
-        
-        # Check if differencing is needed
-        is_stationary, _ = self.check_stationarity()
-        d = 0 if is_stationary else 1
+        if 'Mes' not in new_data.columns or 'Faturamento_Real' not in new_data.columns:
+            raise ValueError("Data must contain 'Mes' and 'Faturamento_Real' columns")
+        new_data = self._prepare(new_data)
+        if len(new_data) == 0:
+            return self.fitted if self.fitted is not None else self.fit()
+        if month_ordinal(new_data['Mes']).min() <= month_ordinal(self.data['Mes']).max():
+            raise ValueError("New data must start after the last month already fitted")
+        
+        new_values = new_data['Faturamento_Real'].to_numpy(dtype=np.float64)
+        self.data = pd.concat([self.data, new_data[self.data.columns.intersection(new_data.columns)]],
+                              ignore_index=True)
+        previous = self.fitted
+        
+        if previous is None or previous.method != 'ARIMA':
+            labels = {label: name for name, label in METHOD_LABELS.items()}
+            method = labels.get(getattr(previous, 'method', None), 'arima')
+            self.last_update = {'new_months': len(new_values), 'drift_error': None, 'refit': 'full'}
+            return self.fit(method)
+        
+        # One-step-ahead errors of the new months under the previous parameters
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            extended = previous.model.append(new_values, refit=False)
+        errors = extended.standardized_forecasts_error[0, -len(new_values):]
+        drift_error = float(np.nanmax(np.abs(errors))) if np.isfinite(errors).any() else np.inf
+        
+        if drift_error > drift_threshold:
+            logger.warning(f"Drift detected (|error| = {drift_error:.2f} > {drift_threshold}); "
+                           f"re-running the order search")
+            self.last_update = {'new_months': len(new_values), 'drift_error': drift_error,
+                                'refit': 'full_search'}
+            return self.fit('arima')
         
-        # Try different parameter combinations and select best AIC
-        best_aic = np.inf
-        best_order = (1, d, 1)
+        series = self.data['Faturamento_Real'].values
+        order, seasonal_order = previous.params['order'], previous.params['seasonal_order']
+        ARIMA, _ = _statsmodels()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                self.model = ARIMA(series, order=order, seasonal_order=seasonal_order).fit(
+                    start_params=previous.model.params)
+        except Exception as e:
+            logger.warning(f"Warm-start refit failed ({e}); re-running the order search")
+            self.last_update = {'new_months': len(new_values), 'drift_error': drift_error,
+                                'refit': 'full_search'}
+            return self.fit('arima')
+        
+        self.last_update = {'new_months': len(new_values), 'drift_error': drift_error,
+                            'refit': 'warm_start'}
+        logger.info(f"ARIMA{order} updated with {len(new_values)} new month(s) "
+                    f"(max |error| = {drift_error:.2f})")
+        self.fitted = FittedForecast('ARIMA', series, {
+            'order': order, 'seasonal_order': seasonal_order, 'aic': self.model.aic
+        }, model=self.model)
+        return self.fitted
+    
+    def forecast_billing(self, periods: int = 1, method: str = 'arima',
+                         interval_method: str = 'analytic', n_paths: int = N_PATHS,
+                         seed: Optional[int] = 0) -> Dict:
+        """
+        Forecast billing for future periods using specified method.
         
-        for p in range(0, 3):
-            for q in range(0, 3):
-                try:
-                    model = ARIMA(series, order=(p, d, q))
-                    fitted_model = model.fit()
-                    if fitted_model.aic < best_aic:
-                        best_aic = fitted_model.aic
-                        best_order = (p, d, q)
-                except:
-                    continue
+        Args:
+            periods: Number of periods to forecast (default: 1 for December)
+            method: Forecasting method - 'arima', 'moving_average', 'trend',
+                'ses', 'holt' or 'holt_winters'
+            interval_method: 'analytic' or 'bootstrap' prediction intervals
+            n_paths: Simulated paths for 'bootstrap'
+            seed: Random seed for 'bootstrap'
+            
+        Returns:
+            Dict: Forecast results with predictions and confidence intervals;
+                ARIMA results also carry the statsmodels 'model_summary'
+        """
+        logger.info(f"Starting forecast for {periods} period(s) using {method} method")
+        fitted = self.fit(method)
+        self.forecast_result = fitted.predict(periods, interval_method=interval_method,
+                                              n_paths=n_paths, seed=seed)
+        # predict() leaves the summary out (it is costly); this entry point keeps it
+        if self.forecast_result['method'] == 'ARIMA':
+            self.forecast_result['model_summary'] = fitted.model_summary
+        return self.forecast_result
+    
+    def _fit_arima(self) -> 'FittedForecast':
+        """
+        Fit an ARIMA model.
+        Auto-determines best (p,d,q) parameters.
         
-        logger.info(f"Best ARIMA order: {best_order} (AIC: {best_aic:.2f})")
+        Returns:
+            FittedForecast: ARIMA handle, or moving average if no order fits
+        """
+        series = self.data['Faturamento_Real'].values
         
-        # Fit final model
-        try:
-            model = ARIMA(series, order=best_order)
-            self.model = model.fit()
-            
-            # Generate forecast
-            forecast = self.model.forecast(steps=periods)
-            forecast_conf = self.model.get_forecast(steps=periods)
-            conf_int = forecast_conf.conf_int()
-            
-            # Calculate historical mean for baseline comparison
-            historical_mean = series.mean()
+        cache_key = None
+        cached = None
+        if self.cache is not None:
+            cache_key = self._cache_key(series)
+            cached = self.cache.get(cache_key)
+        
+        if cached is not None:
+            best_candidate, self.model, best_aic = cached
+            logger.info("Reusing cached ARIMA fit for unchanged series")
+        elif self._budget_left() is not None and self._budget_left() <= 0:
+            # No time left for the stationarity test, let alone a candidate
+            self._start_search_report(0)
+            self.last_search['budget_exhausted'] = True
+            best_candidate, self.model, best_aic = None, None, np.inf
+        else:
+            # Auto-determine parameters based on data characteristics
+            # For monthly billing data, common patterns:
+            # p (AR terms): 1-2, d (differencing): 0-1, q (MA terms): 1-2
             
-            # Extract confidence intervals safely
-            ci_lower, ci_upper = self._extract_confidence_intervals(conf_int)
+            # Check if differencing is needed
+            is_stationary, _ = self.check_stationarity()
+            d = 0 if is_stationary else 1
             
-            # Build result
-            result = {
-                'method': 'ARIMA',
-                'order': best_order,
-                'aic': best_aic,
-                'forecast_periods': periods,
-                'predictions': forecast.tolist(),
-                'prediction_dezembro': float(forecast[0]) if periods >= 1 else None,
-                'confidence_interval_lower': ci_lower,
-                'confidence_interval_upper': ci_upper,
-                'historical_mean': float(historical_mean),
-                'model_summary': str(self.model.summary())
-            }
+            if self.search == 'stepwise':
+                best_candidate, self.model, best_aic = self._stepwise_search(series, d)
+            else:
+                # Try different parameter combinations and keep the best AIC fit
+                candidates = [((p, d, q), NO_SEASON) for p in ARIMA_GRID['p'] for q in ARIMA_GRID['q']]
+                self._start_search_report(len(candidates))
+                best_candidate, self.model, best_aic = self._best_fit(self._fit_candidates(series, candidates))
             
-            logger.info(f"ARIMA forecast complete: December 2025 = R$ {result['prediction_dezembro']:,.2f}")
-            return result
+            logger.info(f"{self.search.capitalize()} search: {self.last_search['n_fits']} fits "
+                        f"(grid over the same orders: {self.last_search['grid_fits']})")
             
-        except Exception as e:
-            logger.error(f"ARIMA modeling failed: {str(e)}")
+            # Searches cut short by the timeout or the time budget are not reusable
+            if cache_key is not None and self.model is not None and \
+                    not self.last_search['timed_out'] and not self.last_search['budget_exhausted']:
+                self.cache.put(cache_key, (best_candidate, self.model, best_aic))
+        
+        if self.model is None:
+            logger.error("ARIMA modeling failed: no candidate order could be fitted")
             logger.warning("Falling back to moving average method")
-            return self._forecast_moving_average(periods)
+            return self._fit_moving_average()
+        
+        best_order, seasonal_order = best_candidate
+        logger.info(f"Best ARIMA order: {best_order} x {seasonal_order} (AIC: {best_aic:.2f})")
+        return FittedForecast('ARIMA', series, {
+            'order': best_order, 'seasonal_order': seasonal_order, 'aic': best_aic
+        }, model=self.model)
     
-    def _forecast_moving_average(self, periods: int, window: int = 3) -> Dict:
+    def _cache_key(self, series: np.ndarray) -> str:
+        """Model cache key of an ARIMA fit under this forecaster's search config."""
+        return ModelCache.make_key(series, 'arima', {
+            'search': self.search, 'seasonal_period': self.seasonal_period,
+            'grid': ARIMA_GRID, 'limits': STEPWISE_LIMITS, 'max_iter': self.max_iter
+        })
+    
+    def _stepwise_search(self, series: np.ndarray, d: int) -> Tuple:
         """
-        Forecast using simple moving average.
+        Hyndman-Khandakar stepwise search.
+        
+        Fits the starting models, then repeatedly fits the unvisited neighbours
+        of the current best model (each of p, q, P, Q by +/-1, and p/q and P/Q
+        together), moving while AIC improves and stopping once it does not.
         
         Args:
-            periods: Number of periods to forecast
-            window: Moving average window size
+            series: Billing series
+            d: Differencing order from the ADF test
             
         Returns:
-            Dict: Forecast results
+            Tuple: (best candidate, best fitted results or None, best AIC)
         """
-        series = self.data['Faturamento_Real'].values
-        
-        # Calculate moving average of last 'window' periods
-        ma = np.mean(series[-window:])
+        m = self.seasonal_period
+        limits = dict(STEPWISE_LIMITS) if m else dict(STEPWISE_LIMITS, P=0, Q=0)
+        self._start_search_report((limits['p'] + 1) * (limits['q'] + 1) *
+                                  (limits['P'] + 1) * (limits['Q'] + 1))
+        
+        def to_candidate(key):
+            p, q, P, Q = key
+            return (p, d, q), ((P, 0, Q, m) if P or Q else NO_SEASON)
+        
+        def within_limits(key):
+            return all(0 <= value <= limits[name] for name, value in zip('pqPQ', key))
+        
+        visited = set()
+        best = (None, None, np.inf)
+        batch = [tuple(min(v, limits[n]) for n, v in zip('pqPQ', key)) for key in STEPWISE_START]
+        while batch:
+            fresh = [key for key in dict.fromkeys(batch) if key not in visited and within_limits(key)]
+            visited.update(fresh)
+            improved = self._best_fit(self._fit_candidates(series, [to_candidate(key) for key in fresh]), best)
+            if improved[2] >= best[2]:
+                break
+            best = improved
+            
+            (p, _, q), (P, _, Q, _) = best[0]
+            batch = []
+            for step in (-1, 1):
+                batch += [(p + step, q, P, Q), (p, q + step, P, Q), (p + step, q + step, P, Q)]
+                if m:
+                    batch += [(p, q, P + step, Q), (p, q, P, Q + step), (p, q, P + step, Q + step)]
+        return best
+    
+    def _start_search_report(self, grid_fits: int) -> None:
+        """Reset the fit counters reported in last_search."""
+        self.last_search = {'strategy': self.search, 'n_fits': 0, 'grid_fits': grid_fits,
+                            'fitted': 0, 'timed_out': 0, 'budget_exhausted': False}
+    
+    def _budget_left(self) -> Optional[float]:
+        """Seconds left of the current fit's time budget (None when unbudgeted)."""
+        return None if self._deadline is None else self._deadline - time.perf_counter()
+    
+    def _fit_candidates(self, series: np.ndarray, candidates: List[Tuple]) -> List[Tuple]:
+        """
+        Fit candidates, in worker processes when n_jobs > 1, a timeout is set
+        or a time budget is running.
         
-        # For multiple periods, use the same MA value (naive forecast)
-        predictions = [ma] * periods
+        Each candidate runs in its own process, at most n_jobs at a time, so a
+        fit that overruns fit_timeout is terminated on its own instead of
+        holding a pool worker. Under a time budget no candidate starts after
+        the deadline and running ones are terminated at it; the search is then
+        flagged 'budget_exhausted'. No worker outlives the call.
         
-        # Estimate confidence interval based on historical standard deviation
-        std = np.std(series[-window:])
-        conf_lower = [ma - 1.96 * std] * periods
-        conf_upper = [ma + 1.96 * std] * periods
+        Args:
+            series: Billing series
+            candidates: ((p,d,q), (P,D,Q,m)) orders
+            
+        Returns:
+            List[Tuple]: (candidate, fitted results or None, AIC) of finished fits
+        """
+        if not candidates:
+            return []
+        if self.n_jobs == 1 and self.fit_timeout is None and self._deadline is None:
+            results = [_fit_arima_candidate(series, candidate, self.max_iter) for candidate in candidates]
+            self.last_search['n_fits'] += len(results)
+        else:
+            results, started, timed_out = self._fit_in_workers(series, candidates)
+            if (timed_out or started < len(candidates)) and \
+                    self._budget_left() is not None and self._budget_left() <= 0:
+                self.last_search['budget_exhausted'] = True
+            if timed_out or started < len(candidates):
+                logger.warning(f"{timed_out} ARIMA candidate(s) were terminated at the fit timeout "
+                               f"or time budget and {len(candidates) - started} never started")
+            self.last_search['n_fits'] += started
+            self.last_search['timed_out'] += timed_out
+        
+        self.last_search['fitted'] += sum(fitted_model is not None for _, fitted_model, _ in results)
+        return results
+    
+    def _fit_in_workers(self, series: np.ndarray, candidates: List[Tuple]) -> Tuple[List[Tuple], int, int]:
+        """
+        Run candidate fits in one worker process each, at most n_jobs at a time.
         
-        result = {
-            'method': 'Moving Average',
-            'window': window,
-            'forecast_periods': periods,
-            'predictions': predictions,
-            'prediction_dezembro': predictions[0],
-            'confidence_interval_lower': conf_lower,
-            'confidence_interval_upper': conf_upper,
-            'historical_mean': float(np.mean(series))
-        }
+        Args:
+            series: Billing series
+            candidates: ((p,d,q), (P,D,Q,m)) orders
         
-        logger.info(f"Moving average forecast: December 2025 = R$ {result['prediction_dezembro']:,.2f}")
-        return result
+        Returns:
+            Tuple: (finished results, candidates started, candidates terminated)
+        """
+        # Forked workers inherit the already imported statsmodels
+        _statsmodels()
+        context = multiprocessing.get_context()
+        pending = list(candidates)
+        running = {}
+        results, started, timed_out = [], 0, 0
+        try:
+            while pending or running:
+                while pending and len(running) < self.n_jobs and \
+                        (self._budget_left() is None or self._budget_left() > 0):
+                    candidate = pending.pop(0)
+                    receiver, sender = context.Pipe(duplex=False)
+                    process = context.Process(target=_fit_candidate_worker, daemon=True,
+                                              args=(sender, series, candidate, self.max_iter))
+                    process.start()
+                    sender.close()
+                    deadline = np.inf if self.fit_timeout is None else \
+                        time.perf_counter() + self.fit_timeout
+                    running[receiver] = (process, candidate, deadline)
+                    started += 1
+                if not running:
+                    break
+                
+                # Wake up for a result, the earliest fit timeout or the budget deadline
+                wake = min(deadline for _, _, deadline in running.values())
+                if self._deadline is not None:
+                    wake = min(wake, self._deadline)
+                timeout = None if wake == np.inf else max(0.0, wake - time.perf_counter())
+                for receiver in wait(list(running), timeout=timeout):
+                    process, candidate, _ = running.pop(receiver)
+                    try:
+                        results.append(receiver.recv())
+                    except (EOFError, OSError):
+                        results.append((candidate, None, np.inf))
+                    receiver.close()
+                    process.join()
+                
+                now = time.perf_counter()
+                budget_spent = self._deadline is not None and now >= self._deadline
+                for receiver, (process, _, deadline) in list(running.items()):
+                    if budget_spent or now >= deadline:
+                        running.pop(receiver)
+                        receiver.close()
+                        process.terminate()
+                        process.join()
+                        timed_out += 1
+        finally:
+            for receiver, (process, _, _) in running.items():
+                receiver.close()
+                process.terminate()
+                process.join()
+        return results, started, timed_out
+    
+    @staticmethod
+    def _best_fit(results: List[Tuple], best: Tuple = (None, None, np.inf)) -> Tuple:
+        """Lowest-AIC fitted result, starting from a previous best."""
+        for candidate, fitted_model, aic in results:
+            if fitted_model is not None and aic < best[2]:
+                best = (candidate, fitted_model, aic)
+        return best
     
-    def _forecast_trend(self, periods: int) -> Dict:
+    def _fit_moving_average(self, window: int = 3) -> 'FittedForecast':
         """
-        Forecast using linear trend extrapolation.
+        Fit a simple moving average.
         
         Args:
-            periods: Number of periods to forecast
+            window: Moving average window size
             
         Returns:
-            Dict: Forecast results
+            FittedForecast: Moving average handle
         """
-        series = self.data['Faturamento_Real'].values
-        n = len(series)
+        return FittedForecast.moving_average(self.data['Faturamento_Real'].values, window)
+    
+    def _fit_trend(self) -> 'FittedForecast':
+        """
+        Fit a linear trend: y = a + b*x.
         
-        # Fit linear trend: y = a + b*x
-        x = np.arange(n)
+        Returns:
+            FittedForecast: Linear trend handle
+        """
+        series = self.data['Faturamento_Real'].values
+        x = np.arange(len(series))
         coeffs = np.polyfit(x, series, 1)
-        trend = np.poly1d(coeffs)
-        
-        # Predict future periods
-        future_x = np.arange(n, n + periods)
-        predictions = trend(future_x).tolist()
-        
-        # Estimate confidence interval from residuals
-        fitted_values = trend(x)
-        residuals = series - fitted_values
-        std_residual = np.std(residuals)
         
-        conf_lower = [p - 1.96 * std_residual for p in predictions]
-        conf_upper = [p + 1.96 * std_residual for p in predictions]
-        
-        result = {
-            'method': 'Linear Trend',
+        # Confidence interval width from residuals
+        residuals = series - np.poly1d(coeffs)(x)
+        return FittedForecast('Linear Trend', series, {
             'trend_coefficients': coeffs.tolist(),
-            'forecast_periods': periods,
-            'predictions': predictions,
-            'prediction_dezembro': predictions[0],
-            'confidence_interval_lower': conf_lower,
-            'confidence_interval_upper': conf_upper,
-            'historical_mean': float(np.mean(series))
-        }
-        
-        logger.info(f"Trend forecast: December 2025 = R$ {result['prediction_dezembro']:,.2f}")
-        return result
+            'std_residual': float(np.std(residuals))
+        })
     
-    def _extract_confidence_intervals(self, conf_int) -> Tuple[List[float], List[float]]:
+    def _fit_smoothing(self, kind: str) -> 'FittedForecast':
         """
-        Safely extract confidence interval bounds from various formats.
+        Fit simple, Holt or Holt-Winters exponential smoothing.
         
         Args:
-            conf_int: Confidence interval object (DataFrame, ndarray, etc.)
+            kind: 'ses', 'holt' or 'holt_winters' (season length from
+                seasonal_period, 12 by default)
             
         Returns:
-            Tuple of (lower_bounds, upper_bounds) as lists
+            FittedForecast: Smoothing handle, or moving average if the series
+                is too short for the variant
         """
+        series = self.data['Faturamento_Real'].values
         try:
-            if hasattr(conf_int, 'iloc'):
-                # DataFrame format
-                ci_lower = conf_int.iloc[:, 0].tolist()
-                ci_upper = conf_int.iloc[:, 1].tolist()
-            elif hasattr(conf_int, 'shape') and len(conf_int.shape) == 2:
-                # NumPy array format
-                ci_lower = conf_int[:, 0].tolist()
-                ci_upper = conf_int[:, 1].tolist()
-            else:
-                # Fallback for unexpected formats
-                ci_lower = [float(conf_int[0, 0])]
-                ci_upper = [float(conf_int[0, 1])]
-            return ci_lower, ci_upper
-        except Exception as e:
-            logger.warning(f"Error extracting confidence intervals: {e}. Using default values.")
-            # Return empty confidence intervals as fallback
-            return [0.0], [0.0]
+            state = fit_exponential_smoothing(series, kind=kind,
+                                              seasonal_period=self.seasonal_period or 12)
+        except ValueError as e:
+            logger.warning(f"{METHOD_LABELS[kind]} not fitted ({e}); falling back to moving average")
+            return self._fit_moving_average()
+        return FittedForecast(METHOD_LABELS[kind], series, {'kind': kind, 'state': state})
     
     def get_forecast_summary(self) -> str:
         """
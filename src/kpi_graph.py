@@ -0,0 +1,180 @@
+"""
+KPI Graph Module - CDL Manaus Intelligence Hub
+Lazily evaluated, memoized KPI nodes with declared dependencies
+Only the inputs of a requested KPI are computed, and only when they changed
+"""
+
+import pandas as pd
+import numpy as np
+import hashlib
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from .data_processor import DataProcessor, evaluate_delinquency_alert, money_values
+
+logger = logging.getLogger(__name__)
+
+
+def _column_fingerprint(df: pd.DataFrame, col: str) -> str:
+    """Content hash of one column (values and dtype, index ignored)."""
+    series = df[col]
+    hashed = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    digest = hashlib.blake2b(hashed.tobytes(), digest_size=16)
+    digest.update(str(series.dtype).encode())
+    digest.update(repr(df.attrs.get('money_scale', {}).get(col, 1)).encode())
+    return digest.hexdigest()
+
+
+# name -> (column dependencies, node dependencies, function(df, *node_values))
+KPI_NODES: Dict[str, Tuple[List[str], List[str], Callable]] = {
+    'faturamento_acumulado': (
+        ['Faturamento_Real'], [],
+        lambda df: money_values(df, 'Faturamento_Real').sum()
+    ),
+    'meta_acumulada': (
+        ['Faturamento_Meta'], [],
+        lambda df: money_values(df, 'Faturamento_Meta').sum()
+    ),
+    'gap_meta_percentual': (
+        [], ['faturamento_acumulado', 'meta_acumulada'],
+        lambda df, real, meta: ((real - meta) / meta) * 100
+    ),
+    'Variacao_Mensal': (
+        ['Faturamento_Real'], [],
+        lambda df: pd.Series(money_values(df, 'Faturamento_Real'), index=df.index).pct_change() * 100
+    ),
+    'Taxa_Inadimplencia': (
+        ['Faturamento_Real', 'Inadimplencia_Valor'], [],
+        lambda df: pd.Series(money_values(df, 'Inadimplencia_Valor')
+                             / money_values(df, 'Faturamento_Real') * 100, index=df.index)
+    ),
+    'taxa_inadimplencia_media': (
+        [], ['Taxa_Inadimplencia'],
+        lambda df, taxa: taxa.mean()
+    ),
+    'taxa_inadimplencia_std': (
+        [], ['Taxa_Inadimplencia'],
+        lambda df, taxa: taxa.std()
+    ),
+    'concentracao_top20_media': (
+        ['Top20_Concentracao'], [],
+        lambda df: df['Top20_Concentracao'].astype(np.float64).mean()
+    ),
+    'concentracao_top20_tendencia': (
+        ['Top20_Concentracao'], [],
+        lambda df: float(df['Top20_Concentracao'].iloc[-1]) - float(df['Top20_Concentracao'].iloc[0])
+    ),
+    'meses_analisados': (
+        ['Mes'], [],
+        lambda df: len(df)
+    ),
+    'alerta_inadimplencia': (
+        [], ['Taxa_Inadimplencia'],
+        lambda df, taxa: evaluate_delinquency_alert(taxa)
+    )
+}
+
+# Keys of DataProcessor.calculate_kpis(), in the same order
+KPI_KEYS = ['faturamento_acumulado', 'meta_acumulada', 'gap_meta_percentual',
+            'taxa_inadimplencia_media', 'taxa_inadimplencia_std',
+            'concentracao_top20_media', 'concentracao_top20_tendencia',
+            'meses_analisados']
+
+
+class KPIGraph:
+    """
+    Lazy KPI dependency graph over a DataProcessor's cleaned dataframe.
+    
+    Each node is memoized against the versions of its inputs. Column versions
+    only advance when the processor's data_version changed and the column's
+    content hash differs, so reloading or mutating data invalidates just the
+    nodes that depend on the affected columns.
+    """
+    
+    def __init__(self, processor: DataProcessor):
+        """
+        Initialize the graph for a processor.
+        
+        Args:
+            processor: DataProcessor whose cleaned_df feeds the nodes
+        """
+        self.processor = processor
+        self._memo: Dict[str, Tuple[Tuple, object, int]] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._column_versions: Dict[str, int] = {}
+        self._checked: Dict[str, int] = {}
+        self._stamp = 0
+        self.compute_counts: Dict[str, int] = {name: 0 for name in KPI_NODES}
+        logger.info(f"KPIGraph initialized with {len(KPI_NODES)} nodes")
+    
+    def get(self, name: str):
+        """
+        Evaluate one KPI, computing only the stale nodes it depends on.
+        
+        Args:
+            name: Node name (a calculate_kpis() key, 'Variacao_Mensal',
+                'Taxa_Inadimplencia' or 'alerta_inadimplencia')
+        
+        Returns:
+            The node value
+        """
+        if name not in KPI_NODES:
+            raise KeyError(f"Unknown KPI node '{name}'. Available: {list(KPI_NODES)}")
+        df = self.processor.cleaned_df
+        if df is None:
+            raise ValueError("Data not cleaned. Call clean_data() first.")
+        return self._evaluate(name, df)[0]
+    
+    def kpis(self) -> Dict:
+        """
+        Evaluate every KPI of calculate_kpis() through the graph.
+        
+        Returns:
+            Dict: Same keys as DataProcessor.calculate_kpis()
+        """
+        return {key: self.get(key) for key in KPI_KEYS}
+    
+    def invalidate(self, columns: Optional[List[str]] = None) -> None:
+        """
+        Force recomputation after in-place edits the version counter cannot see.
+        
+        Args:
+            columns: Columns that changed; None drops every memoized node
+        """
+        if columns is None:
+            self._memo.clear()
+            self._fingerprints.clear()
+            self._checked.clear()
+            return
+        for col in columns:
+            self._column_versions[col] = self._column_versions.get(col, 0) + 1
+            self._fingerprints.pop(col, None)
+            self._checked.pop(col, None)
+    
+    def _column_version(self, col: str, df: pd.DataFrame) -> int:
+        """Current version of a column, rehashing it once per data version."""
+        data_version = self.processor.data_version
+        if self._checked.get(col) != data_version:
+            fingerprint = _column_fingerprint(df, col)
+            if self._fingerprints.get(col) != fingerprint:
+                self._fingerprints[col] = fingerprint
+                self._column_versions[col] = self._column_versions.get(col, 0) + 1
+            self._checked[col] = data_version
+        return self._column_versions[col]
+    
+    def _evaluate(self, name: str, df: pd.DataFrame) -> Tuple[object, int]:
+        """Evaluate a node recursively; returns (value, stamp)."""
+        columns, inputs, func = KPI_NODES[name]
+        evaluated = [self._evaluate(node, df) for node in inputs]
+        key = tuple(self._column_version(col, df) for col in columns) + \
+            tuple(stamp for _, stamp in evaluated)
+        
+        memo = self._memo.get(name)
+        if memo is not None and memo[0] == key:
+            return memo[1], memo[2]
+        
+        value = func(df, *[value for value, _ in evaluated])
+        self._stamp += 1
+        self._memo[name] = (key, value, self._stamp)
+        self.compute_counts[name] += 1
+        return value, self._stamp
@@ -0,0 +1,152 @@
+"""
+Model Cache Module - CDL Manaus Intelligence Hub
+Two-tier cache for fitted forecasting models
+In-memory LRU for the running process plus an optional on-disk pickle tier
+"""
+
+import numpy as np
+from collections import OrderedDict
+from importlib import metadata
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def _library_versions() -> str:
+    """Versions that affect pickled model compatibility (read without importing)."""
+    try:
+        statsmodels_version = metadata.version('statsmodels')
+    except metadata.PackageNotFoundError:
+        statsmodels_version = 'none'
+    return f"numpy={np.__version__};statsmodels={statsmodels_version}"
+
+
+class ModelCache:
+    """
+    Cache of fitted models keyed by series content, method and search config.
+    
+    Lookups check the in-memory LRU first, then the on-disk tier (when a
+    cache_dir is given), promoting disk hits into memory. Disk entries are
+    written atomically so concurrent processes never read a partial file.
+    """
+    
+    def __init__(self, max_entries: int = 32, cache_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum models kept in memory
+            cache_dir: Directory for the persistent tier (None keeps memory only)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._memory: 'OrderedDict[str, Any]' = OrderedDict()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        logger.info(f"ModelCache initialized: max_entries={max_entries}, cache_dir={cache_dir}")
+    
+    @staticmethod
+    def make_key(series, method: str, config: Optional[Dict] = None) -> str:
+        """
+        Build a cache key from the series values, method and search config.
+        
+        Args:
+            series: Series values the model is fitted on
+            method: Forecasting method name
+            config: JSON-serializable search configuration
+        
+        Returns:
+            str: Hex digest identifying the fit
+        """
+        values = np.ascontiguousarray(np.asarray(series, dtype=np.float64))
+        digest = hashlib.sha256(values.tobytes())
+        digest.update(method.encode())
+        digest.update(json.dumps(config or {}, sort_keys=True, default=str).encode())
+        digest.update(_library_versions().encode())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached model.
+        
+        Args:
+            key: Key from make_key()
+        
+        Returns:
+            The cached value, or None on a miss
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return self._memory[key]
+        
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable cache entry {key[:12]}: {e}")
+                os.remove(path)
+            else:
+                self.stats['disk_hits'] += 1
+                self._remember(key, value)
+                return value
+        
+        self.stats['misses'] += 1
+        return None
+    
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a model in memory and, when configured, on disk.
+        
+        Args:
+            key: Key from make_key()
+            value: Picklable value to cache
+        """
+        self._remember(key, value)
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not persist cache entry {key[:12]}: {e}")
+    
+    def clear(self, disk: bool = False) -> None:
+        """
+        Drop cached models.
+        
+        Args:
+            disk: Also delete the persistent tier
+        """
+        self._memory.clear()
+        if disk and self.cache_dir is not None:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, name))
+    
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _path(self, key: str) -> Optional[str]:
+        """Disk path of an entry, or None without a persistent tier."""
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.pkl")
@@ -0,0 +1,140 @@
+"""
+Monte Carlo Module - CDL Manaus Intelligence Hub
+Samples joint revenue/delinquency scenarios from historical behaviour
+and reports the resulting KPI distributions (risk view of the simulator)
+"""
+
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+import logging
+
+from .data_processor import DataProcessor, money_values
+
+logger = logging.getLogger(__name__)
+
+# KPIs produced per simulated scenario, in column order of the sample matrix
+SIMULATED_KPIS = ['faturamento_acumulado', 'gap_meta_percentual',
+                  'taxa_inadimplencia_media', 'taxa_inadimplencia_std']
+
+
+def _simulate_chunk(real: np.ndarray, meta_total: float, inad: np.ndarray,
+                    shocks: np.ndarray, n_sims: int,
+                    seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Simulate one chunk of scenarios (module level so it can run in a worker).
+    
+    Each scenario draws one historical (revenue, delinquency) month-over-month
+    change pair per month, keeping the joint behaviour of both series.
+    
+    Returns:
+        np.ndarray: (n_sims, len(SIMULATED_KPIS)) KPI samples
+    """
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(shocks), size=(n_sims, len(real)))
+    
+    sim_real = real * (1 + shocks[picks, 0])
+    sim_inad = inad * (1 + shocks[picks, 1])
+    
+    total_real = sim_real.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        taxa = (sim_inad / sim_real) * 100
+        gap = ((total_real - meta_total) / meta_total) * 100
+    ddof = 1 if len(real) > 1 else 0
+    
+    return np.column_stack([total_real, gap, taxa.mean(axis=1), taxa.std(axis=1, ddof=ddof)])
+
+
+class MonteCarloSimulator:
+    """
+    Monte Carlo scenario engine on top of DataProcessor.
+    Turns point what-ifs into KPI distributions using seeded, chunked sampling.
+    """
+    
+    def __init__(self, processor: DataProcessor):
+        """
+        Initialize the simulator from a processor with cleaned data.
+        
+        Args:
+            processor: DataProcessor after clean_data()
+        """
+        if processor.cleaned_df is None:
+            raise ValueError("Data not cleaned. Call clean_data() first.")
+        
+        df = processor.cleaned_df
+        self.real = money_values(df, 'Faturamento_Real')
+        self.inad = money_values(df, 'Inadimplencia_Valor')
+        self.meta_total = float(money_values(df, 'Faturamento_Meta').sum())
+        
+        # Historical joint month-over-month changes (revenue, delinquency)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shocks = np.column_stack([self.real[1:] / self.real[:-1] - 1,
+                                      self.inad[1:] / self.inad[:-1] - 1])
+        self.shocks = shocks[np.isfinite(shocks).all(axis=1)]
+        if len(self.shocks) == 0:
+            raise ValueError("At least two valid months are required to sample shocks")
+        
+        logger.info(f"MonteCarloSimulator initialized: {len(self.real)} months, "
+                    f"{len(self.shocks)} historical shocks")
+    
+    def run(self, n_simulations: int = 100_000, seed: Optional[int] = None,
+            chunk_size: int = 10_000, n_workers: int = 1,
+            percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+            return_samples: bool = False) -> Dict:
+        """
+        Sample joint scenarios and summarize the KPI distributions.
+        
+        Memory is bounded by chunk_size x months per chunk; only the per-scenario
+        KPIs are kept. Chunk seeds are spawned from one SeedSequence, so results
+        are identical for any n_workers.
+        
+        Args:
+            n_simulations: Number of scenarios to sample
+            seed: Seed for reproducible sampling
+            chunk_size: Scenarios per chunk
+            n_workers: Worker processes (1 runs in the current process)
+            percentiles: Percentiles to report
+            return_samples: Include the raw (n_simulations x KPI) samples
+        
+        Returns:
+            Dict: KPI percentiles, means and simulation metadata
+        """
+        if n_simulations < 1 or chunk_size < 1:
+            raise ValueError("n_simulations and chunk_size must be positive")
+        
+        sizes = [chunk_size] * (n_simulations // chunk_size)
+        if n_simulations % chunk_size:
+            sizes.append(n_simulations % chunk_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        
+        logger.info(f"Running {n_simulations:,} Monte Carlo scenarios in "
+                    f"{len(sizes)} chunk(s) with {n_workers} worker(s)")
+        
+        args = ([self.real] * len(sizes), [self.meta_total] * len(sizes),
+                [self.inad] * len(sizes), [self.shocks] * len(sizes), sizes, seeds)
+        if n_workers > 1 and len(sizes) > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                chunks: List[np.ndarray] = list(executor.map(_simulate_chunk, *args))
+        else:
+            chunks = list(map(_simulate_chunk, *args))
+        
+        samples = np.vstack(chunks)
+        percentile_table = pd.DataFrame(
+            np.nanpercentile(samples, percentiles, axis=0),
+            index=pd.Index(list(percentiles), name='percentil'),
+            columns=SIMULATED_KPIS
+        )
+        
+        result = {
+            'n_simulations': n_simulations,
+            'seed': seed,
+            'percentiles': percentile_table,
+            'mean': dict(zip(SIMULATED_KPIS, np.nanmean(samples, axis=0))),
+            'prob_below_target': float(np.mean(samples[:, 1] < 0))
+        }
+        if return_samples:
+            result['samples'] = pd.DataFrame(samples, columns=SIMULATED_KPIS)
+        
+        logger.info(f"Monte Carlo complete: median gap = {np.nanmedian(samples[:, 1]):.2f}%")
+        return result
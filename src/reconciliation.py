@@ -0,0 +1,237 @@
+"""
+Reconciliation Module - CDL Manaus Intelligence Hub
+Hierarchical forecast reconciliation so that product, segment and total forecasts add up
+Bottom-up and OLS/WLS/MinT projections over sparse summing matrices
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Total billing and its BCG product columns
+PRODUCT_HIERARCHY = {'Faturamento_Real': ['Consultas', 'Certificados', 'CDL_Saude']}
+
+# Reconciliation methods; the projections differ only in their diagonal weights
+RECONCILIATION_METHODS = ('bottom_up', 'ols', 'wls', 'mint_diag')
+
+
+def _sparse():
+    """Import scipy.sparse and its LU factorization on first use."""
+    from scipy import sparse
+    from scipy.sparse.linalg import splu
+    return sparse, splu
+
+
+class ForecastReconciler:
+    """
+    Reconciles forecasts of a hierarchy (e.g. associates -> segments -> total).
+    
+    Nodes are ordered aggregates first, then bottom series, so the summing
+    matrix is S = [A; I] with A mapping bottom series to their aggregates.
+    Every method reconciles all nodes and forecast steps in one sparse
+    linear-algebra step.
+    """
+    
+    def __init__(self, aggregation, aggregate_nodes: Sequence, bottom_nodes: Sequence,
+                 method: str = 'ols'):
+        """
+        Initialize the reconciler.
+        
+        Args:
+            aggregation: Sparse (n_aggregates x n_bottom) 0/1 matrix A
+            aggregate_nodes: Labels of the rows of A
+            bottom_nodes: Labels of the columns of A
+            method: 'bottom_up', 'ols', 'wls' (weights by number of bottom
+                series under each node) or 'mint_diag' (weights by forecast
+                error variances)
+        """
+        if method not in RECONCILIATION_METHODS:
+            raise ValueError(f"Unknown reconciliation method '{method}'. "
+                             f"Use one of {RECONCILIATION_METHODS}")
+        sparse, _ = _sparse()
+        self.aggregation = sparse.csr_matrix(aggregation, dtype=np.float64)
+        self.nodes = pd.Index(list(aggregate_nodes) + list(bottom_nodes))
+        if not self.nodes.is_unique:
+            raise ValueError("Node labels must be unique across all hierarchy levels")
+        if self.aggregation.shape != (len(aggregate_nodes), len(bottom_nodes)):
+            raise ValueError("aggregation must be (n_aggregates x n_bottom)")
+        self.n_aggregates = len(aggregate_nodes)
+        self.method = method
+        logger.info(f"ForecastReconciler initialized: {self.n_aggregates} aggregate and "
+                    f"{len(bottom_nodes)} bottom nodes, method={method}")
+    
+    @classmethod
+    def from_levels(cls, bottom: pd.DataFrame, levels: List[str], method: str = 'ols',
+                    total: Optional[str] = 'Total') -> 'ForecastReconciler':
+        """
+        Build the hierarchy from one row per bottom series.
+        
+        Args:
+            bottom: Frame with one column per level, e.g. ['Segmento', 'Associado']
+            levels: Level columns from top to bottom; the last one identifies
+                the bottom series
+            method: Reconciliation method
+            total: Label of the grand-total node (None for no total)
+        
+        Returns:
+            ForecastReconciler: Reconciler over the hierarchy
+        """
+        missing_cols = [col for col in levels if col not in bottom.columns]
+        if missing_cols:
+            raise ValueError(f"Missing required columns: {missing_cols}")
+        sparse, _ = _sparse()
+        
+        bottom_nodes = bottom[levels[-1]].to_numpy()
+        n_bottom = len(bottom_nodes)
+        columns = np.arange(n_bottom)
+        rows, cols, aggregate_nodes = [], [], []
+        if total is not None:
+            rows.append(np.zeros(n_bottom, dtype=int))
+            cols.append(columns)
+            aggregate_nodes.append(total)
+        for level in levels[:-1]:
+            codes, uniques = pd.factorize(bottom[level], sort=True)
+            if (codes < 0).any():
+                raise ValueError(f"Level '{level}' has missing values")
+            rows.append(codes + len(aggregate_nodes))
+            cols.append(columns)
+            aggregate_nodes.extend(uniques)
+        
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=int)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=int)
+        aggregation = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)),
+                                        shape=(len(aggregate_nodes), n_bottom))
+        return cls(aggregation, aggregate_nodes, bottom_nodes, method=method)
+    
+    @classmethod
+    def from_mapping(cls, mapping: Optional[Dict[str, List[str]]] = None,
+                     method: str = 'ols') -> 'ForecastReconciler':
+        """
+        Build the hierarchy from parent -> children lists.
+        
+        Children may be parents themselves; nodes that are never parents are
+        the bottom series. Descendants are found by summing powers of the
+        sparse parent-child adjacency matrix.
+        
+        Args:
+            mapping: Parent -> children (PRODUCT_HIERARCHY by default)
+            method: Reconciliation method
+        
+        Returns:
+            ForecastReconciler: Reconciler over the hierarchy
+        """
+        mapping = PRODUCT_HIERARCHY if mapping is None else mapping
+        sparse, _ = _sparse()
+        
+        parents = list(mapping)
+        children = [child for kids in mapping.values() for child in kids]
+        bottom_nodes = list(dict.fromkeys(child for child in children if child not in mapping))
+        nodes = pd.Index(parents + bottom_nodes)
+        
+        edges_from = nodes.get_indexer([parent for parent, kids in mapping.items() for _ in kids])
+        edges_to = nodes.get_indexer(children)
+        adjacency = sparse.csr_matrix((np.ones(len(edges_to)), (edges_from, edges_to)),
+                                      shape=(len(nodes), len(nodes)))
+        
+        # Descendants: A + A^2 + ... until no longer paths remain
+        descendants, power = adjacency.copy(), adjacency
+        for _ in range(len(nodes)):
+            power = power @ adjacency
+            if power.nnz == 0:
+                break
+            descendants = descendants + power
+        else:
+            raise ValueError("mapping contains a cycle")
+        
+        aggregation = descendants[:len(parents), len(parents):]
+        aggregation.data[:] = 1.0
+        return cls(aggregation, parents, bottom_nodes, method=method)
+    
+    @property
+    def summing_matrix(self):
+        """Sparse summing matrix S = [A; I] (n_nodes x n_bottom)."""
+        sparse, _ = _sparse()
+        return sparse.vstack([self.aggregation,
+                              sparse.identity(self.aggregation.shape[1], format='csr')]).tocsr()
+    
+    def reconcile(self, forecasts: pd.DataFrame,
+                  residual_variance: Optional[pd.Series] = None) -> pd.DataFrame:
+        """
+        Make forecasts coherent with the hierarchy.
+        
+        The projections use the constraint form of MinT with a diagonal W:
+        y~ = y^ - W C' (C W C')^-1 C y^, C = [I | -A]. C W C' is only
+        (n_aggregates x n_aggregates), so one sparse factorization reconciles
+        every node and step, however many bottom series there are.
+        
+        Args:
+            forecasts: One column per node, one row per forecast step
+            residual_variance: Forecast error variance per node ('mint_diag')
+        
+        Returns:
+            pd.DataFrame: Reconciled forecasts, same index, columns in node order
+        """
+        missing_cols = [node for node in self.nodes if node not in forecasts.columns]
+        if missing_cols:
+            raise ValueError(f"Missing forecasts for nodes: {missing_cols}")
+        y_hat = forecasts[self.nodes].to_numpy(dtype=np.float64).T
+        if not np.isfinite(y_hat).all():
+            raise ValueError("Forecasts must be finite for every node and step")
+        
+        aggregates, bottom = y_hat[:self.n_aggregates], y_hat[self.n_aggregates:]
+        if self.method != 'bottom_up' and self.n_aggregates:
+            weights = self._weights(residual_variance)
+            w_aggregates, w_bottom = weights[:self.n_aggregates], weights[self.n_aggregates:]
+            
+            sparse, splu = _sparse()
+            a = self.aggregation
+            system = sparse.diags(w_aggregates) + a @ sparse.diags(w_bottom) @ a.T
+            x = splu(system.tocsc()).solve(aggregates - a @ bottom)
+            bottom = bottom + w_bottom[:, None] * (a.T @ x)
+        
+        reconciled = np.vstack([self.aggregation @ bottom, bottom])
+        logger.info(f"Reconciled {len(self.nodes)} nodes x {y_hat.shape[1]} step(s) "
+                    f"with {self.method}")
+        return pd.DataFrame(reconciled.T, index=forecasts.index, columns=self.nodes)
+    
+    def reconcile_batch(self, results: pd.DataFrame) -> pd.DataFrame:
+        """
+        Reconcile a BatchForecaster result table.
+        
+        For 'mint_diag' the error variance of each node comes from the width
+        of its step-1 interval, ((ci_upper - ci_lower) / (2 * 1.96))^2.
+        
+        Args:
+            results: Table with 'series_id', 'step', 'prediction' (and
+                'ci_lower', 'ci_upper' for 'mint_diag')
+        
+        Returns:
+            pd.DataFrame: results with a 'reconciled' prediction column
+        """
+        forecasts = results.pivot(index='step', columns='series_id', values='prediction')
+        residual_variance = None
+        if self.method == 'mint_diag':
+            first = results[results['step'] == results['step'].min()].set_index('series_id')
+            residual_variance = ((first['ci_upper'] - first['ci_lower']) / (2 * 1.96)) ** 2
+        
+        reconciled = self.reconcile(forecasts, residual_variance).stack()
+        reconciled.index.names = ['step', 'series_id']
+        return results.join(reconciled.rename('reconciled'), on=['step', 'series_id'])
+    
+    def _weights(self, residual_variance: Optional[pd.Series]) -> np.ndarray:
+        """Diagonal of W for the projection methods."""
+        if self.method == 'ols':
+            return np.ones(len(self.nodes))
+        if self.method == 'wls':
+            return np.concatenate([np.asarray(self.aggregation.sum(axis=1)).ravel(),
+                                   np.ones(self.aggregation.shape[1])])
+        
+        if residual_variance is None:
+            raise ValueError("'mint_diag' needs the residual variance of every node")
+        weights = residual_variance.reindex(self.nodes).to_numpy(dtype=np.float64)
+        if not (np.isfinite(weights) & (weights > 0)).all():
+            raise ValueError("Residual variances must be positive for every node")
+        return weights
@@ -0,0 +1,311 @@
+"""
+Vectorized Forecasting Module - CDL Manaus Intelligence Hub
+Closed-form baseline forecasters over (n_series x n_periods) matrices
+Moving average, linear trend and exponential smoothing for many series at once
+"""
+
+import numpy as np
+from typing import Dict, Tuple
+import logging
+import warnings
+
+logger = logging.getLogger(__name__)
+
+
+def _as_matrix(values) -> np.ndarray:
+    """Validate input as a 2-D float matrix (one series per row)."""
+    matrix = np.asarray(values, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    if matrix.ndim != 2 or matrix.shape[1] == 0:
+        raise ValueError("values must be an (n_series x n_periods) matrix")
+    return matrix
+
+
+def moving_average_matrix(values, periods: int = 1, window: int = 3) -> Dict[str, np.ndarray]:
+    """
+    Moving average forecast for every row of a series matrix.
+    
+    Rows are right-aligned (latest period in the last column); NaN marks a
+    missing period, so shorter histories can be left-padded with NaN.
+    Matches BillingForecaster's moving average row by row.
+    
+    Args:
+        values: (n_series x n_periods) matrix
+        periods: Number of periods to forecast
+        window: Moving average window size
+    
+    Returns:
+        Dict: 'predictions', 'confidence_interval_lower' and
+            'confidence_interval_upper' as (n_series x periods) matrices,
+            plus 'historical_mean' per series
+    """
+    matrix = _as_matrix(values)
+    tail = matrix[:, -window:]
+    with warnings.catch_warnings():
+        # All-NaN rows (no history in the window) yield NaN forecasts
+        warnings.simplefilter('ignore', RuntimeWarning)
+        level = np.nanmean(tail, axis=1)
+        std = np.nanstd(tail, axis=1)
+        historical_mean = np.nanmean(matrix, axis=1)
+    
+    predictions = np.repeat(level[:, None], periods, axis=1)
+    return {
+        'predictions': predictions,
+        'confidence_interval_lower': predictions - 1.96 * std[:, None],
+        'confidence_interval_upper': predictions + 1.96 * std[:, None],
+        'historical_mean': historical_mean
+    }
+
+
+def trend_matrix(values, periods: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Least-squares linear trend forecast for every row of a series matrix.
+    
+    Slopes, intercepts and residual standard deviations come from closed-form
+    normal equations over the valid (non-NaN) periods of each row, with the
+    time index shared by all rows. Predictions match np.polyfit(x, y, 1) row
+    by row; intercepts are relative to the first column of the matrix.
+    
+    Args:
+        values: (n_series x n_periods) matrix, right-aligned
+        periods: Number of periods to forecast
+    
+    Returns:
+        Dict: 'predictions', 'confidence_interval_lower' and
+            'confidence_interval_upper' as (n_series x periods) matrices,
+            plus 'trend_coefficients' (n_series x 2: slope, intercept),
+            'std_residual' and 'historical_mean' per series
+    """
+    matrix = _as_matrix(values)
+    n_periods = matrix.shape[1]
+    valid = np.isfinite(matrix)
+    x = np.arange(n_periods, dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        count = valid.sum(axis=1)
+        y = np.where(valid, matrix, 0.0)
+        x_mean = (valid * x).sum(axis=1) / count
+        y_mean = y.sum(axis=1) / count
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dy = np.where(valid, matrix - y_mean[:, None], 0.0)
+        slope = (dx * dy).sum(axis=1) / (dx ** 2).sum(axis=1)
+        intercept = y_mean - slope * x_mean
+        
+        residuals = np.where(valid, dy - slope[:, None] * dx, 0.0)
+        std_residual = np.sqrt((residuals ** 2).sum(axis=1) / count)
+    
+    future_x = np.arange(n_periods, n_periods + periods, dtype=np.float64)
+    predictions = intercept[:, None] + slope[:, None] * future_x
+    return {
+        'predictions': predictions,
+        'confidence_interval_lower': predictions - 1.96 * std_residual[:, None],
+        'confidence_interval_upper': predictions + 1.96 * std_residual[:, None],
+        'trend_coefficients': np.column_stack([slope, intercept]),
+        'std_residual': std_residual,
+        'historical_mean': y_mean
+    }
+
+
+# Smoothing parameter grids searched per series (SSE of one-step errors)
+SMOOTHING_GRID = {
+    'alpha': (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9),
+    'beta': (0.05, 0.1, 0.2, 0.3),
+    'gamma': (0.05, 0.1, 0.2, 0.3)
+}
+
+# Exponential smoothing variants: simple, Holt (trend), Holt-Winters (additive season)
+SMOOTHING_KINDS = ('ses', 'holt', 'holt_winters')
+
+
+def _smoothing_candidates(kind: str) -> np.ndarray:
+    """(n_candidates x 3) grid of (alpha, beta, gamma) for a smoothing variant."""
+    betas = SMOOTHING_GRID['beta'] if kind in ('holt', 'holt_winters') else (0.0,)
+    gammas = SMOOTHING_GRID['gamma'] if kind == 'holt_winters' else (0.0,)
+    mesh = np.meshgrid(SMOOTHING_GRID['alpha'], betas, gammas, indexing='ij')
+    return np.column_stack([axis.ravel() for axis in mesh])
+
+
+def _smoothing_recursion(y: np.ndarray, alpha, beta, gamma, level: np.ndarray, trend: np.ndarray,
+                         season: np.ndarray, start: int, keep_errors: bool = False) -> Tuple:
+    """
+    Run the additive Holt-Winters recursion from period `start`.
+    
+    State arrays have a leading candidate axis or not; the smoothing
+    parameters broadcast against level and trend.
+    
+    Returns:
+        Tuple: (level, trend, season, sse, one-step errors or None)
+    """
+    sse = np.zeros(level.shape)
+    errors = []
+    for t in range(start, y.shape[1]):
+        y_t = y[:, t]
+        slot = t % season.shape[-1]
+        s = season[..., slot]
+        error = y_t - (level + trend + s)
+        sse += error ** 2
+        if keep_errors:
+            errors.append(error)
+        
+        new_level = alpha * (y_t - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[..., slot] = gamma * (y_t - new_level) + (1 - gamma) * s
+        level = new_level
+    return level, trend, season, sse, (np.stack(errors, axis=-1) if keep_errors else None)
+
+
+def _smooth_chunk(y: np.ndarray, candidates: np.ndarray, kind: str, m: int) -> Dict[str, np.ndarray]:
+    """
+    Run the additive Holt-Winters recursion for every (candidate, series) pair
+    and keep the lowest-SSE candidate per series.
+    
+    Simple and Holt smoothing are the same recursion with the season (and
+    trend) held at zero by gamma = 0 (and beta = 0). The chosen candidate is
+    replayed once to keep its one-step errors.
+    """
+    n_series, n_periods = y.shape
+    if kind == 'holt_winters':
+        level = y[:, :m].mean(axis=1)
+        trend = (y[:, m:2 * m].mean(axis=1) - level) / m if n_periods >= 2 * m \
+            else np.zeros(n_series)
+        season = y[:, :m] - level[:, None]
+        start = m
+    elif kind == 'holt':
+        level, trend, season, start = y[:, 1], y[:, 1] - y[:, 0], np.zeros((n_series, 1)), 2
+    else:
+        level, trend, season, start = y[:, 0], np.zeros(n_series), np.zeros((n_series, 1)), 1
+    
+    shape = (len(candidates), n_series)
+    _, _, _, sse, _ = _smoothing_recursion(
+        y, *(candidates[:, i][:, None] for i in range(3)),
+        np.broadcast_to(level, shape).copy(), np.broadcast_to(trend, shape).copy(),
+        np.broadcast_to(season, shape + (season.shape[1],)).copy(), start)
+    
+    best = candidates[sse.argmin(axis=0)]
+    level, trend, season, sse, errors = _smoothing_recursion(
+        y, *best.T, level.copy(), trend.copy(), season.copy(), start, keep_errors=True)
+    # Rotate seasons so column j holds the seasonal term of forecast step j + 1
+    seasons = np.roll(season, -(n_periods % season.shape[1]), axis=1)
+    return {
+        'level': level,
+        'trend': trend,
+        'season': seasons,
+        'params': best,
+        'std_residual': np.sqrt(sse / (n_periods - start)),
+        'residuals': errors
+    }
+
+
+def fit_exponential_smoothing(values, kind: str = 'holt', seasonal_period: int = 12,
+                              max_cells: int = 2_000_000) -> Dict[str, np.ndarray]:
+    """
+    Fit simple, Holt or additive Holt-Winters smoothing to every row of a matrix.
+    
+    The recursions run over the time axis with all series and all grid
+    candidates (SMOOTHING_GRID) updated together; each series keeps the
+    candidate with the lowest sum of squared one-step errors.
+    
+    Args:
+        values: (n_series x n_periods) matrix without missing values
+        kind: 'ses', 'holt' or 'holt_winters'
+        seasonal_period: Season length for 'holt_winters'
+        max_cells: Upper bound on candidates x series x season states per chunk
+    
+    Returns:
+        Dict: Final 'level', 'trend', 'season' (n_series x season length),
+            'params' (n_series x 3: alpha, beta, gamma), 'std_residual' and the
+            one-step 'residuals' (n_series x fitted periods)
+    """
+    if kind not in SMOOTHING_KINDS:
+        raise ValueError(f"Unknown smoothing kind '{kind}'. Use one of {SMOOTHING_KINDS}")
+    matrix = _as_matrix(values)
+    if not np.isfinite(matrix).all():
+        raise ValueError("Exponential smoothing requires complete series (no NaN)")
+    
+    m = seasonal_period if kind == 'holt_winters' else 1
+    min_periods = {'ses': 2, 'holt': 3, 'holt_winters': m + 2}[kind]
+    if matrix.shape[1] < min_periods:
+        raise ValueError(f"'{kind}' needs at least {min_periods} periods, got {matrix.shape[1]}")
+    
+    candidates = _smoothing_candidates(kind)
+    chunk = max(1, max_cells // (len(candidates) * m))
+    parts = [_smooth_chunk(matrix[i:i + chunk], candidates, kind, m)
+             for i in range(0, len(matrix), chunk)]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def smoothing_psi(params: np.ndarray, seasonal_period: int, periods: int) -> np.ndarray:
+    """
+    Psi weights of additive smoothing, psi_0 = 1 and
+    psi_j = alpha (1 + j beta) + gamma (1 - alpha) [j mod m = 0].
+    
+    Args:
+        params: (n_series x 3) alpha, beta, gamma
+        seasonal_period: Season length m (1 without a season)
+        periods: Number of periods to forecast
+    
+    Returns:
+        np.ndarray: (n_series x periods) psi weights
+    """
+    alpha, beta, gamma = (params[:, i][:, None] for i in range(3))
+    j = np.arange(1, periods)
+    c = alpha * (1 + j * beta) + gamma * (1 - alpha) * (j % seasonal_period == 0)
+    return np.concatenate([np.ones((len(params), 1)), c], axis=1)
+
+
+def forecast_exponential_smoothing(state: Dict[str, np.ndarray], periods: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Forecast from fitted smoothing states with 95% prediction intervals.
+    
+    Interval widths use the additive ETS variance sigma^2 * sum_j psi_j^2
+    with the psi weights of smoothing_psi().
+    
+    Args:
+        state: Output of fit_exponential_smoothing()
+        periods: Number of periods to forecast
+    
+    Returns:
+        Dict: 'predictions', 'confidence_interval_lower' and
+            'confidence_interval_upper' as (n_series x periods) matrices
+    """
+    m = state['season'].shape[1]
+    steps = np.arange(1, periods + 1)
+    predictions = state['level'][:, None] + steps * state['trend'][:, None] + \
+        state['season'][:, (steps - 1) % m]
+    
+    variance_factor = np.cumsum(smoothing_psi(state['params'], m, periods) ** 2, axis=1)
+    half_width = 1.96 * state['std_residual'][:, None] * np.sqrt(variance_factor)
+    return {
+        'predictions': predictions,
+        'confidence_interval_lower': predictions - half_width,
+        'confidence_interval_upper': predictions + half_width
+    }
+
+
+def exponential_smoothing_matrix(values, periods: int = 1, kind: str = 'holt',
+                                 seasonal_period: int = 12) -> Dict[str, np.ndarray]:
+    """
+    Fit and forecast exponential smoothing for every row of a series matrix.
+    
+    Args:
+        values: (n_series x n_periods) matrix without missing values
+        periods: Number of periods to forecast
+        kind: 'ses', 'holt' or 'holt_winters'
+        seasonal_period: Season length for 'holt_winters'
+    
+    Returns:
+        Dict: Forecast matrices as in forecast_exponential_smoothing(), plus
+            'params' (n_series x 3), 'std_residual', 'residuals', 'psi' and
+            'historical_mean'
+    """
+    state = fit_exponential_smoothing(values, kind=kind, seasonal_period=seasonal_period)
+    result = forecast_exponential_smoothing(state, periods=periods)
+    result.update({
+        'params': state['params'],
+        'std_residual': state['std_residual'],
+        'residuals': state['residuals'],
+        'psi': smoothing_psi(state['params'], state['season'].shape[1], periods),
+        'historical_mean': _as_matrix(values).mean(axis=1)
+    })
+    return result
@@ -12,14 +12,22 @@ import plotly.express as px
 from datetime import datetime
 import sys
 import os
+import logging
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.data_processor import DataProcessor
-from src.forecasting import BillingForecaster
+from src.forecasting import BillingForecaster, FittedForecast
 from src.bcg_matrix import BCGMatrixAnalyzer
 from src.bias_detector import BiasDetector
+from src.kpi_graph import KPIGraph
+from src.model_cache import ModelCache
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
 
 # Page configuration
 st.set_page_config(
@@ -65,6 +73,34 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_resource
+def load_processor() -> DataProcessor:
+    """Build one processed dataset shared by all sessions."""
+    processor = DataProcessor()
+    processor.load_sample_data()
+    processor.clean_data()
+    processor.calculate_kpis()
+    return processor
+
+
+@st.cache_resource
+def load_model_cache() -> ModelCache:
+    """Fitted-model cache shared by all sessions and kept across restarts."""
+    return ModelCache(cache_dir=os.path.join(os.path.dirname(__file__), '.model_cache'))
+
+
+@st.cache_resource
+def load_fitted_forecast(_processor: DataProcessor, data_version: int, method: str) -> FittedForecast:
+    """Fit once per dataset version and method; horizon changes only predict."""
+    return BillingForecaster(_processor.cleaned_df, cache=load_model_cache()).fit(method)
+
+
+@st.cache_resource
+def load_kpi_graph(_processor: DataProcessor) -> KPIGraph:
+    """Memoized KPI graph over the shared processor."""
+    return KPIGraph(_processor)
+
+
 def main():
     """Main application entry point."""
     
@@ -99,14 +135,8 @@ def main():
         st.markdown("[Documentation](https://github.com)")
         st.markdown("[Support](mailto:support@cdlmanaus.com)")
     
-    # Initialize data processor
-    if 'processor' not in st.session_state:
-        st.session_state.processor = DataProcessor()
-        st.session_state.processor.load_sample_data()
-        st.session_state.processor.clean_data()
-        st.session_state.processor.calculate_kpis()
-    
-    processor = st.session_state.processor
+    # Shared data processor (KPI and scenario paths do not mutate it)
+    processor = load_processor()
     
     # Route to selected page
     if page == "📈 Dashboard Overview":
@@ -127,8 +157,9 @@ def show_dashboard(processor: DataProcessor):
     st.header("📈 Dashboard Overview")
     st.markdown("Real-time view of key performance indicators")
     
-    # KPI Cards
-    kpis = processor.kpis
+    # KPI Cards (memoized; recomputed only when the underlying data changes)
+    kpi_graph = load_kpi_graph(processor)
+    kpis = kpi_graph.kpis()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -162,7 +193,7 @@ def show_dashboard(processor: DataProcessor):
     st.markdown("---")
     
     # Delinquency Alert
-    alert_triggered, alert_message = processor.get_delinquency_alert()
+    alert_triggered, alert_message = kpi_graph.get('alerta_inadimplencia')
     if alert_triggered:
         st.markdown(f'<div class="alert-box alert-danger">🚨 {alert_message}</div>', unsafe_allow_html=True)
     else:
@@ -269,9 +300,12 @@ def show_forecast(processor: DataProcessor):
         st.subheader("⚙️ Settings")
         method = st.selectbox(
             "Forecasting Method",
-            ["arima", "moving_average", "trend"],
+            ["arima", "holt", "holt_winters", "ses", "moving_average", "trend"],
             format_func=lambda x: {
                 "arima": "📈 ARIMA (Advanced)",
+                "holt": "📈 Holt (Trend Smoothing)",
+                "holt_winters": "🔁 Holt-Winters (Seasonal)",
+                "ses": "〰️ Simple Exponential Smoothing",
                 "moving_average": "📊 Moving Average",
                 "trend": "📉 Linear Trend"
             }[x]
@@ -286,8 +320,8 @@ def show_forecast(processor: DataProcessor):
         if 'forecast_run' in st.session_state and st.session_state.forecast_run:
             with st.spinner("Calculating forecast..."):
                 df = processor.cleaned_df
-                forecaster = BillingForecaster(df)
-                forecast_result = forecaster.forecast_billing(periods=periods, method=method)
+                fitted = load_fitted_forecast(processor, processor.data_version, method)
+                forecast_result = fitted.predict(periods)
                 
                 # Display results
                 st.success("✅ Forecast completed successfully!")
@@ -429,6 +463,15 @@ def show_bcg_matrix():
         
         if st.button("📊 Analyze Portfolio", type="primary"):
             st.session_state.bcg_analyzed = True
+        
+        # Metrics are cached by the analyzer; slider moves only re-classify
+        thresholds = (share_threshold, growth_threshold)
+        if st.session_state.bcg_analyzed:
+            previous = st.session_state.get('bcg_thresholds', thresholds)
+            n_changed = analyzer.count_quadrant_changes(previous, thresholds)
+            st.metric("Quadrant changes", n_changed,
+                      help="Products that changed quadrant since the previous thresholds")
+            st.session_state.bcg_thresholds = thresholds
     
     with col2:
         if st.session_state.bcg_analyzed:
@@ -507,6 +550,28 @@ def show_bcg_matrix():
                 
                 st.plotly_chart(fig, use_container_width=True)
                 
+                # Sensitivity of the classification over the slider ranges
+                with st.expander("🎚️ Threshold Sensitivity"):
+                    grid = analyzer.classify_grid(np.arange(20.0, 41.0, 1.0), np.arange(-5.0, 10.5, 0.5),
+                                                  reference=thresholds)
+                    heatmap = grid.pivot(index='growth_threshold', columns='share_threshold',
+                                         values='n_changed')
+                    st.plotly_chart(px.imshow(
+                        heatmap, origin='lower', aspect='auto', color_continuous_scale='Blues',
+                        labels=dict(x="Market Share Threshold (%)", y="Growth Rate Threshold (%)",
+                                    color="Products changing quadrant")
+                    ), use_container_width=True)
+                
+                # Month-by-month quadrants over a trailing window
+                with st.expander("📈 Quadrant Evolution"):
+                    window = st.slider("Trailing Window (months)", min_value=2,
+                                       max_value=len(analyzer.products_df),
+                                       value=min(6, len(analyzer.products_df)))
+                    rolling = analyzer.analyze_rolling(window, share_threshold, growth_threshold)
+                    st.dataframe(rolling['trajectories'], use_container_width=True)
+                    st.markdown("**Month-to-month transitions** (rows: from, columns: to)")
+                    st.dataframe(rolling['transitions'], use_container_width=True)
+                
                 # Detailed results
                 st.markdown("---")
                 st.subheader("📋 Product Analysis Details")
@@ -780,6 +845,44 @@ def show_scenario_simulator(processor: DataProcessor):
                 st.warning(f"⚠️ Delinquency worsening: +{delinq_diff:.2f} percentage points")
             else:
                 st.info("ℹ️ No delinquency impact from this scenario")
+    
+    # Sensitivity sweep over a grid of scenarios
+    st.markdown("---")
+    st.subheader("🧮 Sensitivity Sweep")
+    st.markdown("Delinquency rate and target gap for delinquency changes crossed with revenue changes")
+    
+    sweep_col1, sweep_col2 = st.columns(2)
+    with sweep_col1:
+        delinq_range = st.slider("Delinquency Change Range (%)", -50, 50, (-50, 50), step=1)
+    with sweep_col2:
+        revenue_range = st.slider("Revenue Change Range (%)", -30, 30, (-10, 10), step=1)
+    
+    if st.button("📐 Run Sweep"):
+        grid = processor.simulate_scenario_grid({
+            'Inadimplencia_Valor': np.arange(delinq_range[0], delinq_range[1] + 1) / 100,
+            'Faturamento_Real': np.arange(revenue_range[0], revenue_range[1] + 1) / 100
+        })
+        
+        gap_matrix = grid['gap_meta_percentual'].unstack('Faturamento_Real')
+        rate_matrix = grid['taxa_inadimplencia_media'].unstack('Faturamento_Real')
+        
+        fig = go.Figure(data=go.Heatmap(
+            z=rate_matrix.values,
+            x=[f"{v*100:+.0f}%" for v in rate_matrix.columns],
+            y=[f"{v*100:+.0f}%" for v in rate_matrix.index],
+            customdata=gap_matrix.values,
+            colorscale='RdYlGn_r',
+            colorbar=dict(title="Delinq. Rate (%)"),
+            hovertemplate="Revenue: %{x}<br>Delinquency: %{y}<br>"
+                          "Rate: %{z:.2f}%<br>Gap: %{customdata:.2f}%<extra></extra>"
+        ))
+        fig.update_layout(
+            xaxis_title="Revenue Change",
+            yaxis_title="Delinquency Change",
+            height=500
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{len(grid):,} scenarios evaluated")
 
 
 if __name__ == "__main__":